@@ -6,9 +6,10 @@ This "paradox" is the central question of the entire study.
 """
 
 from config import *
+from config import ai_eu, un_eu, PROJECT_TO
 
 fig, ax1 = plt.subplots(figsize=(10, 6), facecolor=BG)
-fig.canvas.manager.set_window_title("Chart 1 — Global Trends: AI vs Unemployment")
+set_window_title(fig, "Chart 1 — Global Trends: AI vs Unemployment")
 ax1.set_facecolor(BG)
 
 # ── Left axis: AI adoption ─────────────────────────
@@ -36,8 +37,34 @@ for i, v in enumerate(un_eu):
                  xytext=(0, -22), textcoords='offset points',
                  ha='center', fontweight='bold', color=C3, fontsize=11)
 
+# ── Trend projections: dashed EU trend and its prediction band (--project) ──────
+ai_lim, un_lim = (0, 30), (4.5, 8)
+title = 'THE EUROPEAN PARADOX: AI RISES, UNEMPLOYMENT HOLDS STEADY (2023–2025)'
+if PROJECT_TO is not None:
+    from config import projected
+    from cube import EU_GEO
+    eu     = projected.loc[EU_GEO]
+    future = [str(y) for y in range(int(YEARS[-1]) + 1, PROJECT_TO + 1)]
+    span   = YEARS[-1:] + future
+    for ax, prefix, observed, color, dy in ((ax1, 'ai', ai_eu, C4, 12), (ax2, 'un', un_eu, C3, -20)):
+        mean, lo, hi = ([observed[-1]] + [eu[f'{prefix}{y[2:]}{s}'] for y in future]
+                        for s in ('', '_lo', '_hi'))
+        ax.fill_between(span, lo, hi, color=color, alpha=0.10, linewidth=0)
+        ax.plot(span, mean, color=color, linewidth=2, linestyle=':', marker='o',
+                markersize=6, markerfacecolor=WHITE, markevery=list(range(1, len(span))),
+                label=f'{"AI Adoption" if prefix == "ai" else "Unemployment"} — trend to {PROJECT_TO}',
+                zorder=4)
+        ax.annotate(f'{mean[-1]:.1f}%', (span[-1], mean[-1]), xytext=(0, dy),
+                    textcoords='offset points', ha='center', fontstyle='italic',
+                    color=color, fontsize=10)
+        if prefix == 'ai':
+            ai_lim = (0, max(ai_lim[1], 10 * np.ceil(max(hi) / 10)))
+        else:
+            un_lim = (min(un_lim[0], np.floor(min(lo))), max(un_lim[1], np.ceil(max(hi))))
+    title = f'{title[:-1]}, TREND TO {PROJECT_TO})'
+
 # ── Axis formatting ───────────────────────────────────────────────────────────
-ax1.set_ylim(0, 30);   ax2.set_ylim(4.5, 8)
+ax1.set_ylim(*ai_lim);   ax2.set_ylim(*un_lim)
 ax1.set_ylabel('AI Adoption — % of Enterprises', fontweight='bold', color=C4, fontsize=11)
 ax2.set_ylabel('Unemployment Rate (%)',           fontweight='bold', color=C3, fontsize=11)
 ax1.set_xlabel('Year', fontweight='bold', color=C2, fontsize=11)
@@ -52,9 +79,10 @@ lines2, labels2 = ax2.get_legend_handles_labels()
 ax1.legend(lines1 + lines2, labels1 + labels2,
            loc='upper left', frameon=True, facecolor=WHITE, fontsize=10)
 
-fig.suptitle('THE EUROPEAN PARADOX: AI RISES, UNEMPLOYMENT HOLDS STEADY (2023–2025)',
+fig.suptitle(title,
              fontsize=13, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.90)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.90)
+show_figure(fig, '01_global_trends')
@@ -5,16 +5,18 @@ the growing inequality in AI adoption between member states (2023–2025).
 """
 
 from config import *
+from config import df_ia
 
 fig, ax = plt.subplots(figsize=(10, 7), facecolor=BG)
-fig.canvas.manager.set_window_title("Chart 2 — AI Adoption Dispersion Across EU Countries")
+set_window_title(fig, "Chart 2 — AI Adoption Dispersion Across EU Countries")
 ax.set_facecolor(BG)
 
 data_to_plot = [df_ia['2023'].dropna(), df_ia['2024'].dropna(), df_ia['2025'].dropna()]
 
 # ── Boxplot  ────────────
-box = ax.boxplot(data_to_plot, labels=YEARS, patch_artist=True,
+box = ax.boxplot(data_to_plot, patch_artist=True,
                  notch=False, showfliers=False) ##
+ax.set_xticklabels(YEARS)
 
 for patch, color in zip(box['boxes'], YEAR_COLORS):
     patch.set_facecolor(color)
@@ -31,10 +33,11 @@ for whisker in box['whiskers']:
 for cap in box['caps']:
     cap.set(color=C2, linewidth=2)
 
-# ── Jitter points: one dot per EU country ────────────────────────────────────
+# ── Jitter points: one dot per EU country (fixed seed → reproducible image) ──
+rng = np.random.default_rng(42)
 for i, (col, color) in enumerate(zip(YEARS, YEAR_COLORS)):
     y = df_ia[col].dropna()
-    x = np.random.normal(i + 1, 0.04, size=len(y))
+    x = rng.normal(i + 1, 0.04, size=len(y))
     ax.scatter(x, y, alpha=0.85, color=WHITE, edgecolor=color,
                linewidth=1.5, s=50, zorder=3) ##
 
@@ -49,6 +52,7 @@ fig.suptitle('AI ADOPTION DISPERSION ACROSS EU (2023–2025)\n'
              'Each dot = one EU member state. Wider box = greater inequality.',
              fontsize=13, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.88)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.88)
+show_figure(fig, '02_boxplot_dispersion')
@@ -1,13 +1,14 @@
 """
 Phase 2: Country-Level View
 PURPOSE: Display AI adoption rates and unemployment rates side by side
-for all 27 EU member states, sorted by AI adoption in 2025.
+for all 27 EU member states, sorted by AI adoption in the reference year (2025).
 """
 
 from config import *
+from config import df_ia, df_emp
 
-# ── Sort countries by AI adoption (2025)──────────────
-df_ia_s  = df_ia.dropna(subset=YEARS).sort_values('2025', ascending=False)
+# ── Sort countries by AI adoption (reference year)──────────────
+df_ia_s  = df_ia.dropna(subset=YEARS).sort_values(REF_YEAR, ascending=False)
 df_emp_s = (df_emp.set_index('COUNTRY')
                   .reindex(df_ia_s['COUNTRY'])
                   .reset_index()
@@ -18,7 +19,7 @@ x     = np.arange(len(df_ia_s))
 width = 0.25
 
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12), facecolor=BG)##se crean dos paneles
-fig.canvas.manager.set_window_title("Chart 3 — Country Comparison: AI Adoption & Unemployment")
+set_window_title(fig, "Chart 3 — Country Comparison: AI Adoption & Unemployment")
 
 for ax in (ax1, ax2):
     ax.set_facecolor(BG)
@@ -54,6 +55,7 @@ ax2.spines['right'].set_visible(False)
 fig.suptitle('ENTERPRISES USING IA BY COUNTRY',
              fontsize=15, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.93)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.93)
+show_figure(fig, '03_country_comparison')
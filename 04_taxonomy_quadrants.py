@@ -1,46 +1,69 @@
 """
 Phase 3: Strategic Classification
 PURPOSE: Classify all 27 EU countries into 4 strategic groups
-based on their 2025 AI adoption rate and unemployment rate,
-using medians as benchmarks.
+based on their AI adoption rate and unemployment rate in the
+reference year (2025 by default), using medians as benchmarks.
 """
 
 from config import *
+from config import merged, AI_MED, UN_MED, PROJECT_TO
+from labels import PointLabels
+from matplotlib.lines import Line2D
 
 fig, ax = plt.subplots(figsize=(14, 9), facecolor=BG) ##
-fig.canvas.manager.set_window_title("Chart 4 — Country Taxonomy: Strategic Quadrants")
+set_window_title(fig, "Chart 4 — Country Taxonomy: Strategic Quadrants")
 ax.set_facecolor(BG)
 
+# ── Projected positions (--project): limits grow to fit them ─────────────────
+x, y = merged[f'ai{REF}'].to_numpy(), merged[f'un{REF}'].to_numpy()
+X_MAX, Y_MAX = 50, 16
+if PROJECT_TO is not None:
+    from config import projected
+    yy = f'{PROJECT_TO % 100:02d}'
+    px = projected.loc[merged['COUNTRY'], f'ai{yy}'].to_numpy()
+    py = projected.loc[merged['COUNTRY'], f'un{yy}'].to_numpy()
+    X_MAX = max(X_MAX, 10 * np.ceil((np.nanmax(px) + 2) / 10))
+    Y_MAX = max(Y_MAX, 2 * np.ceil((np.nanmax(py) + 0.8) / 2))
+
 # ── Quadrant shading ──────────────────────────────────────────────────────────
-ax.fill_between([AI25_MED, 50], [UN25_MED, UN25_MED], [16, 16], color=GA, alpha=0.12)  # A green
-ax.fill_between([0, AI25_MED],  [UN25_MED, UN25_MED], [16, 16], color=GB, alpha=0.10)  # B amber
-ax.fill_between([0, AI25_MED],  [0, 0], [UN25_MED, UN25_MED],   color=GC, alpha=0.09)  # C red
-ax.fill_between([AI25_MED, 50], [0, 0], [UN25_MED, UN25_MED],   color=GD, alpha=0.09)  # D dark green
+ax.fill_between([AI_MED, X_MAX], [UN_MED, UN_MED], [Y_MAX, Y_MAX], color=GA, alpha=0.12)  # A green
+ax.fill_between([0, AI_MED],     [UN_MED, UN_MED], [Y_MAX, Y_MAX], color=GB, alpha=0.10)  # B amber
+ax.fill_between([0, AI_MED],     [0, 0], [UN_MED, UN_MED],         color=GC, alpha=0.09)  # C red
+ax.fill_between([AI_MED, X_MAX], [0, 0], [UN_MED, UN_MED],         color=GD, alpha=0.09)  # D dark green
 
 # ── Median reference lines ────────────────────────────────────────────────────
-ax.axvline(AI25_MED, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
-ax.axhline(UN25_MED, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
+ax.axvline(AI_MED, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
+ax.axhline(UN_MED, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
 
 # ── Quadrant labels ───────────────────────────────────────────────────────────
 label_kw = {'fontsize': 9.5, 'fontweight': 'bold'}
-ax.text(AI25_MED + 0.8, 15.3, 'GROUP A: TECHNOLOGICAL VANGUARD\nHigh AI · High Unemployment',  color=GA, **label_kw)
-ax.text(0.8,            15.3, 'GROUP B: STRUCTURAL LAG\nLow AI · High Unemployment',           color=GB, **label_kw)
-ax.text(0.8,            0.5,  'GROUP C: TRADITIONAL RESILIENCE\nLow AI · Low Unemployment',    color=GC, **label_kw)
-ax.text(AI25_MED + 0.8, 0.5,  'GROUP D: DIGITAL FRONTIER\nHigh AI · Low Unemployment',        color=GD, **label_kw)
-
-# ── Country scatter points (color = quadrant) ──────────────────puntos de paises
-for _, row in merged.iterrows():
-    dot_color = GROUP_COLORS[row['group']]
-    ax.scatter(row['ai25'], row['un25'], s=160, color=dot_color,
-               edgecolors=WHITE, linewidth=1.5, zorder=10, alpha=0.95)
-    ax.annotate(row['COUNTRY'], (row['ai25'], row['un25']),
-                xytext=(5, 5), textcoords='offset points',
-                fontsize=8.5, color=C2, fontweight='bold')
+quadrant_labels = [
+    ax.text(AI_MED + 0.8, Y_MAX - 0.7, 'GROUP A: TECHNOLOGICAL VANGUARD\nHigh AI · High Unemployment',  color=GA, **label_kw),
+    ax.text(0.8,            Y_MAX - 0.7, 'GROUP B: STRUCTURAL LAG\nLow AI · High Unemployment',           color=GB, **label_kw),
+    ax.text(0.8,            0.5,  'GROUP C: TRADITIONAL RESILIENCE\nLow AI · Low Unemployment',    color=GC, **label_kw),
+    ax.text(AI_MED + 0.8, 0.5,  'GROUP D: DIGITAL FRONTIER\nHigh AI · Low Unemployment',        color=GD, **label_kw),
+]
+
+# ── Country scatter points (color = quadrant), labels placed without overlaps ──
+colors = merged['group'].map(GROUP_COLORS).tolist()
+ax.scatter(x, y, s=160, c=colors,
+           edgecolors=WHITE, linewidth=1.5, zorder=10, alpha=0.95)
+obstacles = None
+if PROJECT_TO is not None:   # hollow trend positions, reached by a faint arrow
+    ax.quiver(x, y, px - x, py - y, color=colors, alpha=0.35, angles='xy',
+              scale_units='xy', scale=1, width=0.0015, headwidth=5, headlength=6, zorder=6)
+    ax.scatter(px, py, s=110, facecolors='none', edgecolors=colors, linewidth=1.5,
+               zorder=9)
+    obstacles = np.column_stack([px, py])
+country_labels = PointLabels(x, y, merged['COUNTRY'], point_size=14, avoid=quadrant_labels,
+                             obstacles=obstacles, fontsize=8.5, color=C2, fontweight='bold')
+ax.add_artist(country_labels)
 
 # ── Axis formatting ───────────────────────────────────────────────────────────
-ax.set_xlabel('AI Adoption Rate — 2025 (%)',    fontweight='bold', color=C2, fontsize=11, labelpad=10)
-ax.set_ylabel('Unemployment Rate — 2025 (%)',   fontweight='bold', color=C2, fontsize=11, labelpad=10)
-ax.set_xlim(0, 50);  ax.set_ylim(0, 16)
+when = REF_YEAR if PROJECT_TO is None else f'{REF_YEAR} (filled) · {PROJECT_TO} trend (hollow)'
+ax.set_xlabel(f'AI Adoption Rate — {when} (%)',    fontweight='bold', color=C2, fontsize=11, labelpad=10)
+ax.set_ylabel(f'Unemployment Rate — {when} (%)',   fontweight='bold', color=C2, fontsize=11, labelpad=10)
+ax.set_xlim(0, X_MAX);  ax.set_ylim(0, Y_MAX)
 ax.grid(True, linestyle=':', alpha=0.20)
 ax.spines['top'].set_visible(False)
 ax.spines['right'].set_visible(False)
@@ -48,12 +71,17 @@ ax.spines['right'].set_visible(False)
 # ── Legend ────────────────────────────────────────────────────────────────────
 patches = [mpatches.Patch(color=GROUP_COLORS[g], label=f'Group {g}: {GROUP_NAMES[g]}')
            for g in ['A', 'B', 'C', 'D']]
-ax.legend(handles=patches, loc='lower right', fontsize=9, frameon=True,
-          facecolor=WHITE, edgecolor=C2)
+if PROJECT_TO is not None:
+    patches.append(Line2D([0], [0], marker='o', linestyle='none', markersize=9,
+                          markerfacecolor='none', markeredgecolor=C2,
+                          label=f'Trend projection {PROJECT_TO} (groups as of {REF_YEAR})'))
+country_labels.avoid.append(ax.legend(handles=patches, loc='lower right', fontsize=9,
+                                     frameon=True, facecolor=WHITE, edgecolor=C2))
 
 fig.suptitle('STRATEGIC TAXONOMY',
              fontsize=14, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.92)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.92)
+show_figure(fig, '04_taxonomy_quadrants')
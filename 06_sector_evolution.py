@@ -4,9 +4,10 @@ PURPOSE: Show that AI adoption is not uniform across economic sectors.
 """
 
 from config import *
+from config import df_nace
 
 fig, ax = plt.subplots(figsize=(13, 8), facecolor=BG) ##
-fig.canvas.manager.set_window_title("Chart 6 — AI Adoption Evolution by Economic Sector (NACE)")
+set_window_title(fig, "Chart 6 — AI Adoption Evolution by Economic Sector (NACE)")
 ax.set_facecolor(BG)
 
 index      = np.arange(len(df_nace))
@@ -41,6 +42,7 @@ fig.suptitle('AI ADOPTION BY ECONOMIC SECTOR (2023–2025)\n'
              'Digital sectors lead; physical sectors lag.',
              fontsize=13, fontweight='bold', color=C1)
 
-plt.tight_layout(rect=[0.0, 0, 1, 1])
-plt.subplots_adjust(left=0.22, top=0.90)
-plt.show()
+with stage('layout'):
+    plt.tight_layout(rect=[0.0, 0, 1, 1])
+    plt.subplots_adjust(left=0.22, top=0.90)
+show_figure(fig, '06_sector_evolution')
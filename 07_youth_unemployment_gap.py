@@ -5,13 +5,14 @@ PURPOSE: Show the persistent structural gap between youth (<25) and adult
 """
 
 from config import *
+from config import df_age_eu
 
 # ── Extract EU-27 youth and adult unemployment rates ─────────────────────────
 youth = df_age_eu[df_age_eu['AGE'].str.contains('Less')][YEARS].values[0].astype(float)
 adult = df_age_eu[df_age_eu['AGE'].str.contains('From')][YEARS].values[0].astype(float)
 
 fig, ax = plt.subplots(figsize=(12, 7), facecolor=BG) ##
-fig.canvas.manager.set_window_title("Chart 7 — Youth vs Adult Unemployment Gap (EU-27)")
+set_window_title(fig, "Chart 7 — Youth vs Adult Unemployment Gap (EU-27)")
 ax.set_facecolor(BG)
 
 # ── Lines for youth and adult unemployment ──────────────────────────────##lineas
@@ -48,6 +49,7 @@ fig.suptitle('YOUTH vs ADULT UNEMPLOYMENT\n'
              'Youth unemployment is ~3× higher and the gap shows no sign of closing.',
              fontsize=13, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.88)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.88)
+show_figure(fig, '07_youth_unemployment_gap')
@@ -7,101 +7,112 @@ Each country is shown as a trajectory from 2023 - 2024 - 2025:
 """
 
 from config import *
+from config import merged, yearly, AI_MED, UN_MED, PROJECT_TO
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
 from matplotlib.lines import Line2D
 import matplotlib.cm as cm
+from incremental import positions
+from labels import OFFSETS, PointLabels
+from templates import panel_title, style_axes
+from trajectories import prepare_trajectories, trajectory_points
 
 # ── 27 distinct country colors ───────────────────────────────────────────
 countries_all = merged['COUNTRY'].tolist()
 cmap1 = cm.tab20(np.linspace(0, 1, 20)) ##
 cmap2 = cm.Set2(np.linspace(0, 1, 8)) ##
 all_colors = list(cmap1) + list(cmap2[:7])
-country_colors = {c: all_colors[i] for i, c in enumerate(countries_all)} #diccionario de colores
+country_colors = {c: all_colors[i % len(all_colors)] for i, c in enumerate(countries_all)} #diccionario de colores
 
 # ── Figure 2x2 ───────────────────────────────────────────────────────────##
-group_order = ['B', 'A', 'C', 'D']
+group_order  = ['B', 'A', 'C', 'D']
+projected    = None
+if PROJECT_TO is not None:   # trend positions 2026 … PROJECT_TO, one row per country
+    from config import projected as projected_rates
+    future    = [f'{y % 100:02d}' for y in range(int(YEARS[-1]) + 1, PROJECT_TO + 1)]
+    projected = trajectory_points(projected_rates.loc[merged['COUNTRY']], future)
+# Positions per year come from the incremental per-year store
+trajectories = prepare_trajectories(merged, group_order, projected=projected,
+                                    points=positions(yearly, merged['COUNTRY'], YEARS))
 
 fig, axes = plt.subplots(2, 2, figsize=(20, 16), facecolor=BG) 
-fig.canvas.manager.set_window_title("Chart 8 — Scatter Trajectories by Strategic Group")
+set_window_title(fig, "Chart 8 — Scatter Trajectories by Strategic Group")
 fig.patch.set_facecolor(BG)
 axes_flat = axes.flatten()
 
 for idx, g in enumerate(group_order):
-    ax  = axes_flat[idx]
-    ax.set_facecolor(BG)
-    col = GROUP_COLORS[g]
-
-    # Countries in this group
-    gdf = merged[merged['group'] == g]
-    countries_g = gdf['COUNTRY'].tolist()
-
-    yr_cols = [('ai23','un23'), ('ai24','un24'), ('ai25','un25')]
-    alphas  = [0.30, 0.60, 1.00]
-
-    for country in countries_g:
-        row   = gdf[gdf['COUNTRY'] == country].iloc[0]
-        ccol  = country_colors[country]
-
-        xs = [row['ai23'], row['ai24'], row['ai25']]
-        ys = [row['un23'], row['un24'], row['un25']]
-
-        # Faint connecting line
-        ax.plot(xs, ys, color=ccol, linewidth=1.0, alpha=0.35, zorder=2)
-
-        # Dots with increasing opacity per year
-        for j, (x, y, a) in enumerate(zip(xs, ys, alphas)):
-            size = 80 + j * 40   # dots grow: 80 → 120 → 160
-            ax.scatter(x, y, color=ccol, s=size, alpha=a,
-                       edgecolors=WHITE, linewidth=1.0, zorder=3 + j)
-
-        # Arrow 2024 - 2025
-        ax.annotate('', xy=(xs[2], ys[2]), xytext=(xs[1], ys[1]),
-                    arrowprops=dict(arrowstyle='->', color=ccol,
-                                    lw=1.5, alpha=0.8))
-
-        # Label at 2025 position
-        ax.annotate(country, (xs[2], ys[2]),
-                    xytext=(6, 4), textcoords='offset points',
-                    fontsize=8.5, color=C2, fontweight='bold', zorder=8)
-
-    # ── Trend line using 2025 positions of this group ─────────────────────────
-    x25 = gdf['ai25'].values
-    y25 = gdf['un25'].values
-    if len(x25) > 1:
-        m, b = np.polyfit(x25, y25, 1) ## linea de tendencia 
-        x_line = np.linspace(x25.min() - 1, x25.max() + 1, 100)
-        ax.plot(x_line, m * x_line + b,
-                color=col, linewidth=2, linestyle='--',
-                alpha=0.60, zorder=4, label=f'2025 trend  (slope {m:+.2f})')
-
-    # ── EU median crosshairs for reference ────────────────────────────────────
-    ax.axvline(AI25_MED, color=C2, linewidth=0.8, linestyle=':', alpha=0.30)
-    ax.axhline(UN25_MED, color=C2, linewidth=0.8, linestyle=':', alpha=0.30)
-
-    # ── Axis limits: dynamic per group with padding so dots spread out ────────
-    all_x = [row['ai23'] for _, row in gdf.iterrows()] + \
-            [row['ai24'] for _, row in gdf.iterrows()] + \
-            [row['ai25'] for _, row in gdf.iterrows()]
-    all_y = [row['un23'] for _, row in gdf.iterrows()] + \
-            [row['un24'] for _, row in gdf.iterrows()] + \
-            [row['un25'] for _, row in gdf.iterrows()]
-    pad_x = (max(all_x) - min(all_x)) * 0.25
-    pad_y = (max(all_y) - min(all_y)) * 0.35
-    ax.set_xlim(max(0, min(all_x) - pad_x), max(all_x) + pad_x)
-    ax.set_ylim(max(0, min(all_y) - pad_y), max(all_y) + pad_y)
-
-    ax.set_xlabel('AI Adoption Rate (%)',  fontweight='bold', color=C2, fontsize=11)
-    ax.set_ylabel('Unemployment Rate (%)', fontweight='bold', color=C2, fontsize=11)
-    ax.grid(True, linestyle=':', alpha=0.15)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-    # ── Panel title ───────────────────────────────────────────────────────────
-    ax.text(0.02, 0.99, f'GROUP {g}: {GROUP_NAMES[g].upper()}',
-            transform=ax.transAxes, fontsize=11, fontweight='bold',
-            color=col, va='top', ha='left')
-
-    ax.legend(loc='lower right', fontsize=8, frameon=True,
-              facecolor=WHITE, edgecolor=col, framealpha=0.9)
+    with stage('panel', group=g):
+        ax  = axes_flat[idx]
+        style_axes(ax, grid_alpha=0.15)
+        col = GROUP_COLORS[g]
+
+        # Countries in this group: (n_countries, 3 years) positions
+        traj = trajectories[g]
+        countries_g = traj.countries
+        xs, ys = traj.points[..., 0], traj.points[..., 1]
+        ccols = to_rgba_array([country_colors[c] for c in countries_g])
+
+        alphas = np.array([0.30, 0.60, 1.00])
+        sizes  = np.array([80, 120, 160])   # dots grow: 80 → 120 → 160
+
+        # Faint connecting lines, one polyline per country
+        ax.add_collection(LineCollection(np.stack([xs, ys], axis=-1), colors=ccols,
+                                         linewidths=1.0, alpha=0.35, zorder=2))
+
+        # Dots with increasing opacity per year, drawn year by year so 2025 sits on top
+        face = np.repeat(ccols[None], 3, axis=0)
+        face[..., 3] = alphas[:, None]
+        edge = np.broadcast_to(to_rgba_array(WHITE), face.shape).copy()
+        edge[..., 3] = alphas[:, None]
+        ax.scatter(xs.T.ravel(), ys.T.ravel(), s=np.repeat(sizes, len(countries_g)),
+                   c=face.reshape(-1, 4), edgecolors=edge.reshape(-1, 4),
+                   linewidth=1.0, zorder=3)
+
+        # Arrows 2024 - 2025
+        ax.quiver(xs[:, 1], ys[:, 1], xs[:, 2] - xs[:, 1], ys[:, 2] - ys[:, 1],
+                  color=ccols, alpha=0.8, angles='xy', scale_units='xy', scale=1,
+                  width=0.003, headwidth=4, headlength=5, zorder=4)
+
+        # Projected trend paths 2025 → PROJECT_TO, ending in a hollow dot
+        obstacles = np.column_stack([xs[:, :2].ravel(), ys[:, :2].ravel()])
+        if traj.projected is not None:
+            path = np.concatenate([traj.points[:, -1:], traj.projected], axis=1)
+            ax.add_collection(LineCollection(path, colors=ccols, linewidths=1.2,
+                                             linestyles='--', alpha=0.55, zorder=2))
+            ax.scatter(path[:, -1, 0], path[:, -1, 1], s=110, facecolors='none',
+                       edgecolors=ccols, linewidth=1.5, zorder=3)
+            obstacles = np.vstack([obstacles, path[:, -1]])
+
+        # Labels at 2025 position, clear of every year's dots
+        ax.add_artist(PointLabels(xs[:, 2], ys[:, 2], countries_g,
+                                  offsets=((6, 4),) + OFFSETS[1:], point_size=12,
+                                  obstacles=obstacles,
+                                  fontsize=8.5, color=C2, fontweight='bold'))
+
+        # ── Trend line using 2025 positions of this group ─────────────────────────
+        if traj.trend is not None:
+            m, b = traj.trend ## linea de tendencia 
+            x_line = np.linspace(xs[:, 2].min() - 1, xs[:, 2].max() + 1, 100)
+            ax.plot(x_line, m * x_line + b,
+                    color=col, linewidth=2, linestyle='--',
+                    alpha=0.60, zorder=4, label=f'2025 trend  (slope {m:+.2f})')
+
+        # ── EU median crosshairs for reference ────────────────────────────────────
+        ax.axvline(AI_MED, color=C2, linewidth=0.8, linestyle=':', alpha=0.30)
+        ax.axhline(UN_MED, color=C2, linewidth=0.8, linestyle=':', alpha=0.30)
+
+        # ── Axis limits: dynamic per group with padding so dots spread out ────────
+        ax.set_xlim(*traj.xlim)
+        ax.set_ylim(*traj.ylim)
+
+        ax.set_xlabel('AI Adoption Rate (%)',  fontweight='bold', color=C2, fontsize=11)
+        ax.set_ylabel('Unemployment Rate (%)', fontweight='bold', color=C2, fontsize=11)
+
+        # ── Panel title ───────────────────────────────────────────────────────────
+        panel_title(ax, f'GROUP {g}: {GROUP_NAMES[g].upper()}', col)
+
+        ax.legend(loc='lower right', fontsize=8, frameon=True,
+                  facecolor=WHITE, edgecolor=col, framealpha=0.9)
 
 # ── Shared legend: year opacity guide ─────────────────────────────────────────
 year_handles = [
@@ -114,13 +125,18 @@ year_handles = [
     Line2D([0], [0], color='grey', linewidth=1.5,
            marker='>', markersize=6, label='Direction 2024 → 2025'),
 ]
-fig.legend(handles=year_handles, loc='lower center', ncol=4,
+if PROJECT_TO is not None:
+    year_handles.append(Line2D([0], [0], color='grey', linewidth=1.2, linestyle='--',
+                               marker='o', markersize=8, markerfacecolor='none',
+                               label=f'Trend projection → {PROJECT_TO}'))
+fig.legend(handles=year_handles, loc='lower center', ncol=len(year_handles),
            fontsize=9, frameon=True, facecolor=WHITE, edgecolor=C2,
            bbox_to_anchor=(0.5, -0.02))
 
 fig.suptitle('COUNTRY TRAJECTORIES BY STRATEGIC GROUP',
              fontsize=14, fontweight='bold', color=C1)
 
-plt.tight_layout()
-plt.subplots_adjust(top=0.93, bottom=0.08, hspace=0.42, wspace=0.28)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(top=0.93, bottom=0.08, hspace=0.42, wspace=0.28)
+show_figure(fig, '08_scatter_trajectories')
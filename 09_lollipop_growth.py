@@ -7,35 +7,38 @@ PURPOSE: For each EU country, show two things side by side:
 """
 
 from config import *
-from matplotlib.lines import Line2D
+from config import merged, yearly
+from incremental import growth as year_growth
+from labels import PointLabels
 
-# ── Compute growth deltas ─────────────────────────────────────────────────────
-merged['ai_growth'] = merged['ai25'] - merged['ai23']
-merged['un_change'] = merged['un25'] - merged['un23']
-df = merged.sort_values('ai_growth', ascending=True) 
+# ── Growth deltas from the per-year store (on a copy: `merged` is shared) ─────
+span = f'{YEARS[0]} → {YEARS[-1]}'
+ai_growth, un_change = year_growth(yearly, merged['COUNTRY'], YEARS[-1])
+df = merged.assign(ai_growth=ai_growth, un_change=un_change)
+df = df.sort_values('ai_growth', ascending=True)
 
 n = len(df)
 y = np.arange(n)
 
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 10), facecolor=BG,
                                 gridspec_kw={'width_ratios': [2, 1]})
-fig.canvas.manager.set_window_title("Chart 8 — AI Growth vs Unemployment Change (2023–2025)")
+set_window_title(fig, f"Chart 9 — AI Growth vs Unemployment Change ({YEARS[0]}–{YEARS[-1]})")
 ax1.set_facecolor(BG)
 ax2.set_facecolor(BG)
 
 # ── LEFT PANEL: AI adoption growth lollipop ───────────────────────────────────
-for i, (_, row) in enumerate(df.iterrows()):
-    col = GROUP_COLORS[row['group']]
-    ax1.hlines(i, 0, row['ai_growth'], color=col, linewidth=2.5, alpha=0.7)
-    ax1.scatter(row['ai_growth'], i, color=col, s=120, zorder=5,
-                edgecolors=WHITE, linewidth=1.2)
-    ax1.text(row['ai_growth'] + 0.3, i, f"+{row['ai_growth']:.1f}pp",
-             va='center', fontsize=7.5, color=col, fontweight='bold')
+growth      = df['ai_growth'].to_numpy()
+group_cols  = df['group'].map(GROUP_COLORS).tolist()
+ax1.hlines(y, 0, growth, colors=group_cols, linewidth=2.5, alpha=0.7)
+ax1.scatter(growth, y, c=group_cols, s=120, zorder=5,
+            edgecolors=WHITE, linewidth=1.2)
+ax1.add_artist(PointLabels(growth, y, [f"+{g:.1f}pp" for g in growth], priority=np.abs(growth),
+                           offsets=[(7, 0)], colors=group_cols, fontsize=7.5, fontweight='bold'))
 
 ax1.axvline(0, color=C2, linewidth=1, alpha=0.4)
 ax1.set_yticks(y)
 ax1.set_yticklabels(df['COUNTRY'], fontsize=9, fontweight='bold', color=C2)
-ax1.set_xlabel('Percentage Points Gained (2023 → 2025)',
+ax1.set_xlabel(f'Percentage Points Gained ({span})',
                fontweight='bold', color=C2, fontsize=10)
 ax1.set_title('AI ADOPTION GROWTH\n(percentage point increase)',
               fontsize=11, fontweight='bold', color=C1, pad=12)
@@ -45,21 +48,21 @@ ax1.spines['top'].set_visible(False)
 ax1.spines['right'].set_visible(False)
 
 # ── RIGHT PANEL: Unemployment change lollipop (pos = worse, neg = better) ────
-for i, (_, row) in enumerate(df.iterrows()):
-    change = row['un_change']
-    col = '#f87171' if change > 0 else '#4ade80'   # red = rose, green = fell
-    ax2.hlines(i, 0, change, color=col, linewidth=2.5, alpha=0.8)
-    ax2.scatter(change, i, color=col, s=120, zorder=5,
-                edgecolors=WHITE, linewidth=1.2)
-    label = f"+{change:.1f}" if change > 0 else f"{change:.1f}"
-    ax2.text(change + (0.08 if change >= 0 else -0.08), i, f"{label}pp",
-             va='center', ha='left' if change >= 0 else 'right',
-             fontsize=7.5, color=col, fontweight='bold')
+change      = df['un_change'].to_numpy()
+change_cols = np.where(change > 0, '#f87171', '#4ade80')   # red = rose, green = fell
+ax2.hlines(y, 0, change, colors=change_cols, linewidth=2.5, alpha=0.8)
+ax2.scatter(change, y, c=change_cols, s=120, zorder=5,
+            edgecolors=WHITE, linewidth=1.2)
+for side, dx in ((change >= 0, 7), (change < 0, -7)):   # right of rises, left of falls
+    ax2.add_artist(PointLabels(change[side], y[side],
+                               [f"+{c:.1f}pp" if c > 0 else f"{c:.1f}pp" for c in change[side]],
+                               priority=np.abs(change[side]), offsets=[(dx, 0)],
+                               colors=change_cols[side], fontsize=7.5, fontweight='bold'))
 
 ax2.axvline(0, color=C2, linewidth=1.5, alpha=0.6)
 ax2.set_yticks(y)
 ax2.set_yticklabels([])   # shared y-axis with left panel
-ax2.set_xlabel('Percentage Points Change (2023 → 2025)',
+ax2.set_xlabel(f'Percentage Points Change ({span})',
                fontweight='bold', color=C2, fontsize=10)
 ax2.set_title('UNEMPLOYMENT CHANGE\n(▲ rose  ▼ fell)',
               fontsize=11, fontweight='bold', color=C2, pad=12)
@@ -79,10 +82,11 @@ fig.legend(handles=patches, loc='lower center', ncol=3, fontsize=9,
            frameon=True, facecolor=WHITE, edgecolor=C2,
            bbox_to_anchor=(0.5, -0.02))
 
-fig.suptitle('AI ADOPTION GROWTH vs UNEMPLOYMENT CHANGE BY COUNTRY (2023–2025)\n'
+fig.suptitle(f'AI ADOPTION GROWTH vs UNEMPLOYMENT CHANGE BY COUNTRY ({YEARS[0]}–{YEARS[-1]})\n'
              'Fast AI growth does not systematically push unemployment in one direction.',
              fontsize=13, fontweight='bold', color=C1, y=1.01)
 
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.10, wspace=0.05)
-plt.show()
+with stage('layout'):
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.10, wspace=0.05)
+show_figure(fig, '09_lollipop_growth')
@@ -0,0 +1,325 @@
+"""
+Benchmark harness for the data pipeline and the chart deck.
+Times, for the shipped data and for synthetic datasets scaled to a given
+number of geographic units:
+
+    import      fresh-interpreter `import config` / `import datasets` (and total startup)
+    load        load_csv + to_float of every database_*.csv (binary cache off)
+    merge       building merged / merged2
+    classify    vectorized classification and the row-wise classify_quadrant
+    cluster     k-means over the AI / unemployment / youth trajectories
+    project     batched trend fits and projections of every geo (`projected`)
+    memory      deep size in bytes of every loaded data frame
+    chart NN    each chart's figure construction and its save, separately
+
+Results are written as JSON so runs can be compared across commits:
+
+    python benchmark.py --output bench/$(git rev-parse --short HEAD).json
+    python benchmark.py --sizes 27 300 --charts 04 08 --compare bench/main.json
+    python benchmark.py --compact --output bench/compact.json   # CHART_COMPACT frames
+    python benchmark.py --check-import      # import-time budget, no plotting libraries
+"""
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault('CHART_DATA_CACHE', '0')   # time real parsing, not the binary cache
+import matplotlib
+import matplotlib.pyplot as plt
+
+import config
+import render_all
+from clustering import cluster_trajectories
+from taxonomy import classify
+
+CHART_DIR     = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = [27, 300, 3000, 30000]
+DATA_FILES    = ['database_ia.csv', 'database_employees.csv', 'database_ia_nace.csv',
+                 'database_ia_europe.csv', 'database_employees_europe.csv',
+                 'database_employees_age_europe.csv', 'database_employees_age.csv']
+PLOTTING_MODULES = ('matplotlib', 'scipy')   # must not load with the data layer
+IMPORT_BUDGET    = 1.0                        # seconds for a fresh `import datasets`
+
+
+# ── Synthetic data ─────────────────────────────────────────────────────────────
+def _fmt(values):
+    """European decimal format, as in the published CSVs."""
+    return np.char.replace(np.round(values, 2).astype(str), '.', ',')
+
+
+def write_synthetic_data(folder, units, seed=0):
+    """Write database_*.csv files for `units` synthetic geographic units.
+    EU aggregates and NACE sectors are copied from the shipped data."""
+    rng   = np.random.default_rng(seed)
+    names = np.array([f'GEO{i:05d}' for i in range(units)])
+    base  = rng.uniform(2, 35, units)
+    ai    = {'2021': base * 0.7, '2023': base, '2024': base * 1.5, '2025': base * 2.1}
+    un    = rng.uniform(2, 12, units)
+    emp   = {'2023': un, '2024': un + rng.normal(0, 0.4, units),
+             '2025': un + rng.normal(0, 0.6, units)}
+
+    pd.DataFrame({'COUNTRY': names, **{y: _fmt(v) for y, v in ai.items()}}) \
+      .to_csv(os.path.join(folder, 'database_ia.csv'), sep=';', index=False, encoding='utf-8-sig')
+    pd.DataFrame({'COUNTRY': names, **{y: _fmt(v) for y, v in emp.items()}}) \
+      .to_csv(os.path.join(folder, 'database_employees.csv'), sep=';', index=False,
+              encoding='utf-8-sig')
+    age = pd.DataFrame({
+        'TIME': np.repeat(names, 2),
+        'AGE':  np.tile(['Less than 25 years', 'From 25 to 74 years'], units),
+        **{y: _fmt(np.repeat(v, 2) * np.tile([2.8, 0.85], units)) for y, v in emp.items()},
+    })
+    age.to_csv(os.path.join(folder, 'database_employees_age.csv'), sep=';', index=False,
+               encoding='utf-8-sig')
+    for filename in ['database_ia_nace.csv', 'database_ia_europe.csv',
+                     'database_employees_europe.csv', 'database_employees_age_europe.csv']:
+        shutil.copy(os.path.join(CHART_DIR, filename), folder)
+
+
+# ── Timing helpers ─────────────────────────────────────────────────────────────
+def best_of(fn, repeat):
+    """Minimum wall time of `repeat` calls to fn()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def time_import(repeat, module='config'):
+    """Fresh-interpreter timings: `import <module>` alone and the whole process,
+    plus which plotting libraries the import pulled in."""
+    code = (f'import sys, time; t = time.perf_counter(); import {module}; '
+            f'print(time.perf_counter() - t, *(m for m in {PLOTTING_MODULES!r} if m in sys.modules))')
+    imports, startups = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', code], cwd=CHART_DIR, check=True,
+                             capture_output=True, text=True).stdout
+        startups.append(time.perf_counter() - start)
+        seconds, *loaded = out.strip().splitlines()[-1].split()
+        imports.append(float(seconds))
+    return min(imports), min(startups), loaded
+
+
+def check_import(budget, repeat):
+    """Problems with the data layer's import: over `budget` seconds, or
+    loading a plotting library. Returns a list of messages (empty when fine)."""
+    problems = []
+    for module in ('datasets', 'config'):
+        seconds, _, loaded = time_import(repeat, module)
+        print(f'  import {module:<10} {seconds:6.3f}s  (budget {budget:.2f}s)'
+              f'{"  loads " + ", ".join(loaded) if loaded else ""}')
+        if seconds > budget:
+            problems.append(f'import {module} took {seconds:.3f}s, over the {budget:.2f}s budget')
+        if loaded:
+            problems.append(f'import {module} loaded {", ".join(loaded)}')
+    return problems
+
+
+def time_data_stages(repeat):
+    """load / merge / classify / cluster / project stages against the current DATA_PATH."""
+    def load():
+        for filename in DATA_FILES:
+            config.to_float(config.load_csv(filename), config.YEARS)
+
+    derived = ['_merged_rates', 'AI25_MED', 'UN25_MED', 'merged', 'youth_c', 'merged2']
+
+    def merge():
+        config.clear_datasets(derived)
+        config.load_datasets(derived)
+
+    config.clear_datasets()
+    config.load_datasets(['df_ia', 'df_emp', 'df_age'])   # parsing is timed by `load`
+
+    results = {'load': best_of(load, repeat), 'merge': best_of(merge, repeat)}
+    rates = config._get('_merged_rates')
+    ai_med, un_med = config.AI25_MED, config.UN25_MED
+    results['classify'] = best_of(
+        lambda: classify(rates['ai25'], rates['un25'], ai_med, un_med), repeat)
+    results['classify_rowwise'] = best_of(
+        lambda: rates.apply(config.classify_quadrant, axis=1), repeat)
+    trajectories = config._get('trajectory_rates')
+    results['cluster'] = best_of(lambda: cluster_trajectories(trajectories), repeat)
+
+    def project():
+        config.clear_datasets(['projected'])
+        config.load_datasets(['projected'])
+
+    results['project'] = best_of(project, repeat)
+    return results
+
+
+def dataset_bytes():
+    """Deep memory usage of all loaded data frames, in bytes."""
+    config.clear_datasets()
+    config.load_datasets()
+    frames = [config._get(name) for name in config._LOADERS]
+    return int(sum(df.memory_usage(deep=True).sum()
+                   for df in frames if isinstance(df, pd.DataFrame)))
+
+
+def time_chart(script, output_dir, repeat):
+    """(construction, save) seconds for one chart, best of `repeat`."""
+    saves  = []
+    show   = config.show_figure
+
+    def timed_show(fig, name):
+        start = time.perf_counter()
+        path  = show(fig, name)
+        saves.append(time.perf_counter() - start)
+        return path
+
+    totals = []
+    config.configure_render(output_dir, 'png', 100)
+    config.show_figure = timed_show
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            runpy.run_path(script, run_name='__main__')
+            totals.append(time.perf_counter() - start)
+            plt.close('all')
+    finally:
+        config.show_figure = show
+    best = int(np.argmin(totals))
+    return totals[best] - saves[best], saves[best]
+
+
+# ── Runner ─────────────────────────────────────────────────────────────────────
+def run_dataset(label, units, scripts, repeat, render_charts, output_dir):
+    """All stage timings for the dataset currently in DATA_PATH."""
+    records = []
+    for stage, seconds in time_data_stages(repeat).items():
+        records.append({'dataset': label, 'units': units, 'stage': stage, 'seconds': seconds})
+    records.append({'dataset': label, 'units': units, 'stage': 'memory', 'bytes': dataset_bytes()})
+    for script in scripts:
+        name = render_all.chart_name(script)
+        if not render_charts:
+            records.append({'dataset': label, 'units': units, 'stage': f'chart {name}',
+                            'skipped': True})
+            continue
+        config.clear_datasets()
+        config.load_datasets()
+        try:
+            build, save = time_chart(script, output_dir, repeat)
+        except Exception as exc:
+            records.append({'dataset': label, 'units': units, 'stage': f'chart {name}',
+                            'error': f'{type(exc).__name__}: {exc}'})
+            continue
+        records.append({'dataset': label, 'units': units, 'stage': f'chart {name} build',
+                        'seconds': build})
+        records.append({'dataset': label, 'units': units, 'stage': f'chart {name} save',
+                        'seconds': save})
+    return records
+
+
+def compare(records, baseline_path, tolerance):
+    """Print per-stage ratios against a previous result file. Returns the regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r['dataset'], r['stage']): r['seconds']
+                    for r in json.load(f)['results'] if 'seconds' in r}
+    regressions = []
+    for r in records:
+        old = baseline.get((r['dataset'], r['stage']))
+        if old is None or 'seconds' not in r or old <= 0:
+            continue
+        ratio = r['seconds'] / old
+        flag  = ''
+        if ratio > tolerance:
+            regressions.append(r)
+            flag = '  REGRESSION'
+        print(f"  {r['dataset']:<10} {r['stage']:<38} {old:8.4f}s → {r['seconds']:8.4f}s"
+              f"  ×{ratio:5.2f}{flag}")
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=CHART_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark data stages and chart rendering.')
+    parser.add_argument('--sizes', nargs='*', type=int, default=DEFAULT_SIZES,
+                        help='synthetic dataset sizes in geographic units (default: 27 300 3000 30000)')
+    parser.add_argument('--charts', nargs='*', default=None,
+                        help='chart prefixes to time, e.g. 01 04 (default: all; none with an empty list)')
+    parser.add_argument('--max-chart-units', type=int, default=3000,
+                        help='skip chart rendering for synthetic sizes above this (default: 3000)')
+    parser.add_argument('--repeat', type=int, default=3, help='best-of repetitions (default: 3)')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='slowdown ratio reported as a regression (default: 1.25)')
+    parser.add_argument('--check-import', action='store_true',
+                        help='only check that the data layer imports within --import-budget '
+                             'and without matplotlib/scipy; exit non-zero otherwise')
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help=f'seconds allowed for a fresh import (default: {IMPORT_BUDGET})')
+    parser.add_argument('--compact', action='store_true',
+                        help='load categorical keys and float32 rates (CHART_COMPACT)')
+    args = parser.parse_args(argv)
+    if args.compact:
+        os.environ['CHART_COMPACT'] = '1'   # for the fresh-interpreter import timing too
+        config.set_compact(True)
+
+    scripts = render_all.CHART_SCRIPTS
+    if args.charts is not None:
+        scripts = [s for s in scripts if render_all.chart_name(s).split('_')[0] in args.charts]
+
+    if args.check_import:
+        problems = check_import(args.import_budget, args.repeat)
+        for problem in problems:
+            print(f'  FAIL {problem}', file=sys.stderr)
+        return 1 if problems else 0
+
+    import_s, startup_s, _ = time_import(args.repeat)
+    data_s, _, _ = time_import(args.repeat, 'datasets')
+    records = [{'dataset': 'shipped', 'units': 27, 'stage': 'import config', 'seconds': import_s},
+               {'dataset': 'shipped', 'units': 27, 'stage': 'import datasets', 'seconds': data_s},
+               {'dataset': 'shipped', 'units': 27, 'stage': 'startup', 'seconds': startup_s}]
+
+    original = config.DATA_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, 'charts')
+        config.set_data_path(original)
+        records += run_dataset('shipped', 27, scripts, args.repeat, True, output_dir)
+        for units in args.sizes:
+            folder = os.path.join(tmp, f'synthetic_{units}')
+            os.makedirs(folder)
+            write_synthetic_data(folder, units)
+            config.set_data_path(folder)
+            records += run_dataset(f'n={units}', units, scripts, args.repeat,
+                                   units <= args.max_chart_units, output_dir)
+            print(f'  timed n={units}')
+    config.set_data_path(original)
+
+    meta = {'commit': _git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(), 'pandas': pd.__version__,
+            'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'cpu_count': os.cpu_count(), 'repeat': args.repeat, 'compact': config.COMPACT}
+    with open(args.output, 'w') as f:
+        json.dump({'meta': meta, 'results': records}, f, indent=1)
+    print(f'Wrote {len(records)} timings to {args.output}')
+
+    if args.compare:
+        return 1 if compare(records, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
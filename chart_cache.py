@@ -0,0 +1,138 @@
+"""
+Content-hash cache for rendered charts.
+A chart image is a deterministic function of the database_*.csv files, the
+chart script and the project modules it imports (config.py, templates.py,
+… found by following the imports), the reference year and the render
+settings, so it is stored on disk under a hash of exactly those inputs and
+reused until one of them changes. Entries are evicted by total size and age.
+"""
+
+import ast
+import glob
+import hashlib
+import os
+import shutil
+import time
+
+import matplotlib
+
+CHART_DIR         = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(CHART_DIR, '.chart_cache')
+
+_imports = {}   # path -> project modules it imports (by file name)
+
+
+def _module_imports(path):
+    """File names of the project modules `path` imports anywhere (top level,
+    inside functions or behind `if`), memoized per file."""
+    if path not in _imports:
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.add(node.module.split('.')[0])
+        _imports[path] = sorted(f'{n}.py' for n in names
+                                if os.path.isfile(os.path.join(CHART_DIR, f'{n}.py')))
+    return _imports[path]
+
+
+def chart_sources(script):
+    """The chart script and every project module it depends on, transitively."""
+    seen, todo = [], [script]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        todo.extend(os.path.join(CHART_DIR, m) for m in _module_imports(path))
+    return [script] + sorted(seen[1:])
+
+
+_file_digests = {}   # (path, size, mtime_ns) -> sha256, so big CSVs are hashed once
+
+
+def file_digest(path):
+    """sha256 of a file's contents, memoized on its size and modification time."""
+    st = os.stat(path)
+    memo_key = (path, st.st_size, st.st_mtime_ns)
+    if memo_key not in _file_digests:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        _file_digests[memo_key] = h.hexdigest()
+    return _file_digests[memo_key]
+
+
+def chart_key(script, data_path, fmt, dpi, year='', vintage='', grouping='median', projection='',
+              compact=False):
+    """Hash of every input that determines the rendered image. `vintage` is the
+    id of the recorded vintage the data is read from, if not the current CSVs;
+    `grouping` is how the strategic groups are assigned; `projection` the year
+    trends are projected to, if any; `compact` whether the rates are float32."""
+    h = hashlib.sha256()
+    h.update(f'{fmt}|{int(dpi)}|{year}|{vintage}|{grouping}|{projection}|{bool(compact)}|'
+             f'matplotlib {matplotlib.__version__}'.encode())
+    sources = chart_sources(script)
+    data = sorted(glob.glob(os.path.join(data_path, 'database_*.csv')))
+    for path in sources + data:
+        h.update(f'|{os.path.basename(path)}:{file_digest(path)}'.encode())
+    return h.hexdigest()
+
+
+class ChartCache:
+    """Directory of rendered images named `<key>.<format>`."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _entry(self, key, fmt):
+        return os.path.join(self.cache_dir, f'{key}.{fmt}')
+
+    def fetch(self, key, fmt, dest):
+        """Copy a cached image to `dest`. Returns False on a cache miss."""
+        entry = self._entry(key, fmt)
+        try:
+            shutil.copyfile(entry, dest)
+        except FileNotFoundError:
+            return False
+        os.utime(entry)   # mark as recently used for eviction
+        return True
+
+    def store(self, key, fmt, src):
+        """Add a freshly rendered image to the cache (atomic, safe across workers)."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = self._entry(key, fmt)
+        tmp = f'{entry}.{os.getpid()}.tmp'
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, entry)
+
+    def evict(self, max_bytes=None, max_age_days=None):
+        """Drop entries older than `max_age_days`, then least recently used ones
+        until the cache fits in `max_bytes`. Returns the number of files removed."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            st = os.stat(path)
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()   # oldest first
+
+        removed = 0
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            while entries and entries[0][0] < cutoff:
+                os.remove(entries.pop(0)[2])
+                removed += 1
+        if max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            while entries and total > max_bytes:
+                _, size, path = entries.pop(0)
+                os.remove(path)
+                total -= size
+                removed += 1
+        return removed
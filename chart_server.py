@@ -0,0 +1,265 @@
+"""
+Local HTTP service that renders charts on demand.
+The datasets are loaded once, then a pool of render workers is forked from the
+warm process, so a request only pays for building and saving its figure. An
+asyncio front end accepts connections, answers repeated requests from the
+render cache (chart_cache.py), merges identical requests that are already being
+rendered into one job, and turns requests away with 503 when too many renders
+are queued. Everything runs locally; nothing is fetched from the network.
+
+Usage:
+    python chart_server.py --port 8050 --workers 2
+    curl -o quadrants.svg 'http://127.0.0.1:8050/chart/04?year=2024&format=svg&dpi=200'
+
+Endpoints:
+    GET /chart/<name>?year=&format=&dpi=   chart image; <name> is the script name
+                                           or its number prefix, e.g. 04. `year`
+                                           sets the reference year (03–06, 08, 09);
+                                           01, 02 and 07 show every year (400)
+    GET /charts                            JSON list of chart names, years and the
+                                           charts that take a year
+    GET /health                            JSON worker and queue status
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import config
+import instrument
+from chart_cache import DEFAULT_CACHE_DIR, ChartCache
+from render_all import CHART_SCRIPTS, cache_key, chart_name, render_chart
+
+CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+MAX_DPI       = 600
+
+# Charts drawn over all of YEARS whatever the reference year; a `year` other
+# than the default is rejected for them rather than silently ignored
+YEARLESS_CHARTS = ('01', '02', '07')
+
+
+class Busy(Exception):
+    """Raised when the render queue is full."""
+
+
+# ── Worker side ────────────────────────────────────────────────────────────────
+def _warm_worker():
+    """Pool initializer: make sure the datasets and the Agg backend are ready
+    (a no-op for forked workers, which inherit them from the server)."""
+    config.configure_render(tempfile.gettempdir())
+    config.load_datasets(config.deck_datasets())
+
+
+def _render_bytes(script, year, fmt, dpi, cache_dir, key):
+    """Render one chart for a reference year and return the image bytes."""
+    if year != config.REF_YEAR:
+        config.set_reference_year(year)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path, = render_chart(script, tmp, fmt, dpi)
+            if cache_dir is not None:
+                ChartCache(cache_dir).store(key, fmt, path)
+            with open(path, 'rb') as f:
+                return f.read()
+    finally:
+        instrument.flush()   # pool workers exit without running atexit handlers
+
+
+# ── Server side ────────────────────────────────────────────────────────────────
+class ChartServer:
+    """Coalescing, bounded front end over a pool of warm render workers."""
+
+    def __init__(self, workers=2, max_pending=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.workers     = workers
+        self.max_pending = max_pending or 4 * workers
+        self.cache_dir   = cache_dir
+        self.scripts     = {chart_name(s): s for s in CHART_SCRIPTS}
+        self._inflight   = {}   # (script, year, fmt, dpi) -> task shared by all waiters
+        self._executor   = None
+        self.stats       = {'requests': 0, 'renders': 0, 'cache_hits': 0,
+                            'coalesced': 0, 'rejected': 0}
+
+    def start(self):
+        """Load the datasets, then fork the render workers from this warm process."""
+        _warm_worker()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            self.workers, mp_context=context, initializer=_warm_worker)
+        # Start every worker now rather than on the first request.
+        list(self._executor.map(abs, range(self.workers)))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def resolve(self, name):
+        """Script for a chart name or number prefix; None if unknown."""
+        if name in self.scripts:
+            return self.scripts[name]
+        matches = [s for n, s in self.scripts.items() if n.split('_')[0] == name]
+        return matches[0] if len(matches) == 1 else None
+
+    async def chart_bytes(self, script, year, fmt, dpi):
+        """Image bytes for a chart, joining an identical render already in flight."""
+        job = (script, year, fmt, dpi)
+        task = self._inflight.get(job)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                self.stats['rejected'] += 1
+                raise Busy()
+            task = asyncio.ensure_future(self._produce(*job))
+            self._inflight[job] = task
+            task.add_done_callback(lambda _: self._inflight.pop(job, None))
+        # A client hanging up must not cancel the render for the other waiters.
+        return await asyncio.shield(task)
+
+    async def _produce(self, script, year, fmt, dpi):
+        loop = asyncio.get_running_loop()
+        key = None
+        if self.cache_dir is not None:
+            key = await loop.run_in_executor(None, cache_key, script, fmt, dpi, year)
+            data = await loop.run_in_executor(None, self._cached, key, fmt)
+            if data is not None:
+                self.stats['cache_hits'] += 1
+                return data
+        self.stats['renders'] += 1
+        return await loop.run_in_executor(
+            self._executor, _render_bytes, script, year, fmt, dpi, self.cache_dir, key)
+
+    def _cached(self, key, fmt):
+        path = os.path.join(self.cache_dir, f'{key}.{fmt}')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)   # mark as recently used for eviction
+        return data
+
+    # ── HTTP ───────────────────────────────────────────────────────────────────
+    async def handle(self, reader, writer):
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            status, headers, body = await self._respond(reader)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError,
+                ValueError):
+            status, headers, body = 400, {}, b'Bad request\n'
+        headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+        head = [f'HTTP/1.1 {status} {_REASONS[status]}',
+                f'Content-Length: {len(body)}', 'Connection: close']
+        head += [f'{k}: {v}' for k, v in headers.items()]
+        try:
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        request = await reader.readuntil(b'\r\n\r\n')
+        method, target, _ = request.split(b'\r\n', 1)[0].decode('latin-1').split(' ', 2)
+        if method != 'GET':
+            return 405, {'Allow': 'GET'}, b'Only GET is supported\n'
+        self.stats['requests'] += 1
+        url = urlsplit(target)
+        parts = [p for p in url.path.split('/') if p]
+
+        if parts == ['health']:
+            return 200, {'Content-Type': 'application/json'}, _json(
+                {'workers': self.workers, 'inflight': len(self._inflight),
+                 'max_pending': self.max_pending, 'data_path': config.DATA_PATH, **self.stats})
+        if parts == ['charts']:
+            return 200, {'Content-Type': 'application/json'}, _json(
+                {'charts': sorted(self.scripts), 'years': config.YEARS,
+                 'default_year': config.YEARS[-1], 'formats': list(CONTENT_TYPES),
+                 'year_charts': sorted(n for n in self.scripts
+                                       if n.split('_')[0] not in YEARLESS_CHARTS)})
+        if len(parts) != 2 or parts[0] != 'chart':
+            return 404, {}, b'Not found\n'
+
+        script = self.resolve(parts[1])
+        if script is None:
+            return 404, {}, f'Unknown chart {parts[1]!r}\n'.encode()
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        year = query.get('year', config.YEARS[-1])
+        fmt  = query.get('format', 'png')
+        try:
+            dpi = int(query.get('dpi', 150))
+        except ValueError:
+            dpi = 0
+        if year not in config.YEARS:
+            return 400, {}, f'year must be one of {config.YEARS}\n'.encode()
+        if year != config.YEARS[-1] and chart_name(script).split('_')[0] in YEARLESS_CHARTS:
+            return 400, {}, f'{chart_name(script)} shows every year and takes no year\n'.encode()
+        if fmt not in CONTENT_TYPES:
+            return 400, {}, f'format must be one of {list(CONTENT_TYPES)}\n'.encode()
+        if not 10 <= dpi <= MAX_DPI:
+            return 400, {}, f'dpi must be between 10 and {MAX_DPI}\n'.encode()
+
+        try:
+            data = await self.chart_bytes(script, year, fmt, dpi)
+        except Busy:
+            return 503, {'Retry-After': '1'}, b'Render queue is full, retry shortly\n'
+        except Exception as exc:
+            return 500, {}, f'{type(exc).__name__}: {exc}\n'.encode()
+        return 200, {'Content-Type': CONTENT_TYPES[fmt]}, data
+
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+def _json(obj):
+    return (json.dumps(obj, indent=2) + '\n').encode()
+
+
+async def serve(server, host, port):
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f'Serving charts on http://{host}:{port}/ with {server.workers} worker(s)')
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the project charts over local HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--data', default=config.DATA_PATH,
+                        help='data folder holding the database_*.csv files')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='number of pre-forked render processes (default: 2)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='distinct renders queued before answering 503 (default: 4 per worker)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always re-render, bypassing the render cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    config.set_data_path(args.data)
+    server = ChartServer(args.workers, args.max_pending,
+                         None if args.no_cache else args.cache_dir)
+    start = time.perf_counter()
+    server.start()
+    print(f'Workers warm in {time.perf_counter() - start:.2f}s')
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Trajectory clustering: an alternative to the median-split taxonomy.
+Instead of placing each country (or region) by its reference-year AI
+adoption and unemployment against two medians, it groups whole trajectories.
+These are the AI, unemployment and youth unemployment rates of every year,
+one feature vector per row. Each metric is standardized over all of its years
+(one mean and one spread per metric), so both the level and the change over
+the years count.
+
+Three methods, all vectorized over the rows:
+
+    kmeans        Lloyd's algorithm from k-means++ seeds; the restarts run
+                  in parallel on a forked process pool, each with its own
+                  SeedSequence stream (same result for any number of workers)
+    minibatch     mini-batch k-means: running-mean centroid updates on random
+                  batches, for very large regional tables
+    hierarchical  Ward agglomeration; above HIER_LEAVES rows it runs on the
+                  centroids of a mini-batch pre-clustering, weighted by size
+
+A previous result can warm-start the next fit when new data arrives
+(`previous=`, opt-in). Its clusters seed the centroids, recomputed from the
+new features of the rows present in both. The datasets loader always starts
+cold, so that a render never depends on what was loaded before it.
+
+With k = 4 every cluster is matched to the strategic group
+(A–D) whose quadrant its reference-year centroid sits in best, so
+GROUP_COLORS and GROUP_NAMES apply unchanged (CHART_GROUPING in datasets.py).
+
+Usage:
+    python clustering.py                                  # k-means vs median split
+    python clustering.py --method hierarchical
+    python clustering.py --method minibatch --synthetic 30000 --workers 4
+"""
+
+import argparse
+import itertools
+import multiprocessing
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from taxonomy import GROUPS, year_suffixes
+
+METHODS     = ('kmeans', 'minibatch', 'hierarchical')
+METRICS     = ('ai', 'un', 'youth')
+HIER_LEAVES = 256    # most rows Ward agglomerates directly
+PRE_ITER    = 50     # mini-batches of the pre-clustering (it need not converge)
+
+Clustering = namedtuple('Clustering', 'labels groups centers inertia n_iter method')
+Clustering.__doc__ = """Result of cluster_trajectories.
+labels  : cluster number of each row, a Series indexed by the key column
+groups  : strategic group (A–D) of each row, or None when k != 4
+centers : DataFrame (k × features) of standardized centroids
+inertia : sum of squared distances of the rows to their centroid
+n_iter  : iterations of the best run
+method  : 'kmeans', 'minibatch' or 'hierarchical'"""
+
+
+# ── Features ───────────────────────────────────────────────────────────────────
+def feature_columns(df, years=None, metrics=METRICS):
+    """<metric><yy> columns of `df` for every year, metrics missing from it skipped."""
+    years = years or year_suffixes(df)
+    return [f'{m}{y}' for m in metrics if f'{m}{years[0]}' in df.columns for y in years]
+
+
+def features(df, columns):
+    """Standardized float64 matrix (n_rows, n_columns) of trajectory columns.
+
+    Each metric (the column name without its two-digit year) is centred and
+    scaled by its mean and standard deviation over all of its years. A
+    missing rate becomes 0, its metric's mean.
+    """
+    X = df[columns].to_numpy(dtype=np.float64, copy=True)
+    metric = np.array([c[:-2] for c in columns])
+    for m in np.unique(metric):
+        cols = metric == m
+        mean, sd = np.nanmean(X[:, cols]), np.nanstd(X[:, cols])
+        X[:, cols] = (X[:, cols] - mean) / (sd if sd > 0 else 1.0)
+    return np.nan_to_num(X, nan=0.0)
+
+
+# ── k-means ────────────────────────────────────────────────────────────────────
+def _sq_distances(X, centers, x_sq=None):
+    """(n_rows, k) squared Euclidean distances, as |x|² − 2x·c + |c|²."""
+    x_sq = (X * X).sum(axis=1) if x_sq is None else x_sq
+    d = x_sq[:, None] - 2.0 * (X @ centers.T) + (centers * centers).sum(axis=1)
+    return np.maximum(d, 0.0)
+
+
+def _nearest(X, centers, x_sq=None):
+    """(labels, squared distances) of each row's nearest centroid. |x|² does
+    not change the argmin, so it is only added to the chosen distances."""
+    x_sq = (X * X).sum(axis=1) if x_sq is None else x_sq
+    score = (centers * centers).sum(axis=1) - 2.0 * (X @ centers.T)
+    labels = score.argmin(axis=1)
+    return labels, np.maximum(score[np.arange(len(X)), labels] + x_sq, 0.0)
+
+
+def _means(X, labels, k, weights=None):
+    """(k, n_features) weighted mean of the rows of each label, and the label weights."""
+    weights = np.ones(len(X)) if weights is None else weights
+    counts = np.bincount(labels, weights=weights, minlength=k)
+    sums = np.stack([np.bincount(labels, weights=X[:, j] * weights, minlength=k)
+                     for j in range(X.shape[1])], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts[:, None], counts
+
+
+def kmeans_plus_plus(X, k, rng, x_sq=None):
+    """k-means++ seeds: each next centroid is drawn with probability
+    proportional to the squared distance to the nearest one so far."""
+    centers = np.empty((k, X.shape[1]))
+    centers[0] = X[rng.integers(len(X))]
+    closest = _sq_distances(X, centers[:1], x_sq)[:, 0]
+    for c in range(1, k):
+        total = closest.sum()
+        i = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centers[c] = X[i]
+        closest = np.minimum(closest, _sq_distances(X, centers[c:c + 1], x_sq)[:, 0])
+    return centers
+
+
+def lloyd(X, centers, max_iter=300, tol=1e-6, weights=None):
+    """Lloyd iterations from `centers`. Returns (labels, centers, inertia, n_iter).
+    A cluster left empty is moved to the row farthest from its centroid."""
+    centers = np.array(centers, dtype=np.float64)
+    k = len(centers)
+    x_sq = (X * X).sum(axis=1)
+    for n_iter in range(1, max_iter + 1):
+        labels, closest = _nearest(X, centers, x_sq)
+        new, counts = _means(X, labels, k, weights)
+        for c in np.flatnonzero(counts == 0):
+            far = closest.argmax()
+            new[c], labels[far], closest[far] = X[far], c, 0.0
+        shift = ((new - centers) ** 2).sum()
+        centers = new
+        if shift <= tol:
+            break
+    labels, closest = _nearest(X, centers, x_sq)
+    inertia = float(closest.sum() if weights is None else (closest * weights).sum())
+    return labels, centers, inertia, n_iter
+
+
+def minibatch(X, centers, batch_size=1024, max_iter=200, tol=1e-6, rng=None):
+    """Mini-batch k-means from `centers`: each centroid is the running mean
+    of the batch rows assigned to it so far. Ends with one full assignment;
+    a table no larger than a batch runs plain Lloyd iterations. Returns (labels, centers, inertia, n_iter)."""
+    if batch_size >= len(X):
+        return lloyd(X, centers, max_iter, tol)   # every batch would be the whole table
+    rng = rng or np.random.default_rng()
+    centers = np.array(centers, dtype=np.float64)
+    k = len(centers)
+    seen = np.zeros(k)
+    for n_iter in range(1, max_iter + 1):
+        batch = X[rng.integers(len(X), size=batch_size)]
+        labels = _nearest(batch, centers)[0]
+        means, counts = _means(batch, labels, k)
+        hit = counts > 0
+        seen[hit] += counts[hit]
+        step = (counts[hit] / seen[hit])[:, None]
+        old = centers.copy()
+        centers[hit] += step * (means[hit] - centers[hit])
+        if ((centers - old) ** 2).sum() <= tol:
+            break
+    labels, closest = _nearest(X, centers)
+    return labels, centers, float(closest.sum()), n_iter
+
+
+# Rows of the current fit, set before the pool forks so that workers inherit
+# them instead of receiving a copy with every task.
+_shared = {}
+
+
+def _restart(task):
+    """One seeded run: (labels, centers, inertia, n_iter)."""
+    method, k, seed, max_iter, batch_size = task
+    X = _shared['X']
+    rng = np.random.default_rng(seed)
+    if method == 'minibatch':
+        # Seed on a sample: k-means++ over every row costs k full passes
+        sample = X[rng.choice(len(X), size=min(len(X), 20 * batch_size), replace=False)]
+        return minibatch(X, kmeans_plus_plus(sample, k, rng), batch_size, max_iter, rng=rng)
+    return lloyd(X, kmeans_plus_plus(X, k, rng), max_iter)
+
+
+def _best_of_restarts(X, method, k, n_init, seed, workers, max_iter, batch_size):
+    """Lowest-inertia run of `n_init` seeded restarts, spread over `workers`."""
+    seeds = np.random.SeedSequence(seed).spawn(n_init)
+    tasks = [(method, k, s, max_iter, batch_size) for s in seeds]
+    _shared['X'] = X
+    try:
+        if workers > 1 and n_init > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            with context.Pool(min(workers, n_init)) as pool:
+                runs = pool.map(_restart, tasks)
+        else:
+            runs = [_restart(task) for task in tasks]
+    finally:
+        _shared.clear()
+    return min(runs, key=lambda run: run[2])   # first best on ties, whatever the workers
+
+
+# ── Hierarchical (Ward) ────────────────────────────────────────────────────────
+def ward(X, k, weights=None):
+    """Cut of the Ward tree of the rows of `X` at `k` clusters: labels.
+
+    Rows may carry weights (cluster sizes), so that the centroids of a
+    pre-clustering merge like the rows behind them. Merge costs are updated
+    with the Lance–Williams recurrence; O(n²) memory, meant for a few
+    hundred rows.
+    """
+    n = len(X)
+    w = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    # D(i, j) = 2·wi·wj/(wi+wj)·|xi − xj|²: the squared distance for single rows
+    D = 2.0 * np.outer(w, w) / (w[:, None] + w) * _sq_distances(X, X)
+    np.fill_diagonal(D, np.inf)
+    labels = np.arange(n)
+    alive = np.ones(n, dtype=bool)
+    for _ in range(n - k):
+        i, j = np.unravel_index(D.argmin(), D.shape)
+        i, j = min(i, j), max(i, j)
+        wi, wj = w[i], w[j]
+        row = ((wi + w) * D[i] + (wj + w) * D[j] - w * D[i, j]) / (wi + wj + w)
+        row[~alive] = np.inf
+        row[i] = np.inf
+        D[i], D[:, i] = row, row
+        D[j], D[:, j] = np.inf, np.inf
+        w[i] += wj
+        alive[j] = False
+        labels[labels == j] = i
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def hierarchical(X, k, seed=0, max_iter=PRE_ITER):
+    """Ward clustering of the rows; above HIER_LEAVES rows, of the centroids
+    of a mini-batch pre-clustering into HIER_LEAVES clusters, weighted by size.
+    Returns (labels, centers, inertia, n_iter)."""
+    if len(X) > HIER_LEAVES:
+        rng = np.random.default_rng(seed)
+        sample = X[rng.choice(len(X), size=min(len(X), 16 * HIER_LEAVES), replace=False)]
+        leaf, leaf_centers = minibatch(X, kmeans_plus_plus(sample, HIER_LEAVES, rng),
+                                       8 * HIER_LEAVES, max_iter, rng=rng)[:2]
+        sizes = np.bincount(leaf, minlength=HIER_LEAVES)
+        used = sizes > 0
+        cut = np.full(HIER_LEAVES, -1)
+        cut[used] = ward(leaf_centers[used], k, sizes[used])
+        labels = cut[leaf]
+    else:
+        labels = ward(X, k)
+    centers = _means(X, labels, k)[0]
+    inertia = float(((X - centers[labels]) ** 2).sum())
+    return labels, centers, inertia, 1
+
+
+# ── Mapping to the strategic groups ────────────────────────────────────────────
+def assign_groups(centers, columns, ai_threshold, un_threshold, year):
+    """Strategic group of each of 4 clusters: the one-to-one matching of
+    clusters to groups that best agrees with the quadrant (above or below
+    the thresholds, in standardized units) of their `year` centroid."""
+    if len(centers) != len(GROUPS):
+        raise ValueError(f'{len(GROUPS)} clusters map onto the strategic groups, not {len(centers)}')
+    ai = centers[:, columns.index(f'ai{year}')] - ai_threshold
+    un = centers[:, columns.index(f'un{year}')] - un_threshold
+    # Quadrant signs of the groups: A (+ai, +un), B (−, +), C (−, −), D (+, −)
+    sign_ai, sign_un = np.array([1, -1, -1, 1]), np.array([1, 1, -1, -1])
+    score = ai[:, None] * sign_ai + un[:, None] * sign_un     # cluster × group
+    best = max(itertools.permutations(range(len(GROUPS))),
+               key=lambda p: score[np.arange(len(p)), p].sum())
+    return GROUPS[list(best)]
+
+
+def warm_centers(X, keys, previous):
+    """Centroids recomputed on the new rows from a previous Clustering: the
+    mean features of the rows it had labelled, matched by key. A cluster
+    none of whose rows remain keeps its previous centroid when the features
+    still match, else falls back to the overall mean."""
+    k = len(previous.centers)
+    old = previous.labels.reindex(pd.Index(keys, dtype=object)).to_numpy(dtype=float)
+    kept = ~np.isnan(old)
+    centers, counts = _means(X[kept], old[kept].astype(int), k)
+    if previous.centers.shape[1] == X.shape[1]:
+        fallback = previous.centers.to_numpy()
+    else:
+        fallback = np.broadcast_to(X.mean(axis=0), centers.shape)
+    return np.where(counts[:, None] > 0, centers, fallback)
+
+
+def cluster_trajectories(df, method='kmeans', k=4, years=None, metrics=METRICS,
+                         n_init=10, seed=0, workers=1, previous=None, max_iter=300,
+                         batch_size=1024, key='COUNTRY'):
+    """Cluster the rows of `df` by their <metric><yy> trajectories.
+
+    `years` are two-digit suffixes (default: every ai/un pair), the last one
+    being the reference year of the group mapping. `previous` (a Clustering
+    of earlier data) warm-starts k-means and mini-batch from its clusters,
+    with a single run. Returns a Clustering indexed by `key`. Raises
+    ValueError when `df` has fewer rows than clusters.
+    """
+    if method not in METHODS:
+        raise ValueError(f'Unknown clustering method {method!r}; use one of {METHODS}')
+    years = list(years or year_suffixes(df))
+    columns = feature_columns(df, years, metrics)
+    X = features(df, columns)
+    keys = df[key].astype(str).to_numpy(dtype=object)
+    if len(X) < k:
+        raise ValueError(f'{len(X)} trajectories cannot form {k} clusters')
+
+    if method == 'hierarchical':
+        labels, centers, inertia, n_iter = hierarchical(X, k, seed)
+    elif previous is not None:
+        init = warm_centers(X, keys, previous)
+        if method == 'minibatch':
+            labels, centers, inertia, n_iter = minibatch(X, init, batch_size, max_iter,
+                                                         rng=np.random.default_rng(seed))
+        else:
+            labels, centers, inertia, n_iter = lloyd(X, init, max_iter)
+    else:
+        labels, centers, inertia, n_iter = _best_of_restarts(X, method, k, n_init, seed,
+                                                             workers, max_iter, batch_size)
+
+    index = pd.Index(keys, name=key)
+    groups = None
+    if k == len(GROUPS):
+        ref = columns.index(f'ai{years[-1]}'), columns.index(f'un{years[-1]}')
+        ai_thr, un_thr = np.median(X[:, ref[0]]), np.median(X[:, ref[1]])
+        mapping = assign_groups(centers, columns, ai_thr, un_thr, years[-1])
+        groups = pd.Series(mapping[labels], index=index, name='group')
+    return Clustering(pd.Series(labels, index=index, name='cluster'), groups,
+                      pd.DataFrame(centers, columns=columns), inertia, n_iter, method)
+
+
+def synthetic_trajectories(n, years=('23', '24', '25'), seed=0):
+    """`n` synthetic regional trajectories drawn around four archetypes."""
+    rng = np.random.default_rng(seed)
+    kind = rng.integers(4, size=n)
+    ai0 = np.array([25.0, 10.0, 12.0, 28.0])[kind] + rng.normal(0, 3, n)
+    ai_step = np.array([5.0, 1.5, 2.0, 6.0])[kind] + rng.normal(0, 1, n)
+    un0 = np.array([9.0, 11.0, 4.5, 4.0])[kind] + rng.normal(0, 1, n)
+    un_step = np.array([0.4, 0.2, -0.1, -0.3])[kind] + rng.normal(0, 0.2, n)
+    columns = {'COUNTRY': [f'GEO{i:05d}' for i in range(n)]}
+    for t, y in enumerate(years):
+        columns[f'ai{y}'] = ai0 + t * ai_step
+        columns[f'un{y}'] = un0 + t * un_step
+    for t, y in enumerate(years):
+        columns[f'youth{y}'] = (un0 + t * un_step) * 2.4 + rng.normal(0, 1.5, n)
+    return pd.DataFrame(columns)
+
+
+if __name__ == '__main__':
+    import time
+
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Cluster trajectories into strategic groups.')
+    parser.add_argument('--method', default='kmeans', choices=METHODS)
+    parser.add_argument('--k', type=int, default=4, help='number of clusters (4 maps onto A–D)')
+    parser.add_argument('--n-init', type=int, default=10, help='seeded restarts (k-means)')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--synthetic', type=int,
+                        help='cluster this many synthetic regional trajectories instead')
+    parser.add_argument('--output', help='write the per-row table to this CSV file')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        df = synthetic_trajectories(args.synthetic, seed=args.seed)
+    else:
+        df = datasets.trajectory_rates
+    start = time.perf_counter()
+    result = cluster_trajectories(df, args.method, args.k, n_init=args.n_init, seed=args.seed,
+                                  workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    table = pd.DataFrame({'cluster': result.labels})
+    if result.groups is not None:
+        table['group'] = result.groups
+    if not args.synthetic:
+        table['median_split'] = datasets.merged.set_index(
+            datasets.merged['COUNTRY'].astype(str))['group'].astype(str)
+    if args.output:
+        table.to_csv(args.output)
+    if args.synthetic:
+        print(table.value_counts().sort_index().to_string())
+    else:
+        print(table.sort_values(list(table.columns)).to_string())
+    print(f'{args.method}: {len(df)} trajectories, {len(result.centers.columns)} features, '
+          f'k={len(result.centers)}, inertia {result.inertia:.1f}, {result.n_iter} iterations, '
+          f'{elapsed:.2f}s')
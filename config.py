@@ -1,19 +1,31 @@
 """
 Shared configuration for all project charts.
-Loads all datasets, defines the color palette, and builds the merged country table.
+Defines the color palette and the render mode, and re-exports the data layer
+(datasets.py): `df_nace`, `merged`, `AI_MED`, … are loaded on first access
+and memoized, reading only the CSVs they depend on. matplotlib is imported
+only when a chart first uses `plt` or `mpatches` (or saves a figure), so
+`import config` alone stays as light as `import datasets`.
 """
 
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import sys
+
 import numpy as np
-from scipy.stats import pearsonr
-import warnings
-warnings.filterwarnings('ignore')
+import pandas as pd
+
+import datasets
+from instrument import stage
 
-# ── Path to data (same folder as this script) ─────────────────────────────────
-DATA_PATH = os.path.dirname(os.path.abspath(__file__)) + os.sep
+# Names `from config import *` gives a chart script. Data-layer names resolve
+# through __getattr__ below, so they always reflect the current data path and
+# reference year, and datasets still load only when a chart names them.
+__all__ = [
+    'C1', 'C2', 'C3', 'C4', 'C5', 'BG', 'GA', 'GB', 'GC', 'GD', 'WHITE',
+    'YEAR_COLORS', 'GROUP_COLORS', 'GROUP_NAMES', 'YEARS', 'REF_YEAR', 'REF', 'DATA_PATH',
+    'configure_render', 'render_path', 'set_window_title', 'show_figure',
+    'MAX_POINT_LABELS', 'labelled_points', 'classify_quadrant', 'load_csv', 'to_float',
+    'stage', 'np', 'pd', 'plt', 'mpatches',
+]
 
 # ── Color palette ──────────────────────────────────────────────────────────────
 C1    = '#405e4d'   # Dark green  → titles, median lines
@@ -28,83 +40,93 @@ GC    = '#f87171'   # Red         → Group C (Traditional Resilience)
 GD    = C1            # Dark green  → Group D (Digital Frontier)
 WHITE = 'white'
 
-YEARS = ['2023', '2024', '2025']
 YEAR_COLORS = [C3, C4, C5]
 
-# ── Helper functions ───────────────────────────────────────────────────────────
-def load_csv(filename):
-    """Load a semicolon-separated CSV from DATA_PATH."""
-    return pd.read_csv(DATA_PATH + filename, sep=";", encoding='utf-8-sig')
-
-def to_float(df, cols):
-    """Convert columns from European decimal format (comma) to float."""
-    for c in cols:
-        df[c] = pd.to_numeric(
-            df[c].astype(str).str.replace(',', '.'), errors='coerce'
-        )
-    return df
-
-# ── Load all datasets ──────────────────────────────────────────────────────────
-df_ia     = to_float(load_csv("database_ia.csv"),                    YEARS)
-df_emp    = to_float(load_csv("database_employees.csv"),             YEARS)
-df_nace   = to_float(load_csv("database_ia_nace.csv"),               YEARS)
-df_ia_eu  = to_float(load_csv("database_ia_europe.csv"),             YEARS)
-df_emp_eu = to_float(load_csv("database_employees_europe.csv"),      YEARS)
-df_age_eu = to_float(load_csv("database_employees_age_europe.csv"),  YEARS)
-df_age    = to_float(load_csv("database_employees_age.csv"),         YEARS)
-df_age.columns = ['COUNTRY', 'AGE', '2023', '2024', '2025']
-
-# ── EU-27 aggregate single values per year ─────────────────────────────────────
-ai_eu = [float(str(df_ia_eu.iloc[0][y]).replace(',', '.'))  for y in YEARS]
-un_eu = [float(str(df_emp_eu.iloc[0][y]).replace(',', '.')) for y in YEARS]
-
-# ── NACE sector name mapping (abbreviations for chart readability) ─────────────
-nace_map = {
-    "Water supply; sewerage, waste management and remediation activities": "Water and Waste Mgmt",
-    "Wholesale and retail trade; repair of motor vehicles and motorcycles": "Wholesale and Retail",
-    "Electricity, gas, steam and air conditioning supply":                  "Energy and Supply",
-    "Professional, scientific and technical activities":                    "Professional and Tech",
-    "Administrative ans supoprt service activities":                        "Admin and Support",
-    "Accommodation and food service activities":                            "Hospitality and Food",
-    "Information and communication":                                        "Information and Comm.",
-    "Real estate activities":                                               "Real Estate",
-    "Transportation and storage":                                           "Transport and Storage",
-    "Manufacturing":                                                        "Manufacturing",
-    "Construction":                                                         "Construction"
-}
-df_nace['NACE'] = df_nace['NACE'].replace(nace_map)
-df_nace = df_nace.sort_values('2025', ascending=True)
-
-# ── Merged country dataset (AI adoption + Unemployment) ───────────────────────
-merged = pd.merge(
-    df_ia[['COUNTRY', '2023', '2024', '2025']],
-    df_emp[['COUNTRY', '2023', '2024', '2025']],
-    on='COUNTRY', suffixes=('_ai', '_unemp')
-).dropna()
-merged.columns = ['COUNTRY', 'ai23', 'ai24', 'ai25', 'un23', 'un24', 'un25']
-
-# ── Quadrant classification using 2025 medians as EU-27 benchmarks ────────────
-AI25_MED = merged['ai25'].median()   
-UN25_MED = merged['un25'].median()   
-
-def classify_quadrant(row):
-    """Assign a strategic group based on the country's position relative to EU medians."""
-    if   row['ai25'] >= AI25_MED and row['un25'] >= UN25_MED: return 'A'  # High AI, High Unemp
-    elif row['ai25'] <  AI25_MED and row['un25'] >= UN25_MED: return 'B'  # Low AI,  High Unemp
-    elif row['ai25'] <  AI25_MED and row['un25'] <  UN25_MED: return 'C'  # Low AI,  Low Unemp
-    else:                                                       return 'D'  # High AI, Low Unemp
-
-merged['group'] = merged.apply(classify_quadrant, axis=1)
-
 GROUP_COLORS = {'A': GA, 'B': GB, 'C': GC, 'D': GD}
-GROUP_NAMES  = {
-    'A': 'Technological Vanguard',
-    'B': 'Structural Lag',
-    'C': 'Traditional Resilience',
-    'D': 'Digital Frontier'
-}
-
-# ── Youth unemployment per country (2025) for scatter analysis ─────────────────
-youth_c = (df_age[df_age['AGE'].str.contains('Less')][['COUNTRY', '2025']]
-           .rename(columns={'2025': 'youth25'}))
-merged2 = pd.merge(merged, youth_c, on='COUNTRY')
+
+# ── Render mode ────────────────────────────────────────────────────────────────
+# Interactive by default. Setting CHART_OUTPUT (or calling configure_render)
+# switches to the non-interactive Agg backend: charts skip the window-manager
+# calls and are written to CHART_OUTPUT as CHART_FORMAT at CHART_DPI.
+RENDER_FORMATS = ('png', 'svg', 'pdf')
+RENDER_OUTPUT  = None
+RENDER_FORMAT  = 'png'
+RENDER_DPI     = 150
+
+def configure_render(output=None, fmt='png', dpi=150):
+    """Render charts to files in `output` (headless), or interactively if None."""
+    global RENDER_OUTPUT, RENDER_FORMAT, RENDER_DPI
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"Unsupported chart format {fmt!r}; expected one of {RENDER_FORMATS}")
+    RENDER_OUTPUT, RENDER_FORMAT, RENDER_DPI = output, fmt, int(dpi)
+    if output is not None and 'matplotlib.pyplot' in sys.modules:
+        _pyplot()   # switch an already imported pyplot to Agg
+
+def render_path(name):
+    """Path a chart named `name` is written to in render mode."""
+    return os.path.join(RENDER_OUTPUT, f'{name}.{RENDER_FORMAT}')
+
+def set_window_title(fig, title):
+    """Set the window title when running interactively."""
+    if RENDER_OUTPUT is None:
+        fig.canvas.manager.set_window_title(title)
+
+def show_figure(fig, name):
+    """Show the figure, or in render mode save it to render_path(name) and close it."""
+    if RENDER_OUTPUT is None:
+        _pyplot().show()
+        return None
+    os.makedirs(RENDER_OUTPUT, exist_ok=True)
+    path = render_path(name)
+    with stage('save', chart=name):
+        fig.savefig(path, format=RENDER_FORMAT, dpi=RENDER_DPI, bbox_inches='tight')
+    _pyplot().close(fig)
+    return path
+
+# ── Point labels ───────────────────────────────────────────────────────────────
+# Scatter/lollipop charts label every point for the 27 member states; with
+# regional data only the most salient points keep a text label.
+MAX_POINT_LABELS = 60
+
+def labelled_points(*coords, limit=MAX_POINT_LABELS):
+    """Indices of the points to label: all of them up to `limit`, otherwise the
+    `limit` points furthest from the median (measured in each axis' spread)."""
+    pts = np.column_stack([np.asarray(c, dtype=float) for c in coords])
+    if len(pts) <= limit:
+        return np.arange(len(pts))
+    spread = np.nanstd(pts, axis=0)
+    spread[spread == 0] = 1.0
+    dist = np.nansum(((pts - np.nanmedian(pts, axis=0)) / spread) ** 2, axis=1)
+    return np.sort(np.argpartition(-dist, limit)[:limit])
+
+# ── Lazy plotting imports and data names ──────────────────────────────────────
+def _pyplot():
+    """matplotlib.pyplot, imported on first use (with the Agg backend in render mode)."""
+    import matplotlib
+    if RENDER_OUTPUT is not None and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if RENDER_OUTPUT is not None and plt.get_backend().lower() != 'agg':
+        plt.switch_backend('Agg')
+    globals()['plt'] = plt
+    return plt
+
+def __getattr__(name):
+    if name == 'plt':
+        return _pyplot()
+    if name == 'mpatches':
+        _pyplot()
+        import matplotlib.patches as mpatches
+        globals()['mpatches'] = mpatches
+        return mpatches
+    try:
+        return getattr(datasets, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+def __dir__():
+    return sorted(set(globals()) | set(dir(datasets)) | {'plt', 'mpatches'})
+
+configure_render(os.environ.get('CHART_OUTPUT'),
+                 os.environ.get('CHART_FORMAT', 'png'),
+                 os.environ.get('CHART_DPI', 150))
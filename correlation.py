@@ -0,0 +1,250 @@
+"""
+Batch correlation analysis of AI adoption against unemployment.
+Pearson, Spearman and Kendall (tau-b) coefficients are computed for every
+pairing of an AI-adoption year with an unemployment year (total and youth),
+over all countries, within each strategic group, and across years for each
+NACE sector against the EU-27 rates.
+
+Confidence intervals come from a percentile bootstrap. Each slice draws one
+(n_boot, n) index array, and every year pairing and every replicate are
+evaluated together as stacked arrays rather than in a Python loop.
+
+Usage:
+    python correlation.py                      # table for the shipped data
+    python correlation.py --boot 5000 --output correlations.csv
+"""
+
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('pearson', 'spearman', 'kendall')
+
+# Kendall compares every pair of observations: the pairwise signs of all
+# replicates are built in blocks holding at most this many elements.
+KENDALL_BLOCK = 1 << 24
+
+
+# ── Coefficients along the last axis ───────────────────────────────────────────
+def rankdata(a):
+    """Ranks along the last axis, ties getting their average rank (1-based)."""
+    a = np.asarray(a, dtype=float)
+    n = a.shape[-1]
+    order = np.argsort(a, axis=-1, kind='stable')
+    s = np.take_along_axis(a, order, axis=-1)
+    pos = np.broadcast_to(np.arange(n), s.shape)
+    starts = np.ones(s.shape, dtype=bool)
+    starts[..., 1:] = s[..., 1:] != s[..., :-1]
+    ends = np.ones(s.shape, dtype=bool)
+    ends[..., :-1] = starts[..., 1:]
+    first = np.maximum.accumulate(np.where(starts, pos, 0), axis=-1)
+    last = np.minimum.accumulate(np.where(ends, pos, n - 1)[..., ::-1], axis=-1)[..., ::-1]
+    ranks = np.empty(s.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=-1)
+    return ranks
+
+
+def pearson(x, y):
+    """Pearson r along the last axis; NaN where either side is constant."""
+    xc = x - x.mean(axis=-1, keepdims=True)
+    yc = y - y.mean(axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (xc * yc).sum(-1) / np.sqrt((xc * xc).sum(-1) * (yc * yc).sum(-1))
+
+
+def spearman(x, y):
+    """Spearman rho along the last axis (Pearson r of the average ranks)."""
+    return pearson(rankdata(x), rankdata(y))
+
+
+def kendall(x, y):
+    """Kendall tau-b along the last axis."""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[-1]
+    i, j = np.triu_indices(n, 1)
+    flat_x, flat_y = x.reshape(-1, n), y.reshape(-1, n)
+    tau = np.empty(len(flat_x))
+    step = max(1, KENDALL_BLOCK // max(len(i), 1))
+    for s in range(0, len(flat_x), step):
+        bx, by = flat_x[s:s + step], flat_y[s:s + step]
+        dx = np.sign(bx[:, i] - bx[:, j])   # one entry per pair of observations
+        dy = np.sign(by[:, i] - by[:, j])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tau[s:s + step] = (np.einsum('kp,kp->k', dx, dy)
+                               / np.sqrt(np.einsum('kp,kp->k', dx, dx)
+                                         * np.einsum('kp,kp->k', dy, dy)))
+    return tau.reshape(x.shape[:-1])
+
+
+CORRELATIONS = {'pearson': pearson, 'spearman': spearman, 'kendall': kendall}
+
+
+def bootstrap(x, y, methods=METHODS, n_boot=2000, level=0.95, rng=None):
+    """Coefficients and percentile bootstrap intervals for stacked samples.
+
+    `x` and `y` have shape (n_pairs, n) without missing values; all pairs share
+    the same resampled rows. Returns {method: (r, low, high)}, each (n_pairs,).
+    """
+    rng = np.random.default_rng(rng)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = x.shape[-1]
+    idx = rng.integers(0, n, size=(n_boot, n))
+    xb, yb = x[:, idx], y[:, idx]   # (n_pairs, n_boot, n)
+    tail = (1 - level) / 2 * 100
+    result = {}
+    for method in methods:
+        fn = CORRELATIONS[method]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)   # all-degenerate slices
+            low, high = np.nanpercentile(fn(xb, yb), [tail, 100 - tail], axis=-1)
+        result[method] = (fn(x, y), low, high)
+    return result
+
+
+# ── Study slices ───────────────────────────────────────────────────────────────
+def youth_rates(df_age):
+    """Under-25 unemployment per country as youth<yy> columns."""
+    years = [c for c in df_age.columns if str(c).isdigit() and len(str(c)) == 4]
+    youth = df_age[df_age['AGE'].astype(str).str.contains('Less')]
+    youth = youth[['COUNTRY'] + years].rename(columns={y: f'youth{y[2:]}' for y in years})
+    youth['COUNTRY'] = youth['COUNTRY'].astype(str)
+    return youth
+
+
+def _suffixes(df, prefix):
+    return sorted(c[len(prefix):] for c in df.columns
+                  if c.startswith(prefix) and c[len(prefix):].isdigit())
+
+
+def _slice_rows(x, y, labels, methods, n_boot, level, rng):
+    """Correlations for stacked pairs, batched per pattern of missing values."""
+    rows = []
+    valid = ~(np.isnan(x) | np.isnan(y))
+    patterns, which = np.unique(valid, axis=0, return_inverse=True)
+    for p, mask in enumerate(patterns):
+        pairs = np.flatnonzero(which.ravel() == p)
+        n = int(mask.sum())
+        if n < 3:
+            stats = {m: (np.full(len(pairs), np.nan),) * 3 for m in methods}
+        else:
+            stats = bootstrap(x[pairs][:, mask], y[pairs][:, mask], methods, n_boot, level, rng)
+        for k, pair in enumerate(pairs):
+            for method in methods:
+                r, low, high = (v[k] for v in stats[method])
+                rows.append({**labels[pair], 'method': method, 'n': n,
+                             'r': r, 'ci_low': low, 'ci_high': high})
+    return rows
+
+
+def country_pairs(df):
+    """(x, y, labels) for every AI year × unemployment/youth year in `df`."""
+    xs, ys, labels = [], [], []
+    for outcome, prefix in (('unemployment', 'un'), ('youth', 'youth')):
+        for ya in _suffixes(df, 'ai'):
+            for yo in _suffixes(df, prefix):
+                xs.append(df[f'ai{ya}'].to_numpy(dtype=float))
+                ys.append(df[f'{prefix}{yo}'].to_numpy(dtype=float))
+                labels.append({'outcome': outcome, 'ai_year': f'20{ya}',
+                               'outcome_year': f'20{yo}', 'lag': int(yo) - int(ya)})
+    return np.array(xs), np.array(ys), labels
+
+
+def sector_pairs(ai, outcome, outcome_name, max_lag=None):
+    """(x, y, labels) correlating one sector's AI adoption with an EU-27 rate
+    across years, the rate taken `lag` years later, for each usable lag."""
+    years = [y for y in ai.index if y in outcome.index]
+    max_lag = len(years) - 3 if max_lag is None else max_lag
+    xs, ys, labels = [], [], []
+    for lag in range(0, max_lag + 1):
+        if len(years) - lag < 3:
+            break
+        x = np.full(len(years), np.nan)
+        y = np.full(len(years), np.nan)
+        x[:len(years) - lag] = ai[years[:len(years) - lag]].to_numpy(dtype=float)
+        y[:len(years) - lag] = outcome[years[lag:]].to_numpy(dtype=float)
+        xs.append(x)
+        ys.append(y)
+        labels.append({'outcome': outcome_name, 'ai_year': f'{years[0]}–{years[-1 - lag]}',
+                       'outcome_year': f'{years[lag]}–{years[-1]}', 'lag': lag})
+    return np.array(xs), np.array(ys), labels
+
+
+def correlation_table(merged, df_age=None, df_nace=None, eu_unemployment=None,
+                      eu_youth=None, methods=METHODS, n_boot=2000, level=0.95, seed=0):
+    """Tidy table of coefficients with bootstrap confidence intervals.
+
+    `merged` holds COUNTRY, ai<yy>/un<yy> columns and `group`. `df_age` adds the
+    youth rates. `df_nace` (NACE + year columns) with the EU-27 `eu_unemployment`
+    / `eu_youth` series (indexed by 'YYYY') adds one slice per sector.
+    """
+    rng = np.random.default_rng(seed)
+    df = merged.assign(COUNTRY=merged['COUNTRY'].astype(str))
+    if df_age is not None:
+        df = df.merge(youth_rates(df_age), on='COUNTRY', how='left')
+
+    slices = [({'scope': 'countries', 'subset': 'all'}, df)]
+    if 'group' in df.columns:
+        for g, gdf in df.groupby(df['group'].astype(str), sort=True):
+            slices.append(({'scope': 'group', 'subset': g}, gdf))
+
+    rows = []
+    for labels, sdf in slices:
+        x, y, pair_labels = country_pairs(sdf)
+        rows += _slice_rows(x, y, [{**labels, **p} for p in pair_labels],
+                            methods, n_boot, level, rng)
+
+    if df_nace is not None:
+        years = [c for c in df_nace.columns if str(c).isdigit() and len(str(c)) == 4]
+        outcomes = [(name, s) for name, s in (('unemployment', eu_unemployment),
+                                              ('youth', eu_youth)) if s is not None]
+        for _, sector in df_nace.iterrows():
+            ai = sector[years].astype(float)
+            for outcome_name, outcome in outcomes:
+                x, y, pair_labels = sector_pairs(ai, outcome, outcome_name)
+                if not pair_labels:
+                    continue
+                labels = [{'scope': 'sector', 'subset': str(sector['NACE']), **p}
+                          for p in pair_labels]
+                rows += _slice_rows(x, y, labels, methods, n_boot, level, rng)
+
+    columns = ['scope', 'subset', 'outcome', 'ai_year', 'outcome_year', 'lag',
+               'method', 'n', 'r', 'ci_low', 'ci_high']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def eu_series(df_eu, age=None):
+    """One EU-27 row of a *_europe table as a float Series indexed by year."""
+    if age is not None:
+        df_eu = df_eu[df_eu['AGE'].astype(str).str.contains(age)]
+    years = [c for c in df_eu.columns if str(c).isdigit() and len(str(c)) == 4]
+    return df_eu.iloc[0][years].astype(float)
+
+
+if __name__ == '__main__':
+    import time
+
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Correlate AI adoption with unemployment.')
+    parser.add_argument('--boot', type=int, default=2000, help='bootstrap replicates (default: 2000)')
+    parser.add_argument('--level', type=float, default=0.95, help='interval level (default: 0.95)')
+    parser.add_argument('--methods', nargs='+', default=list(METHODS), choices=METHODS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the full table to this CSV file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = correlation_table(datasets.merged, datasets.df_age, datasets.df_nace,
+                              eu_series(datasets.df_emp_eu),
+                              eu_series(datasets.df_age_eu, 'Less'),
+                              args.methods, args.boot, args.level, args.seed)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        table.to_csv(args.output, index=False)
+    lag0 = table[(table['scope'] != 'sector') & (table['lag'] == 0)]
+    with pd.option_context('display.width', 160, 'display.max_rows', 200,
+                           'display.float_format', '{:.3f}'.format):
+        print(lag0.to_string(index=False))
+    print(f'{len(table)} coefficients × {args.boot} replicates in {elapsed:.2f}s')
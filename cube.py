@@ -0,0 +1,257 @@
+"""
+Integer-coded data cube of every rate in the project.
+The wide tables (AI adoption by country, by NACE sector and for the EU;
+unemployment by country, by age band and for the EU) are melted into one set
+of cells along five dimensions: metric × age × nace × geo × year. Each
+dimension is stored as int32 codes into a label index. A table that does
+not break a dimension down gets its TOTAL label, and the EU aggregates get
+the EU_GEO geo.
+
+Cells are sorted by (metric, age, nace, geo, year), so one metric / age band /
+sector is a contiguous block found by binary search. When that block is a
+complete geo × year grid, its wide view is a reshape of the value array, not
+a copy. Each dimension also gets a sorted secondary index, which gives the
+cells of any label in O(1). Group aggregations run on the integer codes.
+The `merged`-style views of datasets.py (rates, youth) are derived from the
+cube on demand, with no merges and no string scans over the rows.
+
+Usage:
+    python cube.py          # summary of the cube built from DATA_PATH
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from incremental import year_columns
+
+DIMS   = ('metric', 'age', 'nace', 'geo', 'year')   # sort order of the cells
+TOTAL  = 'Total'
+EU_GEO = 'EU27'
+
+# One wide input table. `columns` maps dimensions to columns of `frame`,
+# `fixed` gives other dimensions a constant label; the rest get TOTAL.
+Source = namedtuple('Source', 'frame metric columns fixed', defaults=({}, {}))
+
+
+class Cube:
+    """Sorted columnar cells with integer-coded dimensions."""
+
+    def __init__(self, labels, codes, values):
+        self.labels = labels   # dim -> pd.Index; a label's position is its code
+        self.codes  = codes    # dim -> int32 array, one per cell
+        self.values = values
+        self._sizes = [len(labels[d]) for d in DIMS]
+        self.key    = self._encode([codes[d] for d in DIMS])
+        self._index = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def _encode(self, parts):
+        """Mixed-radix int64 key of per-dimension codes, in DIMS order."""
+        key = np.zeros(np.shape(parts[0]), dtype=np.int64)
+        for part, size in zip(parts, self._sizes):
+            key = key * size + part
+        return key
+
+    # ── Label lookups ──────────────────────────────────────────────────────────
+    def code(self, dim, label):
+        """Code of one label of a dimension."""
+        try:
+            return int(self.labels[dim].get_loc(label))
+        except KeyError:
+            raise KeyError(f'{label!r} is not a {dim} of the cube') from None
+
+    def find(self, dim, text):
+        """First label of a dimension containing `text` (scans the labels, not the cells)."""
+        for label in self.labels[dim]:
+            if text in str(label):
+                return label
+        raise KeyError(f'No {dim} label contains {text!r}')
+
+    def _codes(self, dim, selector):
+        if np.ndim(selector) == 0:
+            return np.array([self.code(dim, selector)])
+        return np.array([self.code(dim, s) for s in selector], dtype=np.int64)
+
+    # ── Slicing ────────────────────────────────────────────────────────────────
+    def block(self, metric, age=TOTAL, nace=TOTAL):
+        """(start, stop) of the cells of one metric / age band / sector: O(log n)."""
+        base = self._encode([self.code('metric', metric), self.code('age', age),
+                             self.code('nace', nace), 0, 0])
+        span = self._sizes[3] * self._sizes[4]
+        return tuple(np.searchsorted(self.key, [base, base + span]))
+
+    def positions(self, dim, code):
+        """Cells holding one code of a dimension, ascending: O(1) after the first call."""
+        if dim not in self._index:
+            order  = np.argsort(self.codes[dim], kind='stable')
+            starts = np.searchsorted(self.codes[dim][order], np.arange(len(self.labels[dim]) + 1))
+            self._index[dim] = (order, starts)
+        order, starts = self._index[dim]
+        return order[starts[code]:starts[code + 1]]
+
+    def rows(self, **filters):
+        """Positions of the cells matching every filter (a label or a list of
+        labels per dimension), ascending."""
+        if not filters:
+            return np.arange(len(self))
+        wanted = {dim: self._codes(dim, sel) for dim, sel in filters.items()}
+        # Start from the smallest indexed set, then test the other codes on it
+        sizes = {dim: sum(len(self.positions(dim, c)) for c in codes)
+                 for dim, codes in wanted.items()}
+        first = min(sizes, key=sizes.get)
+        found = np.sort(np.concatenate([self.positions(first, c) for c in wanted[first]]))
+        for dim, codes in wanted.items():
+            if dim != first:
+                found = found[np.isin(self.codes[dim][found], codes)]
+        return found
+
+    def select(self, **filters):
+        """Long table (one row per cell) of the matching cells. Label columns
+        are Categoricals on the cube's codes."""
+        pos = self.rows(**filters)
+        cols = {d: pd.Categorical.from_codes(self.codes[d][pos], self.labels[d]) for d in DIMS}
+        return pd.DataFrame({**cols, 'value': self.values[pos]})
+
+    def grid(self, metric, age=TOTAL, nace=TOTAL):
+        """(geo codes, year codes, 2-D values) of one metric / age band / sector.
+        A complete grid is a view on the cube's values; gaps are NaN."""
+        start, stop = self.block(metric, age, nace)
+        geo, year = self.codes['geo'][start:stop], self.codes['year'][start:stop]
+        # Cells of a block are sorted by geo, then year: no sort needed here
+        geos  = geo[np.r_[True, geo[1:] != geo[:-1]]] if len(geo) else geo
+        years = np.flatnonzero(np.bincount(year, minlength=self._sizes[4]))
+        if stop - start == len(geos) * len(years) \
+                and np.array_equal(year, np.tile(years, len(geos))):
+            return geos, years, self.values[start:stop].reshape(len(geos), len(years))
+        table = np.full((len(geos), len(years)), np.nan, dtype=self.values.dtype)
+        table[np.searchsorted(geos, geo), np.searchsorted(years, year)] = self.values[start:stop]
+        return geos, years, table
+
+    def wide(self, metric, age=TOTAL, nace=TOTAL):
+        """geo × year DataFrame of one metric / age band / sector, geos in code order."""
+        geos, years, table = self.grid(metric, age, nace)
+        return pd.DataFrame(table, index=self.labels['geo'][geos],
+                            columns=self.labels['year'][years], copy=False)
+
+    # ── Aggregation ────────────────────────────────────────────────────────────
+    def aggregate(self, by, func='mean', **filters):
+        """`func` ('mean', 'median', 'sum', 'min', 'max', 'count', …) of the
+        matching cells grouped by one dimension or a list of them."""
+        by = [by] if isinstance(by, str) else list(by)
+        pos = self.rows(**filters)
+        sizes = [len(self.labels[d]) for d in by]
+        group = np.zeros(len(pos), dtype=np.int64)
+        for d, size in zip(by, sizes):
+            group = group * size + self.codes[d][pos]
+        result = pd.Series(self.values[pos]).groupby(group).agg(func)
+        parts = np.unravel_index(result.index.to_numpy(), sizes)
+        if len(by) == 1:
+            index = pd.Index(self.labels[by[0]][parts[0]], name=by[0])
+        else:
+            index = pd.MultiIndex.from_arrays(
+                [self.labels[d][p] for d, p in zip(by, parts)], names=by)
+        return pd.Series(result.to_numpy(), index=index, name=func)
+
+
+def build(sources, dtype=np.float64):
+    """Cube of the year cells of every Source. Geo, age and sector labels
+    are coded in order of first appearance (TOTAL first), years in order."""
+    row_labels = {d: [] for d in DIMS if d != 'year'}
+    years, values = [], []
+    for src in sources:
+        n = len(src.frame)
+        for d in row_labels:
+            if d == 'metric':
+                labels = np.full(n, src.metric, dtype=object)
+            elif d in src.columns:
+                labels = src.frame[src.columns[d]].astype(str).to_numpy(dtype=object)
+            else:
+                labels = np.full(n, src.fixed.get(d, TOTAL), dtype=object)
+            row_labels[d].append(labels)
+        years.append(year_columns(src.frame))
+        values.append(src.frame[years[-1]].to_numpy(dtype=np.float64).ravel())
+
+    # Labels are coded per table row, then repeated for the row's year cells
+    per_row = np.concatenate([np.full(len(src.frame), len(y)) for src, y in zip(sources, years)])
+    labels, codes = {}, {}
+    for d, parts in row_labels.items():
+        first = [TOTAL] if d in ('age', 'nace') else []
+        row_codes, uniques = pd.factorize(np.concatenate([np.array(first, dtype=object)] + parts))
+        labels[d] = pd.Index(uniques, dtype=object)
+        codes[d] = np.repeat(row_codes[len(first):].astype(np.int32), per_row)
+    labels['year'] = pd.Index(sorted(set().union(*years)), dtype=object)
+    codes['year'] = np.concatenate([np.tile(labels['year'].get_indexer(y).astype(np.int32),
+                                            len(src.frame)) for src, y in zip(sources, years)])
+    values = np.concatenate(values).astype(dtype)
+
+    # Sort the cells once by (metric, age, nace, geo, year)
+    key = np.zeros(len(values), dtype=np.int64)
+    for d in DIMS:
+        key = key * len(labels[d]) + codes[d]
+    order = np.argsort(key, kind='stable')
+    return Cube(labels, {d: c[order] for d, c in codes.items()}, values[order])
+
+
+# ── Views used by datasets.py ──────────────────────────────────────────────────
+def _eu_code(cube):
+    return cube.labels['geo'].get_indexer([EU_GEO])[0]   # -1 without EU aggregates
+
+
+def _geo_column(cube, codes, categorical):
+    """COUNTRY column of geo codes: plain strings, or a Categorical on the cube's geos."""
+    if categorical:
+        return pd.Categorical.from_codes(codes, cube.labels['geo'])
+    return pd.array(cube.labels['geo'][codes], dtype='str')
+
+
+def rates(cube, required=(), categorical=False):
+    """COUNTRY, ai<yy>… and un<yy>… for every geo and year having both total
+    rates, in geo code order, dropping geos with a missing value in a
+    `required` year. Like an inner merge followed by dropna, the index keeps
+    the positions of the dropped rows."""
+    ai_geos, ai_years, ai = cube.grid('ai')
+    un_geos, un_years, un = cube.grid('unemployment')
+    both = np.isin(ai_years, un_years)
+    years = cube.labels['year'][ai_years[both]]
+    ai = ai[:, both]
+    un = un[:, np.searchsorted(un_years, ai_years[both])]
+    rows = np.isin(ai_geos, un_geos) & (ai_geos != _eu_code(cube))
+    geos = ai_geos[rows]
+    ai, un = ai[rows], un[np.searchsorted(un_geos, geos)]
+    need = years.get_indexer(list(required))
+    keep = ~(np.isnan(ai[:, need]).any(axis=1) | np.isnan(un[:, need]).any(axis=1))
+    columns = {'COUNTRY': _geo_column(cube, geos[keep], categorical)}
+    for prefix, table in (('ai', ai[keep]), ('un', un[keep])):
+        columns.update({f'{prefix}{y[2:]}': table[:, k] for k, y in enumerate(years)})
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(geos))[keep])
+
+
+def youth(cube, year, categorical=False):
+    """COUNTRY and youth<yy>: under-25 unemployment of every geo in `year`."""
+    geos, years, table = cube.grid('unemployment', age=cube.find('age', 'Less'))
+    rows = geos != _eu_code(cube)
+    k = np.searchsorted(years, cube.code('year', year))
+    if k == len(years) or years[k] != cube.code('year', year):
+        raise KeyError(f'No youth unemployment for {year}')
+    column = table[rows, k]
+    return pd.DataFrame({'COUNTRY': _geo_column(cube, geos[rows], categorical),
+                         f'youth{year[2:]}': column})
+
+
+if __name__ == '__main__':
+    import time
+
+    import datasets
+
+    start = time.perf_counter()
+    cube = datasets.cube
+    elapsed = time.perf_counter() - start
+    print(f'{len(cube)} cells, {cube.values.nbytes + sum(c.nbytes for c in cube.codes.values())} '
+          f'bytes, built in {elapsed * 1000:.1f} ms')
+    for d in DIMS:
+        print(f'  {d:<7} {len(cube.labels[d]):>4} labels')
+    print(cube.aggregate(['metric', 'age'], 'mean', year=datasets.REF_YEAR).to_string())
@@ -0,0 +1,107 @@
+"""
+Binary cache for parsed datasets.
+Text parsing (semicolon CSV with BOM, comma decimals, name mapping) is done
+once; the normalized frame is then stored in a columnar binary file under
+DATA_PATH/.parsed_cache/ and reused until its source CSV changes.
+
+Frames are stored as Feather and read memory-mapped when pyarrow is
+installed, and as pickles otherwise. A cache entry is valid while the source
+file keeps its size and modification time; if only the mtime changed, the
+content hash decides. Set CHART_DATA_CACHE=0 to always parse the CSVs.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    from pyarrow import feather
+    CACHE_FORMAT = 'feather'
+except ImportError:
+    feather = None
+    CACHE_FORMAT = 'pkl'
+
+CACHE_ENABLED = os.environ.get('CHART_DATA_CACHE', '1') != '0'
+CACHE_SUBDIR  = '.parsed_cache'
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_state(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _write_frame(df, path):
+    if CACHE_FORMAT == 'feather':
+        # Feather only stores a default RangeIndex, so the index travels as a column
+        df.reset_index(names='__index__').to_feather(path)
+    else:
+        df.to_pickle(path)
+
+
+def _read_frame(path):
+    if CACHE_FORMAT == 'feather':
+        df = feather.read_table(path, memory_map=True).to_pandas().set_index('__index__')
+        df.index.name = None
+        return df
+    return pd.read_pickle(path)
+
+
+def cached_frame(data_path, filename, build, version='', variant=''):
+    """Return the parsed frame for `data_path/filename`, calling `build()`
+    only when the binary cache is missing or stale.
+
+    `version` identifies the parsing code; changing it invalidates the entry.
+    A `variant` (e.g. 'compact') is cached side by side with the default one.
+    """
+    if not CACHE_ENABLED:
+        return build()
+
+    source   = os.path.join(data_path, filename)
+    cache    = os.path.join(data_path, CACHE_SUBDIR)
+    stem     = os.path.join(cache, os.path.splitext(filename)[0] + (f'.{variant}' if variant else ''))
+    frame    = f'{stem}.{CACHE_FORMAT}'
+    manifest = f'{stem}.json'
+    state    = _source_state(source)
+
+    try:
+        with open(manifest) as f:
+            meta = json.load(f)
+        if meta['version'] == version and meta['format'] == CACHE_FORMAT \
+                and meta['size'] == state['size']:
+            if meta['mtime_ns'] == state['mtime_ns']:
+                return _read_frame(frame)
+            if meta['sha256'] == _sha256(source):   # touched but not modified
+                meta['mtime_ns'] = state['mtime_ns']
+                _write_manifest(manifest, meta)
+                return _read_frame(frame)
+    except (OSError, ValueError, KeyError):
+        pass   # no usable entry: rebuild below
+
+    df = build()
+    try:
+        os.makedirs(cache, exist_ok=True)
+        tmp = f'{frame}.{os.getpid()}.tmp'
+        _write_frame(df, tmp)
+        os.replace(tmp, frame)
+        _write_manifest(manifest, {'version': version, 'format': CACHE_FORMAT,
+                                   'sha256': _sha256(source), **state})
+    except OSError:
+        pass   # read-only data folder: serve the parsed frame uncached
+    return df
+
+
+def _write_manifest(path, meta):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, path)
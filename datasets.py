@@ -0,0 +1,454 @@
+"""
+Data layer shared by the charts and the analysis scripts.
+A lazy registry of datasets: `df_nace`, `merged`, `AI_MED` and the rest are
+loaded on first access and memoized, reading only the CSVs they depend on.
+Importing it pulls in pandas and NumPy but no plotting library, so analysis
+jobs that only need `merged` and the group labels start quickly; charts get
+the same names through config.py.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import cube as data_cube
+from clustering import METHODS, cluster_trajectories
+from data_cache import cached_frame
+from incremental import store_for as year_store, update as update_years, year_columns
+from instrument import stage
+from projections import HORIZON, project_frame
+from taxonomy import GROUPS, classify
+from vintages import store_for
+
+# ── Path to data (same folder as this script) ─────────────────────────────────
+DATA_PATH = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# Reference years the charts show. The data layer itself is year-agnostic:
+# any extra year column (or database_*_<YYYY>.csv file) is parsed, merged
+# as ai<yy>/un<yy> and handled incrementally by the `yearly` dataset.
+YEARS = ['2023', '2024', '2025']
+
+# Reference year of the taxonomy and the single-year views (charts 03–06):
+# medians, quadrant groups and sort orders use it. Defaults to the last of
+# YEARS; CHART_YEAR or set_reference_year() pick another one of YEARS.
+REF_YEAR = YEARS[-1]
+REF      = REF_YEAR[2:]   # column suffix, e.g. 'ai25'
+
+# Release date ('YYYY-MM-DD') whose vintage the CSVs are read from, instead of
+# the current files (CHART_AS_OF or set_as_of(); vintages.py records them).
+AS_OF = os.environ.get('CHART_AS_OF') or None
+
+# How `merged['group']` is assigned: 'median' (the median-split quadrants) or a
+# clustering.py method ('kmeans', 'minibatch', 'hierarchical') over the whole
+# AI / unemployment / youth trajectories (CHART_GROUPING or set_grouping()).
+GROUPING = os.environ.get('CHART_GROUPING', 'median')
+# Processes the seeded k-means restarts run on; the result is the same for
+# any number (CHART_CLUSTER_WORKERS or set_grouping(..., workers=)).
+CLUSTER_WORKERS = int(os.environ.get('CHART_CLUSTER_WORKERS', '1'))
+
+# Last year the extended charts (01, 04, 08) project the trends to, or None
+# for observed years only (CHART_PROJECT or set_projection()).
+PROJECT_TO = int(os.environ['CHART_PROJECT']) if os.environ.get('CHART_PROJECT') else None
+
+# ── Helper functions ───────────────────────────────────────────────────────────
+def load_csv(filename):
+    """Load a semicolon-separated CSV from DATA_PATH, or from its AS_OF vintage."""
+    if AS_OF is not None:
+        store = store_for(DATA_PATH)
+        return store.load(filename, store.resolve(AS_OF))
+    return pd.read_csv(DATA_PATH + filename, sep=";", encoding='utf-8-sig')
+
+def as_of_vintage():
+    """The vintage the datasets are read from, or None for the current CSVs."""
+    return None if AS_OF is None else store_for(DATA_PATH).resolve(AS_OF)
+
+def source_files():
+    """Names of the CSVs the datasets are read from (current or AS_OF)."""
+    vintage = as_of_vintage()
+    return sorted(os.listdir(DATA_PATH) if vintage is None else vintage['files'])
+
+def to_float(df, cols):
+    """Convert columns from European decimal format (comma) to float."""
+    for c in cols:
+        df[c] = pd.to_numeric(
+            df[c].astype(str).str.replace(',', '.'), errors='coerce'
+        )
+    return df
+
+# Parsed frames are cached in binary form (data_cache.py); any edit to this
+# file changes the parsing version and invalidates them.
+with open(__file__, 'rb') as _f:
+    _PARSER_VERSION = hashlib.sha256(_f.read()).hexdigest()[:16]
+
+# ── Compact mode ───────────────────────────────────────────────────────────────
+# Opt-in (CHART_COMPACT=1 or set_compact(True)): key columns such as COUNTRY,
+# AGE, NACE and group are held as Categoricals and rates as float32, so the
+# per-country/region frames take a fraction of the memory. The one-row EU
+# aggregates stay float64. float32 cannot hold two-decimal values exactly, so
+# a label rounded to one decimal may differ in its last digit for a value
+# sitting exactly half-way (11.15).
+COMPACT = os.environ.get('CHART_COMPACT', '0') not in ('', '0')
+
+def compact_frame(df):
+    """Categorical text columns and float32 numeric columns."""
+    for c in df.columns:
+        if pd.api.types.is_float_dtype(df[c]):
+            df[c] = df[c].astype('float32')
+        elif pd.api.types.is_string_dtype(df[c]):
+            df[c] = df[c].astype('category')
+    return df
+
+def load_parsed(filename, prepare=None, compact=True):
+    """load_csv + to_float (+ `prepare`) for one file, through the parsed-data cache.
+    Every four-digit year column is converted, not only YEARS. In compact mode
+    the frame is compacted unless `compact` is False."""
+    compact = COMPACT and compact
+    def build():
+        with stage('parse', file=filename):
+            df = load_csv(filename)
+            df = to_float(df, year_columns(df))
+            df = df if prepare is None else prepare(df)
+            return compact_frame(df) if compact else df
+    variant = 'compact' if compact else ''
+    if AS_OF is not None:
+        # Cached next to the vintage log; valid until that log is appended to
+        store = store_for(DATA_PATH)
+        revision = store.revision(filename, store.resolve(AS_OF))
+        return cached_frame(store.path, os.path.basename(store.log_path(filename)), build,
+                            version=_PARSER_VERSION,
+                            variant='.'.join(filter(None, [f'r{revision}', variant])))
+    return cached_frame(DATA_PATH, filename, build, version=_PARSER_VERSION, variant=variant)
+
+def load_with_year_files(filename, prepare=None):
+    """load_parsed(filename) plus any `<stem>_<YYYY>.csv` files next to it,
+    each adding (or revising) one year column, joined on the key columns."""
+    df = load_parsed(filename, prepare)
+    stem = os.path.splitext(filename)[0]
+    for extra in source_files():
+        if not re.fullmatch(re.escape(stem) + r'_\d{4}\.csv', extra):
+            continue
+        year_df = load_parsed(extra, prepare)
+        years = year_columns(year_df)
+        keys  = [c for c in year_df.columns if c not in years]
+        df = df.drop(columns=[y for y in years if y in df.columns])
+        df = df.merge(year_df[keys + years], on=keys, how='left')
+    return df
+
+# ── Lazy data registry ─────────────────────────────────────────────────────────
+# Each dataset is built by a loader registered under its module-level name.
+# The first `config.<name>` (or `from config import <name>`) runs the loader,
+# pulling in its own dependencies, and stores the result as a real global.
+_LOADERS = {}
+
+def _dataset(name):
+    """Register the decorated function as the loader for `name`."""
+    def register(loader):
+        _LOADERS[name] = loader
+        return loader
+    return register
+
+def _get(name):
+    """Return a dataset, loading it (and its dependencies) on first use."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
+def __getattr__(name):
+    loader = _LOADERS.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with stage('load', dataset=name):
+        value = loader()
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LOADERS))
+
+def clear_datasets(names=None):
+    """Forget loaded datasets (all by default) so the next access rebuilds them."""
+    for name in (names or list(_LOADERS)):
+        globals().pop(name, None)
+
+def load_datasets(names=None):
+    """Eagerly resolve the given datasets (all of them by default)."""
+    for name in (names or list(_LOADERS)):
+        _get(name)
+
+# Datasets the chart scripts read, which the batch renderer and the chart
+# server resolve before forking their workers
+DECK_DATASETS = ['df_ia', 'df_emp', 'df_age_eu', 'df_nace', 'ai_eu', 'un_eu',
+                 'AI_MED', 'UN_MED', 'merged', 'yearly']
+
+def deck_datasets():
+    """DECK_DATASETS plus the opt-in ones switched on (trend projections);
+    clusters come in through `merged` when a clustering grouping is set."""
+    return DECK_DATASETS + (['projected'] if PROJECT_TO is not None else [])
+
+def set_reference_year(year):
+    """Switch the reference year and drop the datasets derived from it."""
+    global REF_YEAR, REF
+    year = str(year)
+    if year not in YEARS:
+        raise ValueError(f"Reference year {year!r} is not one of the chart years {YEARS}")
+    REF_YEAR, REF = year, year[2:]
+    clear_datasets(['AI_MED', 'UN_MED', 'clusters', 'merged', 'youth_c', 'merged2', 'df_nace'])
+
+def set_compact(enabled=True):
+    """Switch compact mode on or off and drop the loaded datasets."""
+    global COMPACT
+    COMPACT = bool(enabled)
+    clear_datasets()
+
+def set_as_of(date):
+    """Read the datasets as released on `date` (None: the current CSVs)
+    and drop the loaded ones."""
+    global AS_OF
+    AS_OF = None if date is None else str(date)[:10]
+    clear_datasets()
+
+def set_grouping(method, workers=None):
+    """Switch how the strategic groups are assigned ('median' or a
+    clustering method), and optionally over how many processes the
+    k-means restarts run, and drop the datasets derived from them."""
+    global GROUPING, CLUSTER_WORKERS
+    if method != 'median' and method not in METHODS:
+        raise ValueError(f"Unknown grouping {method!r}; use 'median' or one of {METHODS}")
+    GROUPING = method
+    if workers is not None:
+        CLUSTER_WORKERS = max(1, int(workers))
+    clear_datasets(['clusters', 'merged', 'merged2'])
+
+def set_projection(year):
+    """Project the trends to `year` in the extended charts (None: switch off)."""
+    global PROJECT_TO
+    if year is not None and int(year) <= int(YEARS[-1]):
+        raise ValueError(f"Projection year {year} is not after the last chart year {YEARS[-1]}")
+    PROJECT_TO = None if year is None else int(year)
+    clear_datasets(['projected'])
+
+def set_data_path(path):
+    """Point the registry at another data folder and drop loaded datasets."""
+    global DATA_PATH
+    DATA_PATH = os.path.join(os.path.abspath(path), '')
+    clear_datasets()
+
+# ── Raw datasets ───────────────────────────────────────────────────────────────
+@_dataset('df_ia')
+def _load_df_ia():
+    return load_with_year_files("database_ia.csv")
+
+@_dataset('df_emp')
+def _load_df_emp():
+    return load_with_year_files("database_employees.csv")
+
+@_dataset('df_ia_eu')
+def _load_df_ia_eu():
+    return load_parsed("database_ia_europe.csv", compact=False)
+
+@_dataset('df_emp_eu')
+def _load_df_emp_eu():
+    return load_parsed("database_employees_europe.csv", compact=False)
+
+@_dataset('df_age_eu')
+def _load_df_age_eu():
+    return load_parsed("database_employees_age_europe.csv", compact=False)
+
+def _rename_age_columns(df):
+    return df.rename(columns={df.columns[0]: 'COUNTRY'})
+
+@_dataset('df_age')
+def _load_df_age():
+    return load_with_year_files("database_employees_age.csv", _rename_age_columns)
+
+# ── EU-27 aggregate single values per year ─────────────────────────────────────
+@_dataset('ai_eu')
+def _load_ai_eu():
+    return [float(str(_get('df_ia_eu').iloc[0][y]).replace(',', '.')) for y in YEARS]
+
+@_dataset('un_eu')
+def _load_un_eu():
+    return [float(str(_get('df_emp_eu').iloc[0][y]).replace(',', '.')) for y in YEARS]
+
+# ── NACE sector name mapping (abbreviations for chart readability) ─────────────
+nace_map = {
+    "Water supply; sewerage, waste management and remediation activities": "Water and Waste Mgmt",
+    "Wholesale and retail trade; repair of motor vehicles and motorcycles": "Wholesale and Retail",
+    "Electricity, gas, steam and air conditioning supply":                  "Energy and Supply",
+    "Professional, scientific and technical activities":                    "Professional and Tech",
+    "Administrative ans supoprt service activities":                        "Admin and Support",
+    "Accommodation and food service activities":                            "Hospitality and Food",
+    "Information and communication":                                        "Information and Comm.",
+    "Real estate activities":                                               "Real Estate",
+    "Transportation and storage":                                           "Transport and Storage",
+    "Manufacturing":                                                        "Manufacturing",
+    "Construction":                                                         "Construction"
+}
+
+def _map_nace(df):
+    df['NACE'] = df['NACE'].replace(nace_map)
+    return df
+
+@_dataset('df_nace')
+def _load_df_nace():
+    return load_parsed("database_ia_nace.csv", _map_nace).sort_values(REF_YEAR, ascending=True)
+
+# ── Data cube: every rate, integer-coded by metric × age × nace × geo × year ──
+# Built straight from the parsed tables, so a job that only needs `merged`
+# does not keep the wide frames around. Each view builds its cube from only
+# the CSVs it reads; `cube` holds all of them, for the analysis scripts.
+_EU = {'geo': data_cube.EU_GEO}
+CUBE_SOURCES = {   # CSV -> metric, dimension columns and fixed labels of its cells
+    "database_ia.csv":                   ('ai', {'geo': 'COUNTRY'}, {}),
+    "database_employees.csv":            ('unemployment', {'geo': 'COUNTRY'}, {}),
+    "database_employees_age.csv":        ('unemployment', {'geo': 'COUNTRY', 'age': 'AGE'}, {}),
+    "database_ia_europe.csv":            ('ai', {}, _EU),
+    "database_employees_europe.csv":     ('unemployment', {}, _EU),
+    "database_employees_age_europe.csv": ('unemployment', {'age': 'AGE'}, _EU),
+    "database_ia_nace.csv":              ('ai', {'nace': 'NACE'}, _EU),
+}
+
+def _cube_frame(filename):
+    if filename == "database_ia_nace.csv":
+        return load_parsed(filename, _map_nace)
+    if filename.endswith('_europe.csv'):
+        return load_parsed(filename, compact=False)
+    prepare = _rename_age_columns if filename == "database_employees_age.csv" else None
+    return load_with_year_files(filename, prepare)
+
+def build_cube(filenames=CUBE_SOURCES):
+    """Data cube of the given CSVs (default: all of them)."""
+    sources = [data_cube.Source(_cube_frame(f), *CUBE_SOURCES[f]) for f in filenames]
+    with stage('cube', files=len(sources)):
+        return data_cube.build(sources, np.float32 if COMPACT else np.float64)
+
+@_dataset('cube')
+def _load_cube():
+    return build_cube()
+
+@_dataset('_youth_cube')
+def _load_youth_cube():
+    return build_cube(["database_employees_age.csv"])
+
+# ── Merged country dataset (AI adoption + Unemployment) ───────────────────────
+@_dataset('_merged_rates')
+def _load_merged_rates():
+    # ai<yy>/un<yy> by name, so a newly appended year simply adds a pair
+    rates = build_cube(["database_ia.csv", "database_employees.csv"])
+    return data_cube.rates(rates, YEARS, categorical=COMPACT)
+
+# ── Quadrant classification using reference-year medians as EU-27 benchmarks ──
+@_dataset('AI_MED')
+def _load_ai_med():
+    return _get('_merged_rates')[f'ai{REF}'].median()
+
+@_dataset('UN_MED')
+def _load_un_med():
+    return _get('_merged_rates')[f'un{REF}'].median()
+
+# 2025 medians under their historical names, whatever the reference year
+@_dataset('AI25_MED')
+def _load_ai25_med():
+    return _get('_merged_rates')['ai25'].median()
+
+@_dataset('UN25_MED')
+def _load_un25_med():
+    return _get('_merged_rates')['un25'].median()
+
+def classify_quadrant(row):
+    """Assign a strategic group based on the country's position relative to EU medians.
+    Single-row form; whole tables go through taxonomy.classify / classify_years."""
+    return str(classify(row[f'ai{REF}'], row[f'un{REF}'], _get('AI_MED'), _get('UN_MED')))
+
+@_dataset('merged')
+def _load_merged():
+    merged = _get('_merged_rates').copy()
+    ai_med, un_med = _get('AI_MED'), _get('UN_MED')
+    with stage('classify'):
+        if GROUPING == 'median':
+            merged['group'] = classify(merged[f'ai{REF}'], merged[f'un{REF}'], ai_med, un_med)
+        else:
+            groups = _get('clusters').groups
+            merged['group'] = groups.reindex(merged['COUNTRY'].astype(str)).to_numpy()
+    if COMPACT:
+        merged['group'] = pd.Categorical(merged['group'], categories=GROUPS)
+    return merged
+
+GROUP_NAMES = {
+    'A': 'Technological Vanguard',
+    'B': 'Structural Lag',
+    'C': 'Traditional Resilience',
+    'D': 'Digital Frontier'
+}
+
+# ── Trajectory clusters (CHART_GROUPING) ──────────────────────────────────────
+@_dataset('trajectory_rates')
+def _load_trajectory_rates():
+    # The merged rates plus youth<yy> for every chart year the age table has
+    rates = _get('_merged_rates')
+    frame = rates.copy()
+    countries = rates['COUNTRY'].astype(str)
+    for year in YEARS:
+        try:
+            youth = data_cube.youth(_get('_youth_cube'), year)
+        except KeyError:
+            continue
+        column = f'youth{year[2:]}'
+        frame[column] = youth.set_index('COUNTRY')[column].reindex(countries).to_numpy()
+    return frame
+
+@_dataset('clusters')
+def _load_clusters():
+    # Trajectories up to the reference year, mapped onto A–D by its medians.
+    # Always a cold start (no previous=): the render cache key cannot see
+    # what the process clustered before.
+    years = [y[2:] for y in YEARS if y <= REF_YEAR]
+    method = 'kmeans' if GROUPING == 'median' else GROUPING
+    with stage('cluster', method=method):
+        return cluster_trajectories(_get('trajectory_rates'), method, len(GROUPS), years,
+                                    workers=CLUSTER_WORKERS)
+
+# ── Trend projections (CHART_PROJECT) ──────────────────────────────────────────
+@_dataset('projected')
+def _load_projected():
+    # ai<yy>/un<yy> (+ _lo/_hi bounds) for every geo, the EU aggregate included,
+    # from the years after the last observed one up to PROJECT_TO (default 2030).
+    # AI adoption follows a logistic trend capped at 100%, unemployment a line.
+    # Only the chart years are fitted: the 2021 AI survey is not comparable.
+    rates = build_cube(["database_ia.csv", "database_employees.csv",
+                        "database_ia_europe.csv", "database_employees_europe.csv"])
+    frames = []
+    for metric, prefix, kind in (('ai', 'ai', 'logistic'), ('unemployment', 'un', 'linear')):
+        table = rates.wide(metric)[YEARS]
+        table.columns = [f'{prefix}{y[2:]}' for y in table.columns]
+        table = table.rename_axis('COUNTRY').reset_index()
+        with stage('project', metric=metric):
+            frames.append(project_frame(table, prefix, kind, PROJECT_TO or HORIZON)
+                          .set_index('COUNTRY'))
+    return frames[0].join(frames[1], how='inner')
+
+# ── Youth unemployment per country (reference year) for scatter analysis ───────
+@_dataset('youth_c')
+def _load_youth_c():
+    return data_cube.youth(_get('_youth_cube'), REF_YEAR, categorical=COMPACT)
+
+# ── Per-year derived results, persisted and updated incrementally ─────────────
+@_dataset('yearly')
+def _load_yearly():
+    store = year_store(DATA_PATH)
+    return update_years(_get('df_ia'), _get('df_emp'), store, base_year=YEARS[0])
+
+@_dataset('merged2')
+def _load_merged2():
+    merged, youth_c = _get('merged'), _get('youth_c')
+    with stage('merge'):
+        youth = youth_c.set_index('COUNTRY')[f'youth{REF}']
+        merged2 = merged[merged['COUNTRY'].isin(youth.index).to_numpy()].reset_index(drop=True)
+        merged2[f'youth{REF}'] = youth.reindex(merged2['COUNTRY']).to_numpy()
+    return merged2
+
+if os.environ.get('CHART_YEAR'):
+    set_reference_year(os.environ['CHART_YEAR'])
@@ -0,0 +1,248 @@
+"""
+Streaming ingestion of raw Eurostat bulk downloads.
+Reads the gzip-compressed SDMX-TSV extracts of ISOC_EB_AI (AI adoption),
+ISOC_EB_AI_NACE (AI adoption by NACE sector) and UNE_RT_A (unemployment by
+age), in chunks, keeps only the requested geo / age / NACE rows and years, and
+produces the same wide frames config.py builds from the database_*.csv files.
+Peak memory is bounded by the chunk size, not by the size of the extract.
+
+A bulk TSV looks like this (the first column packs the dimensions, values
+carry optional flag suffixes, ':' means not available):
+
+    freq,indic_is,unit,size_emp,nace_r2,geo\\TIME_PERIOD\t2023 \t2024 \t2025
+    A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,BE\t13.81 \t24.71 b\t34.54
+
+Usage:
+    python eurostat_ingest.py --ai isoc_eb_ai.tsv.gz --nace isoc_eb_ai_nace.tsv.gz \\
+                              --unemployment une_rt_a.tsv.gz \\
+                              --output data/ --years 2023 2024 2025
+
+database_ia_nace.csv is only written when --nace is given: the plain
+ISOC_EB_AI extract has no sector breakdown.
+"""
+
+import argparse
+import gzip
+import os
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+
+# ── Geo codes → names used in the database_*.csv files ─────────────────────────
+EU27 = {
+    'BE': 'Belgium',   'BG': 'Bulgaria',   'CZ': 'Czechia',    'DK': 'Denmark',
+    'DE': 'Germany',   'EE': 'Estonia',    'IE': 'Ireland',    'EL': 'Greece',
+    'ES': 'Spain',     'FR': 'France',     'HR': 'Croatia',    'IT': 'Italy',
+    'CY': 'Cyprus',    'LV': 'Latvia',     'LT': 'Lithuania',  'LU': 'Luxembourg',
+    'HU': 'Hungary',   'MT': 'Malta',      'NL': 'Netherlands', 'AT': 'Austria',
+    'PL': 'Poland',    'PT': 'Portugal',   'RO': 'Romania',    'SI': 'Slovenia',
+    'SK': 'Slovakia',  'FI': 'Finland',    'SE': 'Sweden',
+}
+EFTA = {'IS': 'Iceland', 'NO': 'Norway', 'CH': 'Switzerland'}   # in the age dataset too
+EU_AGGREGATE = 'EU27_2020'
+EU_NAME      = 'European Union - 27 countries (from 2020)'
+
+# ── Age bands (UNE_RT_A) → labels used in database_employees_age*.csv ─────────
+AGE_BANDS = {
+    'Y_LT25': 'Less than 25 years',
+    'Y25-74': 'From 25 to 74 years',
+}
+
+# ── NACE sections (ISOC_EB_AI_NACE) → labels used in database_ia_nace.csv ──────────
+# Labels are kept verbatim so config.nace_map still abbreviates them.
+NACE_SECTORS = {
+    'C10-33':  'Manufacturing',
+    'D35':     'Electricity, gas, steam and air conditioning supply',
+    'E36-39':  'Water supply; sewerage, waste management and remediation activities',
+    'F41-43':  'Construction',
+    'G45-47':  'Wholesale and retail trade; repair of motor vehicles and motorcycles',
+    'H49-53':  'Transportation and storage',
+    'I55-56':  'Accommodation and food service activities',
+    'J58-63':  'Information and communication',
+    'L68':     'Real estate activities',
+    'M69-74':  'Professional, scientific and technical activities',
+    'N77-82':  'Administrative ans supoprt service activities',
+}
+
+# ── Fixed dimension values selecting the series the study uses ────────────────
+AI_SERIES = {'freq': 'A', 'indic_is': 'E_AI_TANY', 'unit': 'PC_ENT', 'size_emp': 'GE10'}
+AI_ALL_SECTORS = 'C10-S951_X_K'   # all enterprises except the financial sector
+UNEMP_SERIES = {'freq': 'A', 'unit': 'PC_ACT', 'sex': 'T'}
+UNEMP_ALL_AGES = 'Y15-74'
+
+
+def _open_text(path):
+    return gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') \
+        else open(path, encoding='utf-8')
+
+
+def _read_header(path):
+    """Dimension names and year columns of a bulk TSV."""
+    with _open_text(path) as f:
+        header = f.readline().rstrip('\n').split('\t')
+    dims = header[0].split('\\')[0].split(',')
+    return dims, [c.strip() for c in header[1:]]
+
+
+def _parse_values(col):
+    """'6.2 b' → 6.2, ': c' → NaN (flag suffixes dropped)."""
+    return pd.to_numeric(col.str.strip().str.split(' ', n=1).str[0], errors='coerce')
+
+
+def read_eurostat_tsv(path, filters, years, chunksize=CHUNK_ROWS):
+    """Stream a Eurostat bulk TSV (plain or .gz) and return the matching rows.
+
+    `filters` maps dimension names to a value or a collection of accepted
+    values; only rows matching all of them are kept. The result has one
+    column per dimension plus one float column per requested year.
+    """
+    dims, year_cols = _read_header(path)
+    missing = [y for y in years if y not in year_cols]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)} has no data for year(s) {missing}")
+    unknown = [d for d in filters if d not in dims]
+    if unknown:
+        raise ValueError(f"{os.path.basename(path)} has no dimension(s) {unknown}; found {dims}")
+
+    accepted = {d: {v} if isinstance(v, str) else set(v) for d, v in filters.items()}
+    usecols  = [0] + [1 + year_cols.index(y) for y in years]
+    kept = []
+    for chunk in pd.read_csv(path, sep='\t', dtype=str, usecols=usecols,
+                             chunksize=chunksize, compression='infer'):
+        keys = chunk.iloc[:, 0].str.split(',', expand=True)
+        keys.columns = dims
+        mask = pd.Series(True, index=chunk.index)
+        for d, values in accepted.items():
+            mask &= keys[d].isin(values)
+        if not mask.any():
+            continue
+        part = keys.loc[mask, list(accepted)].copy()
+        values = chunk.loc[mask].iloc[:, 1:]
+        for y, col in zip(years, values.columns):
+            part[y] = _parse_values(values[col])
+        kept.append(part)
+
+    if not kept:
+        return pd.DataFrame(columns=list(accepted) + list(years))
+    return pd.concat(kept, ignore_index=True)
+
+
+def _wide(rows, key, labels, name):
+    """Order rows like `labels`, rename codes to labels and name the key column."""
+    rows = rows.set_index(key).reindex([c for c in labels if c in set(rows[key])])
+    rows.index = [labels[c] for c in rows.index]
+    return rows.rename_axis(name).reset_index()
+
+
+# ── Builders for the config.py datasets ───────────────────────────────────────
+def ai_by_country(path, years, geos=EU27, chunksize=CHUNK_ROWS):
+    """df_ia: AI adoption (% of enterprises) per country."""
+    rows = read_eurostat_tsv(path, {**AI_SERIES, 'nace_r2': AI_ALL_SECTORS, 'geo': list(geos)},
+                             years, chunksize)
+    return _wide(rows[['geo'] + list(years)], 'geo', geos, 'COUNTRY')
+
+
+def ai_eu(path, years, chunksize=CHUNK_ROWS):
+    """df_ia_eu: EU-27 AI adoption."""
+    rows = read_eurostat_tsv(path, {**AI_SERIES, 'nace_r2': AI_ALL_SECTORS, 'geo': EU_AGGREGATE},
+                             years, chunksize)
+    return _wide(rows[['geo'] + list(years)], 'geo', {EU_AGGREGATE: 'Europe'}, 'Country')
+
+
+def ai_by_nace(path, years, sectors=NACE_SECTORS, chunksize=CHUNK_ROWS):
+    """df_nace: EU-27 AI adoption per NACE sector (full sector names).
+
+    Raises ValueError when the extract has none of the sectors, rather than
+    writing an empty sector view (ISOC_EB_AI proper has no sector breakdown)."""
+    rows = read_eurostat_tsv(path, {**AI_SERIES, 'nace_r2': list(sectors), 'geo': EU_AGGREGATE},
+                             years, chunksize)
+    if rows.empty:
+        raise ValueError(f"{os.path.basename(path)} has no NACE sector rows for {EU_AGGREGATE}; "
+                         "--nace takes the ISOC_EB_AI_NACE extract")
+    return _wide(rows[['nace_r2'] + list(years)], 'nace_r2', sectors, 'NACE')
+
+
+def unemployment_by_country(path, years, geos=EU27, chunksize=CHUNK_ROWS):
+    """df_emp: unemployment rate (15–74) per country."""
+    rows = read_eurostat_tsv(path, {**UNEMP_SERIES, 'age': UNEMP_ALL_AGES, 'geo': list(geos)},
+                             years, chunksize)
+    return _wide(rows[['geo'] + list(years)], 'geo', geos, 'COUNTRY')
+
+
+def unemployment_eu(path, years, chunksize=CHUNK_ROWS):
+    """df_emp_eu: EU-27 unemployment rate (15–74)."""
+    rows = read_eurostat_tsv(path, {**UNEMP_SERIES, 'age': UNEMP_ALL_AGES, 'geo': EU_AGGREGATE},
+                             years, chunksize)
+    return _wide(rows[['geo'] + list(years)], 'geo', {EU_AGGREGATE: 'Europe'}, 'COUNTRY')
+
+
+def unemployment_by_age(path, years, geos={**EU27, **EFTA}, chunksize=CHUNK_ROWS):
+    """df_age (or df_age_eu with geos={'EU27_2020': ...}): youth vs adult unemployment.
+    The geo column is named TIME, as in the published age files."""
+    rows = read_eurostat_tsv(path, {**UNEMP_SERIES, 'age': list(AGE_BANDS), 'geo': list(geos)},
+                             years, chunksize)
+    geo_rank = {g: i for i, g in enumerate(geos)}
+    age_rank = {a: i for i, a in enumerate(AGE_BANDS)}
+    rows = rows.assign(_g=rows['geo'].map(geo_rank), _a=rows['age'].map(age_rank))
+    rows = rows.sort_values(['_g', '_a'])
+    return pd.DataFrame({'TIME':    rows['geo'].map(geos).to_numpy(),
+                         'AGE':     rows['age'].map(AGE_BANDS).to_numpy(),
+                         **{y: rows[y].to_numpy() for y in years}})
+
+
+def write_database_csv(df, path):
+    """Write a frame in the database_*.csv layout (semicolons, comma decimals, BOM)."""
+    df.to_csv(path, sep=';', decimal=',', index=False, encoding='utf-8-sig')
+
+
+def ingest(output, years, ai=None, unemployment=None, chunksize=CHUNK_ROWS, nace=None):
+    """Build every database_*.csv that the given extracts can provide. Returns the paths.
+    The sector table comes from `nace` (ISOC_EB_AI_NACE) only."""
+    os.makedirs(output, exist_ok=True)
+    outputs = []
+    if ai:
+        outputs += [('database_ia.csv',         ai_by_country(ai, years, chunksize=chunksize)),
+                    ('database_ia_europe.csv',  ai_eu(ai, years, chunksize))]
+    if nace:
+        outputs += [('database_ia_nace.csv',    ai_by_nace(nace, years, chunksize=chunksize))]
+    if unemployment:
+        eu = {EU_AGGREGATE: EU_NAME}
+        outputs += [('database_employees.csv',
+                     unemployment_by_country(unemployment, years, chunksize=chunksize)),
+                    ('database_employees_europe.csv',
+                     unemployment_eu(unemployment, years, chunksize)),
+                    ('database_employees_age.csv',
+                     unemployment_by_age(unemployment, years, chunksize=chunksize)),
+                    ('database_employees_age_europe.csv',
+                     unemployment_by_age(unemployment, years, eu, chunksize))]
+    paths = []
+    for filename, df in outputs:
+        path = os.path.join(output, filename)
+        write_database_csv(df, path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build database_*.csv files from Eurostat bulk TSVs.')
+    parser.add_argument('--ai', help='ISOC_EB_AI extract (.tsv or .tsv.gz)')
+    parser.add_argument('--nace', help='ISOC_EB_AI_NACE extract (.tsv or .tsv.gz)')
+    parser.add_argument('--unemployment', help='UNE_RT_A extract (.tsv or .tsv.gz)')
+    parser.add_argument('--output', required=True, help='data folder to write the CSVs to')
+    parser.add_argument('--years', nargs='+', default=['2023', '2024', '2025'])
+    parser.add_argument('--chunksize', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    if not (args.ai or args.nace or args.unemployment):
+        parser.error('give at least one of --ai / --nace / --unemployment')
+    try:
+        paths = ingest(args.output, args.years, args.ai, args.unemployment, args.chunksize,
+                       nace=args.nace)
+    except ValueError as e:
+        parser.error(str(e))
+    for path in paths:
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Weighted roll-ups along the NUTS hierarchy.
+Leaves are geographic units coded as NUTS: 'ES' (country), 'ES5' (NUTS-1),
+'ES51' (NUTS-2), 'ES511' (NUTS-3). Sorted by code, every node of the tree
+(every code prefix) covers a contiguous run of leaves. Each level is therefore
+materialized once with a segment reduce (np.add.reduceat) over the weighted
+values and the weights. Any node's rate is a weighted mean read from its
+stored sums. A bloc of countries (EU-27 or any ad-hoc list) adds up the sums
+of its members, not of their leaves. Changing one leaf adds the difference to
+the sums of its few ancestors, instead of re-aggregating everything.
+
+Weights are whatever the rates are shares of: enterprise counts for AI
+adoption, labour-force sizes for unemployment. They may be given per year.
+None ship with the project. Without them every leaf weighs the same, so the
+recomputed EU-27 figures differ from Eurostat's published aggregates.
+
+Usage:
+    python hierarchy.py                                   # EU-27 from the country rates
+    python hierarchy.py --metric unemployment --weights labour_force.csv \\
+                        --bloc Spain Portugal Italy Greece
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# NUTS-0 codes of the countries in the data (Greece is EL in NUTS)
+NUTS0 = {
+    'Austria': 'AT', 'Belgium': 'BE', 'Bulgaria': 'BG', 'Croatia': 'HR', 'Cyprus': 'CY',
+    'Czechia': 'CZ', 'Denmark': 'DK', 'Estonia': 'EE', 'Finland': 'FI', 'France': 'FR',
+    'Germany': 'DE', 'Greece': 'EL', 'Hungary': 'HU', 'Ireland': 'IE', 'Italy': 'IT',
+    'Latvia': 'LV', 'Lithuania': 'LT', 'Luxembourg': 'LU', 'Malta': 'MT',
+    'Netherlands': 'NL', 'Poland': 'PL', 'Portugal': 'PT', 'Romania': 'RO',
+    'Slovakia': 'SK', 'Slovenia': 'SI', 'Spain': 'ES', 'Sweden': 'SE',
+    'Iceland': 'IS', 'Norway': 'NO', 'Switzerland': 'CH',
+}
+NUTS0_NAMES = {code: name for name, code in NUTS0.items()}
+
+BLOCS = {'EU27': ['AT', 'BE', 'BG', 'CY', 'CZ', 'DE', 'DK', 'EE', 'EL', 'ES', 'FI', 'FR',
+                  'HR', 'HU', 'IE', 'IT', 'LT', 'LU', 'LV', 'MT', 'NL', 'PL', 'PT', 'RO',
+                  'SE', 'SI', 'SK']}
+
+
+def nuts_code(geo):
+    """NUTS code of a country name or of a code already in NUTS form."""
+    return NUTS0.get(geo, geo)
+
+
+class Hierarchy:
+    """Weighted sums of every NUTS node above a set of leaves.
+
+    `values` is (n_leaves, n_columns), e.g. one column per year, and may hold
+    NaN. `weights` is (n_leaves,) or (n_leaves, n_columns); None weighs every
+    leaf 1. A missing value or weight drops the leaf from that column.
+    """
+
+    def __init__(self, codes, values, weights=None, columns=None):
+        codes = np.asarray([nuts_code(str(c)) for c in codes], dtype=object)
+        values = np.asarray(values, dtype=float)
+        weights = np.ones(len(codes)) if weights is None else np.asarray(weights, dtype=float)
+        order = np.argsort(codes, kind='stable')
+        self.leaves  = pd.Index(codes[order])
+        self.columns = list(columns) if columns is not None else list(range(values.shape[1]))
+        if not self.leaves.is_unique:
+            raise ValueError('Leaf codes must be unique')
+        nested = [c for c in self.leaves[:-1][
+            np.char.startswith(self.leaves[1:].to_numpy(dtype=str),
+                               self.leaves[:-1].to_numpy(dtype=str))]]
+        if nested:
+            raise ValueError(f'Leaves may not contain one another: {nested[:5]}')
+        self.values  = values[order]
+        self.weights = np.broadcast_to(weights[order].reshape(len(codes), -1),
+                                       self.values.shape).copy()
+
+        # ── Materialize every level by a segment reduce over the sorted leaves ──
+        num, den = self._terms(self.values, self.weights)
+        lengths = self.leaves.str.len().to_numpy()
+        nodes, node_num, node_den, level = [], [], [], []
+        for n_chars in range(2, lengths.max() + 1):
+            covered = np.flatnonzero(lengths >= n_chars)
+            prefix = self.leaves[covered].str[:n_chars].to_numpy(dtype=object)
+            starts = np.flatnonzero(np.r_[True, prefix[1:] != prefix[:-1]])
+            nodes.append(prefix[starts])
+            node_num.append(np.add.reduceat(num[covered], starts, axis=0))
+            node_den.append(np.add.reduceat(den[covered], starts, axis=0))
+            level += [n_chars - 2] * len(starts)
+        self.nodes = pd.Index(np.concatenate(nodes))
+        self.level = np.array(level)
+        self.num   = np.concatenate(node_num)
+        self.den   = np.concatenate(node_den)
+        self._leaf_row = dict(zip(self.leaves, range(len(self.leaves))))
+        self._node_row = dict(zip(self.nodes, range(len(self.nodes))))
+
+    @staticmethod
+    def _terms(values, weights):
+        """Weighted values and weights, zero where the value or weight is missing."""
+        present = ~(np.isnan(values) | np.isnan(weights))
+        return np.where(present, values * weights, 0.0), np.where(present, weights, 0.0)
+
+    def _rates(self, num, den):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(den > 0, num / den, np.nan)
+
+    # ── Queries ────────────────────────────────────────────────────────────────
+    def rollup(self, level=None):
+        """Weighted rate of every node (or of one level: 0 = country … 3 = NUTS-3)."""
+        rows = slice(None) if level is None else self.level == level
+        return pd.DataFrame(self._rates(self.num[rows], self.den[rows]),
+                            index=self.nodes[rows], columns=self.columns)
+
+    def node(self, code):
+        """Weighted rate of one node."""
+        i = self.nodes.get_loc(nuts_code(code))
+        return pd.Series(self._rates(self.num[i], self.den[i]), index=self.columns, name=code)
+
+    def bloc(self, members, name=None):
+        """Weighted rate of a bloc: a name in BLOCS or a list of nodes (countries
+        or regions; members missing from the leaves are skipped)."""
+        if isinstance(members, str):
+            name, members = name or members, BLOCS[members]
+        codes = (nuts_code(m) for m in members)
+        rows = np.array([self._node_row[c] for c in codes if c in self._node_row], dtype=int)
+        return pd.Series(self._rates(self.num[rows].sum(axis=0), self.den[rows].sum(axis=0)),
+                         index=self.columns, name=name)
+
+    def total_weight(self, code):
+        """Weight behind a node's rate, per column (leaves with a value only)."""
+        return pd.Series(self.den[self.nodes.get_loc(nuts_code(code))], index=self.columns)
+
+    # ── Incremental update ─────────────────────────────────────────────────────
+    def update(self, code, values=None, weights=None):
+        """Replace one leaf's values and/or weights, adjusting only its ancestors."""
+        i = self._leaf_row[nuts_code(code)]
+        old_num, old_den = self._terms(self.values[i], self.weights[i])
+        if values is not None:
+            self.values[i] = values
+        if weights is not None:
+            self.weights[i] = weights
+        new_num, new_den = self._terms(self.values[i], self.weights[i])
+        leaf = self.leaves[i]
+        ancestors = [self._node_row[leaf[:n]] for n in range(2, len(leaf) + 1)]
+        self.num[ancestors] += new_num - old_num
+        self.den[ancestors] += new_den - old_den
+
+
+def from_frame(df, columns, weights=None, key='COUNTRY'):
+    """Hierarchy over the rows of `df` (countries by name or NUTS codes in `key`).
+    `weights` is an array or a frame with `key` and either one 'weight' column
+    or the same `columns`."""
+    if isinstance(weights, pd.DataFrame):
+        w = weights.assign(**{key: weights[key].astype(str)}).set_index(key)
+        w = w.reindex(df[key].astype(str))
+        weights = (w[list(columns)] if set(columns) <= set(w.columns) else w[['weight']]).to_numpy()
+    return Hierarchy(df[key].astype(str), df[list(columns)].to_numpy(dtype=float),
+                     weights, columns)
+
+
+def from_cube(cube, metric, age='Total', weights=None):
+    """Hierarchy of every geo (except the EU aggregate) of one cube block."""
+    from cube import EU_GEO
+    table = cube.wide(metric, age=age)
+    table = table[table.index != EU_GEO]
+    df = table.rename_axis('COUNTRY').reset_index()
+    return from_frame(df, list(table.columns), weights)
+
+
+if __name__ == '__main__':
+    import datasets
+    from cube import EU_GEO
+
+    parser = argparse.ArgumentParser(description='Weighted EU and bloc aggregates.')
+    parser.add_argument('--metric', default='ai', choices=['ai', 'unemployment'])
+    parser.add_argument('--age', default='Total', help='age band (unemployment only)')
+    parser.add_argument('--weights', help='CSV (;) with COUNTRY and a weight or per-year columns')
+    parser.add_argument('--bloc', nargs='+', help='countries of a custom bloc')
+    args = parser.parse_args()
+
+    weights = None
+    if args.weights:
+        weights = pd.read_csv(args.weights, sep=';', encoding='utf-8-sig', dtype={'COUNTRY': str})
+        weights.columns = [str(c) for c in weights.columns]
+    hierarchy = from_cube(datasets.cube, args.metric, args.age, weights)
+    rows = [hierarchy.bloc('EU27')]
+    if args.bloc:
+        rows.append(hierarchy.bloc(args.bloc, 'bloc: ' + ', '.join(args.bloc)))
+    published = datasets.cube.wide(args.metric, age=args.age).loc[EU_GEO]
+    rows.append(published.rename('EU27 published'))
+    with pd.option_context('display.width', 160, 'display.float_format', '{:.2f}'.format):
+        print(pd.DataFrame(rows).to_string())
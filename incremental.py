@@ -0,0 +1,177 @@
+"""
+Incremental per-year derived results.
+Everything the charts derive from one reference year (the AI/unemployment
+medians, the quadrant groups against them, the growth deltas from the base
+year and that year's trajectory positions) depends only on that year's
+columns (plus the base year for deltas). Each year's results are therefore
+persisted under DATA_PATH/.year_store/ with a digest of exactly those
+inputs. When a year is appended or Eurostat revises one, only that year
+(and, for a revised base year, the deltas) is recomputed; every other year
+is read back from the store.
+
+Usage:
+    python incremental.py            # update the store for DATA_PATH, report what changed
+"""
+
+import hashlib
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from taxonomy import classify
+
+STORE_SUBDIR = '.year_store'
+
+YearlyResults = namedtuple('YearlyResults', ['years', 'countries', 'medians', 'groups',
+                                             'growth', 'trajectories', 'recomputed'])
+YearlyResults.__doc__ = """Derived results for every reference year.
+years        : list of 'YYYY' strings, ascending
+countries    : list of country names (row order of every array below)
+medians      : DataFrame indexed by year with 'ai' and 'un' median columns
+groups       : DataFrame (COUNTRY + one column per year) of A/B/C/D labels
+growth       : DataFrame (COUNTRY + ai_growth_<yyyy>/un_change_<yyyy>) vs the base year
+trajectories : float array (n_countries, n_years, 2) of (ai, un) positions
+recomputed   : years whose results were (re)computed in this update"""
+
+
+def year_columns(df):
+    """Columns named like a four-digit year, in their frame order."""
+    return [c for c in df.columns if re.fullmatch(r'\d{4}', str(c))]
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(np.ascontiguousarray(part).tobytes() if isinstance(part, np.ndarray)
+                 else str(part).encode())
+        h.update(b'|')
+    return h.hexdigest()
+
+
+class YearStore:
+    """One .npz file per year holding its derived arrays and input digest.
+    Years already read or written are also kept in memory, so a warm
+    process re-checks their digests without touching the files again."""
+
+    def __init__(self, path):
+        self.path  = path
+        self._memo = {}   # year -> (digest, arrays)
+
+    def _file(self, year):
+        return os.path.join(self.path, f'{year}.npz')
+
+    def get(self, year, digest):
+        """Stored arrays for `year`, or None if missing or computed from other inputs."""
+        memo = self._memo.get(year)
+        if memo is not None and memo[0] == digest:
+            return memo[1]
+        try:
+            with np.load(self._file(year), allow_pickle=False) as data:
+                if str(data['digest']) != digest:
+                    return None
+                arrays = {k: data[k] for k in data.files if k != 'digest'}
+        except (OSError, KeyError, ValueError):
+            return None
+        self._memo[year] = (digest, arrays)
+        return arrays
+
+    def put(self, year, digest, **arrays):
+        self._memo[year] = (digest, arrays)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp = f'{self._file(year)}.{os.getpid()}.tmp.npz'
+            np.savez(tmp, digest=np.array(digest), **arrays)
+            os.replace(tmp, self._file(year))
+        except OSError:
+            pass   # read-only data folder: keep the results in memory only
+
+
+_stores = {}   # path -> YearStore, so the memo outlives a dataset reload
+
+
+def store_for(data_path):
+    """The (shared) YearStore of a data folder."""
+    path = os.path.join(os.path.abspath(data_path), STORE_SUBDIR)
+    return _stores.setdefault(path, YearStore(path))
+
+
+def derive_year(ai, un, ai_base, un_base):
+    """Derived results of one year from its (n,) AI and unemployment rates."""
+    ai_med, un_med = np.nanmedian(ai), np.nanmedian(un)
+    group = classify(ai, un, ai_med, un_med)
+    group[np.isnan(ai) | np.isnan(un)] = ''
+    return {'medians': np.array([ai_med, un_med]), 'group': group.astype('U1'),
+            'growth': np.stack([ai - ai_base, un - un_base], axis=-1),
+            'points': np.stack([ai, un], axis=-1)}
+
+
+def update(df_ia, df_emp, store, base_year=None):
+    """Bring the per-year store up to date with the AI and unemployment tables
+    (COUNTRY + 'YYYY' columns) and return the results for every common year.
+    A year whose input digest matches the stored one is not recomputed."""
+    years = sorted(set(year_columns(df_ia)) & set(year_columns(df_emp)))
+    base_year = base_year or years[0]
+    ai_table = df_ia.set_index('COUNTRY')[years]
+    un_table = df_emp.set_index('COUNTRY')[years]
+    common = ai_table.index[ai_table.index.isin(un_table.index)]   # df_ia's row order
+    ai_all = ai_table.loc[common].to_numpy(dtype=float)
+    un_all = un_table.loc[common].to_numpy(dtype=float)
+    countries = common.astype(str).to_numpy()
+    base = years.index(base_year)
+    key_rows = '\0'.join(countries)
+
+    results, recomputed = {}, []
+    for k, y in enumerate(years):
+        ai, un = ai_all[:, k], un_all[:, k]
+        digest = _digest(key_rows, base_year, ai, un, ai_all[:, base], un_all[:, base])
+        derived = store.get(y, digest)
+        if derived is None:
+            derived = derive_year(ai, un, ai_all[:, base], un_all[:, base])
+            store.put(y, digest, **derived)
+            recomputed.append(y)
+        results[y] = derived
+
+    medians = pd.DataFrame([results[y]['medians'] for y in years],
+                           index=years, columns=['ai', 'un'])
+    groups  = pd.DataFrame({'COUNTRY': countries, **{y: results[y]['group'] for y in years}})
+    growth  = {'COUNTRY': countries}
+    for y in years:
+        growth[f'ai_growth_{y}'] = results[y]['growth'][:, 0]
+        growth[f'un_change_{y}'] = results[y]['growth'][:, 1]
+    trajectories = np.stack([results[y]['points'] for y in years], axis=1)
+    return YearlyResults(years, countries.tolist(), medians, groups, pd.DataFrame(growth),
+                         trajectories, recomputed)
+
+
+def rows_of(results, countries):
+    """Row of each of `countries` in the results' arrays (-1 where absent)."""
+    return pd.Index(results.countries).get_indexer(pd.Index(countries).astype(str))
+
+
+def positions(results, countries, years):
+    """(len(countries), len(years), 2) trajectory positions of the given
+    countries and 'YYYY' years, NaN for a country not in the results."""
+    rows = rows_of(results, countries)
+    points = results.trajectories[rows][:, [results.years.index(y) for y in years]]
+    points[rows < 0] = np.nan
+    return points
+
+
+def growth(results, countries, year):
+    """(ai_growth, un_change) of `year` against the base year, per country (NaN where absent)."""
+    rows = rows_of(results, countries)
+    table = results.growth[[f'ai_growth_{year}', f'un_change_{year}']].to_numpy()
+    deltas = table[rows]
+    deltas[rows < 0] = np.nan
+    return deltas[:, 0], deltas[:, 1]
+
+
+if __name__ == '__main__':
+    import datasets
+    res = datasets.yearly
+    print(f"Years: {', '.join(res.years)}")
+    print(f"Recomputed: {', '.join(res.recomputed) or 'nothing (all years reused)'}")
+    print(res.medians.to_string())
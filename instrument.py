@@ -0,0 +1,159 @@
+"""
+Opt-in timing and profiling instrumentation.
+Code marks named stages with `with stage('merge'): ...`. When tracing is
+off (the default) `stage()` returns a shared no-op context manager, so the
+markers cost a function call and nothing else.
+
+Tracing is switched on by environment variables (or enable()):
+
+    CHART_TRACE=trace.jsonl      one JSON record per stage, appended as it ends
+    CHART_TRACE=trace.json       Chrome trace format (chrome://tracing, Perfetto),
+                                 written when the process exits and by flush()
+    CHART_TRACE_MEMORY=1         also record each stage's peak traced memory
+    CHART_PROFILE=profiles/      run every top-level stage under cProfile and
+                                 dump `<stage>.<pid>.prof` files there (works
+                                 with or without CHART_TRACE)
+
+Each record holds the stage name, wall time, CPU time, the process's peak
+RSS so far and, with CHART_TRACE_MEMORY, the stage's peak Python memory.
+A '{pid}' in the trace path is replaced by the process id, which keeps
+Chrome traces from forked render workers apart. Pool workers exit without
+running atexit handlers, so the render entry points flush() after every
+chart; each flush rewrites the process's file with all its events so far.
+"""
+
+import atexit
+import contextlib
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:   # not available on Windows
+    resource = None
+
+_NULL = contextlib.nullcontext()
+
+_enabled     = False
+_trace_path  = None
+_profile_dir = None
+_memory      = False
+_events      = []      # buffered Chrome trace events
+_peaks       = []      # tracemalloc peak per open stage (innermost last)
+_depth       = 0
+_lock        = threading.Lock()
+
+
+def enable(trace_path, profile_dir=None, memory=False):
+    """Start recording stages to `trace_path` (.json → Chrome trace, else JSON
+    lines; None records nothing, e.g. when only profiling)."""
+    global _enabled, _trace_path, _profile_dir, _memory
+    _enabled, _trace_path, _profile_dir, _memory = True, trace_path, profile_dir, memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+
+
+def disable():
+    """Stop recording and write any buffered Chrome trace."""
+    global _enabled
+    flush()
+    _enabled = False
+
+
+def enabled():
+    return _enabled
+
+
+def stage(name, **args):
+    """Context manager timing the named stage; a no-op unless tracing is enabled."""
+    if not _enabled:
+        return _NULL
+    return _Stage(name, args)
+
+
+def _max_rss_kb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _Stage:
+    def __init__(self, name, args):
+        self.name, self.args = name, args
+        self.profiler = None
+
+    def __enter__(self):
+        global _depth
+        if _memory:
+            if _peaks:   # fold the parent's peak so far before resetting
+                _peaks[-1] = max(_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            _peaks.append(0)
+        if _profile_dir and _depth == 0:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        _depth += 1
+        self.start_wall = time.perf_counter()
+        self.start_cpu  = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        global _depth
+        wall = time.perf_counter() - self.start_wall
+        cpu  = time.process_time() - self.start_cpu
+        _depth -= 1
+        if self.profiler is not None:
+            self.profiler.disable()
+            slug = re.sub(r'[^\w.-]+', '_', '-'.join([self.name, *map(str, self.args.values())]))
+            self.profiler.dump_stats(os.path.join(_profile_dir, f'{slug}.{os.getpid()}.prof'))
+        record = {'stage': self.name, 'wall_s': wall, 'cpu_s': cpu,
+                  'max_rss_kb': _max_rss_kb(), 'pid': os.getpid(), **self.args}
+        if _memory:
+            peak = max(_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if _peaks:
+                _peaks[-1] = max(_peaks[-1], peak)
+            record['peak_traced_bytes'] = peak
+        _record(record, self.start_wall, wall)
+        return False
+
+
+def _path():
+    return _trace_path.replace('{pid}', str(os.getpid()))
+
+
+def _record(record, start, wall):
+    if _trace_path is None:   # profiling only
+        return
+    with _lock:
+        if _trace_path.endswith('.json'):
+            _events.append({'name': record['stage'], 'ph': 'X', 'pid': record['pid'],
+                            'tid': threading.get_ident(), 'ts': start * 1e6, 'dur': wall * 1e6,
+                            'args': {k: v for k, v in record.items() if k not in ('stage', 'pid')}})
+        else:
+            with open(_path(), 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+
+def flush():
+    """Write buffered Chrome trace events (JSON lines are written as they happen)."""
+    with _lock:
+        if not (_enabled and _trace_path and _trace_path.endswith('.json') and _events):
+            return
+        with open(_path(), 'w') as f:
+            json.dump({'traceEvents': _events, 'displayTimeUnit': 'ms'}, f)
+
+
+atexit.register(flush)
+if hasattr(os, 'register_at_fork'):   # a forked worker writes only its own events
+    os.register_at_fork(after_in_child=_events.clear)
+
+if os.environ.get('CHART_TRACE') or os.environ.get('CHART_PROFILE'):
+    enable(os.environ.get('CHART_TRACE'), os.environ.get('CHART_PROFILE'),
+           os.environ.get('CHART_TRACE_MEMORY', '0') != '0')
@@ -0,0 +1,209 @@
+"""
+Point labels placed without overlaps, for dense scatter and lollipop charts.
+Every label has a few candidate positions around its point (up-right first,
+then the other corners and sides). Labels are placed one at a time in
+priority order, each at its first candidate whose box stays inside the axes
+and does not touch the points or the labels already placed. A label with no
+free candidate is dropped, so the lowest-priority labels drop first.
+
+Collisions are tested against a uniform grid over display coordinates.
+Each placed box is filed under the grid cells it covers, so a candidate is
+only compared with the boxes in its own few cells. That makes the layout
+near-linear in the number of labels, where iterative repel methods compare
+every pair of labels at each step. Placement runs at draw time, on the final
+axes layout and output dpi (after tight_layout, and in savefig as well).
+
+    from labels import PointLabels
+    ax.add_artist(PointLabels(x, y, names, point_size=13, fontsize=8.5, color=C2))
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.font_manager import findfont, get_font
+from matplotlib.text import Text
+from matplotlib.transforms import IdentityTransform
+
+try:
+    from matplotlib.ft2font import LoadFlags
+    _NO_HINTING = LoadFlags.NO_HINTING
+except ImportError:   # matplotlib < 3.10
+    from matplotlib.ft2font import LOAD_NO_HINTING as _NO_HINTING
+
+# Candidate offsets in points, in order of preference
+OFFSETS = ((5, 5), (-5, 5), (5, -5), (-5, -5), (7, 0), (-7, 0), (0, 8), (0, -8))
+
+
+def _alignment(dx, dy):
+    """Text alignment that puts the box on the side of the offset."""
+    ha = 'left' if dx > 0 else 'right' if dx < 0 else 'center'
+    va = 'bottom' if dy > 0 else 'top' if dy < 0 else 'center'
+    return ha, va
+
+
+def salience(*coords):
+    """Distance of each point from the median, in units of each axis' spread:
+    the default priority, so outliers keep their labels first."""
+    pts = np.column_stack([np.asarray(c, dtype=float) for c in coords])
+    spread = np.nanstd(pts, axis=0)
+    spread[spread == 0] = 1.0
+    return np.nansum(((pts - np.nanmedian(pts, axis=0)) / spread) ** 2, axis=1)
+
+
+class SpatialGrid:
+    """Axis-aligned boxes (x0, y0, x1, y1) filed under the grid cells they
+    cover, each with an optional owner: a label never collides with its own
+    point. A box without an owner collides with every query."""
+
+    def __init__(self, cell):
+        self.cell  = float(cell)
+        self.cells = defaultdict(list)
+
+    def add(self, box, owner=None):
+        c, entry = self.cell, (*box, owner)
+        for i in range(int(box[0] // c), int(box[2] // c) + 1):
+            for j in range(int(box[1] // c), int(box[3] // c) + 1):
+                self.cells[i, j].append(entry)
+
+    def collides(self, box, owner=None):
+        x0, y0, x1, y1 = box
+        c, cells = self.cell, self.cells
+        for i in range(int(x0 // c), int(x1 // c) + 1):
+            for j in range(int(y0 // c), int(y1 // c) + 1):
+                for b in cells.get((i, j), ()):
+                    if x0 < b[2] and b[0] < x1 and y0 < b[3] and b[1] < y1 \
+                            and (owner is None or b[4] != owner):
+                        return True
+        return False
+
+
+class PointLabels(Artist):
+    """Non-overlapping text labels for the points (x, y) of an axes.
+
+    priority   : higher values are placed first (default: salience)
+    offsets    : candidate (dx, dy) offsets in points, in order of preference
+    point_size : marker diameter in points; markers are obstacles too
+    pad        : extra space around each label box, in points
+    obstacles  : (m, 2) further data points to keep clear of (same marker size)
+    avoid      : artists (texts, legends, …) whose boxes labels must not cover
+    colors     : one color per label (overrides `color`)
+    Other keywords (fontsize, fontweight, color, …) go to the Text artists.
+    After a draw, `placed` holds each label's candidate index, -1 if dropped.
+    """
+
+    def __init__(self, x, y, texts, priority=None, offsets=OFFSETS, point_size=0.0,
+                 pad=1.0, obstacles=None, avoid=(), colors=None, zorder=8, **text_kw):
+        super().__init__()
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        priority = salience(self.x, self.y) if priority is None else np.asarray(priority)
+        self.order = np.argsort(-priority, kind='stable')
+        self.offsets = np.asarray(offsets, dtype=float)
+        self.point_size = point_size
+        self.pad = pad
+        self.obstacles = None if obstacles is None else np.asarray(obstacles, dtype=float)
+        self.avoid = list(avoid)
+        self.set_zorder(zorder)
+        self.set_in_layout(False)
+        self._texts = [Text(0, 0, str(s), transform=IdentityTransform(), **text_kw)
+                       for s in texts]
+        if colors is not None:
+            for text, color in zip(self._texts, colors):
+                text.set_color(color)
+        self._fonts = [t.get_fontproperties() for t in self._texts]
+        self._font_keys = [hash(f) for f in self._fonts]   # FontProperties hash slowly
+        self._extents = {}
+        self.placed = np.full(len(self._texts), -1)
+
+    def get_children(self):
+        return list(self._texts)
+
+    def _measure(self, renderer):
+        """(n, 2) width and height in pixels of every label, memoized per dpi.
+        Widths add up per-glyph advances (measured once per character and
+        font), which is far cheaper than laying out every string; kerning
+        is ignored, so boxes may be off by a pixel or two."""
+        to_px = renderer.points_to_pixels(1.0)
+        if to_px not in self._extents:
+            sizes, fonts = {}, {}
+            for text, prop, key in zip(self._texts, self._fonts, self._font_keys):
+                s = text.get_text()
+                if (s, key) in sizes:
+                    continue
+                if key not in fonts:
+                    font = get_font(findfont(prop))
+                    font.set_size(prop.get_size_in_points(), 72.0 * to_px)
+                    line = renderer.get_text_width_height_descent('lp', prop, ismath=False)[1]
+                    fonts[key] = (font, {}, line)
+                font, advance, line = fonts[key]
+                for c in set(s) - advance.keys():
+                    advance[c] = font.load_char(ord(c), flags=_NO_HINTING).linearHoriAdvance / 65536
+                lines = s.split('\n')
+                sizes[s, key] = (max(sum(advance[c] for c in part) for part in lines) + 1,
+                                 line * len(lines))
+            self._extents[to_px] = np.array([sizes[t.get_text(), key] for t, key
+                                             in zip(self._texts, self._font_keys)]).reshape(-1, 2)
+        return self._extents[to_px]
+
+    def layout(self, renderer):
+        """Place the labels for the current axes geometry; returns `placed`."""
+        to_px = renderer.points_to_pixels(1.0)
+        to_display = self.axes.transData.transform
+        xy = to_display(np.column_stack([self.x, self.y]))
+        extent = self._measure(renderer)
+        offsets = self.offsets * to_px
+        pad, radius = self.pad * to_px, self.point_size * to_px / 2
+        frame = self.axes.bbox
+
+        grid = SpatialGrid(max(np.median(extent, axis=0).max() if len(extent) else 1.0,
+                               2 * radius, 1.0))
+        visible = np.isfinite(xy).all(axis=1)
+        if radius > 0:
+            points = xy if self.obstacles is None else np.vstack([xy, to_display(self.obstacles)])
+            for owner in np.flatnonzero(np.isfinite(points).all(axis=1)):
+                px, py = points[owner]
+                grid.add((px - radius, py - radius, px + radius, py + radius), owner)
+        for artist in self.avoid:
+            if artist.get_visible():
+                grid.add(tuple(artist.get_window_extent(renderer).extents))
+
+        # Boxes of every candidate of every label, (n, n_offsets, 4), and
+        # whether they fit in the axes: computed at once, tested in the loop
+        ha = np.sign(offsets[:, 0])   # +1 left-aligned, -1 right-aligned, 0 centred
+        va = np.sign(offsets[:, 1])
+        w, h = extent[:, :1], extent[:, 1:]
+        x0 = xy[:, :1] + offsets[:, 0] - w * (ha < 0) - w / 2 * (ha == 0) - pad
+        y0 = xy[:, 1:] + offsets[:, 1] - h * (va < 0) - h / 2 * (va == 0) - pad
+        boxes = np.stack([x0, y0, x0 + w + 2 * pad, y0 + h + 2 * pad], axis=-1)
+        inside = ((boxes[..., 0] >= frame.x0) & (boxes[..., 2] <= frame.x1)
+                  & (boxes[..., 1] >= frame.y0) & (boxes[..., 3] <= frame.y1))
+        inside &= visible[:, None]
+        self.placed[:] = -1
+        for i in self.order[inside[self.order].any(axis=1)]:
+            for k in np.flatnonzero(inside[i]):
+                box = tuple(boxes[i, k].tolist())
+                if not grid.collides(box, i):
+                    grid.add(box)
+                    self.placed[i] = k
+                    break
+
+        for i, text in enumerate(self._texts):
+            k = self.placed[i]
+            text.set_visible(k >= 0)
+            if k >= 0:
+                text.set_position(xy[i] + offsets[k])
+                text.set_horizontalalignment(_alignment(*offsets[k])[0])
+                text.set_verticalalignment(_alignment(*offsets[k])[1])
+        return self.placed
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        self.layout(renderer)
+        for text in self._texts:
+            if text.get_visible():
+                if text.get_figure() is None:
+                    text.set_figure(self.figure)
+                text.draw(renderer)
+        self.stale = False
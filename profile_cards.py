@@ -0,0 +1,164 @@
+"""
+Per-country (or per-region) profile cards.
+One image per entity. The left panel shows its AI adoption and unemployment
+per year against the EU medians. The right panel shows its trajectory over
+every other entity, and a box carries its growth figures. All cards share one
+ProfileCard template (templates.py), so producing 27 country cards or 1,000+
+NUTS regions is a tight loop over in-place artist updates, not a new figure
+per entity.
+
+Usage:
+    python profile_cards.py --output cards/
+    python profile_cards.py --output cards/ --countries Spain France --format svg
+"""
+
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+from matplotlib.patches import Patch
+
+from config import C1, C2, C3, GROUP_COLORS, GROUP_NAMES, WHITE
+from taxonomy import thresholds
+from templates import ChartTemplate, panel_title, stats_box, style_axes
+
+
+def card_name(entity):
+    """File-system friendly name of an entity, e.g. 'Bosnia and Herzegovina' → 'Bosnia_and_Herzegovina'."""
+    return re.sub(r'[^\w-]+', '_', str(entity)).strip('_')
+
+
+class ProfileCard(ChartTemplate):
+    """AI adoption vs unemployment card for one row of a merged-style table
+    (COUNTRY, ai<yy>/un<yy> for each year, group)."""
+
+    figsize = (13, 5.5)
+
+    def __init__(self, df, years, dpi=None):
+        self.df     = df.reset_index(drop=True)
+        self.years  = list(years)
+        sfx         = [y[2:] for y in self.years]
+        self.ai     = self.df[[f'ai{s}' for s in sfx]].to_numpy(dtype=float)
+        self.un     = self.df[[f'un{s}' for s in sfx]].to_numpy(dtype=float)
+        self.names  = self.df['COUNTRY'].astype(str).to_numpy()
+        self.groups = self.df['group'].astype(str).to_numpy()
+        self.ai_med, self.un_med = thresholds(self.df, sfx)
+        super().__init__(dpi)
+
+    def build(self):
+        fig, n = self.fig, len(self.years)
+        x = np.arange(n)
+        bars_ax, traj_ax = self.bars_ax, self.traj_ax = fig.subplots(
+            1, 2, gridspec_kw={'width_ratios': [1, 1.2]})
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.12, top=0.86, wspace=0.18)
+
+        # ── Left: rates per year (shared scale across all cards) ────────────────
+        style_axes(bars_ax, grid_axis='y')
+        top = np.nanmax(np.concatenate([self.ai, self.un])) * 1.30
+        bars_ax.set_ylim(0, top)
+        bars_ax.set_xticks(x, self.years, color=C2)
+        bars_ax.set_ylabel('Rate (%)', fontweight='bold', color=C2, fontsize=10)
+        self.ai_bars = bars_ax.bar(x - 0.2, np.zeros(n), 0.38, alpha=0.85)
+        self.un_bars = bars_ax.bar(x + 0.2, np.zeros(n), 0.38, color=C3, alpha=0.50)
+        # Median ticks never change but must sit on top of the bars
+        medians = bars_ax.plot(np.concatenate([x - 0.2, x + 0.2]),
+                               np.concatenate([self.ai_med, self.un_med]),
+                               color=C2, marker='_', markersize=24, markeredgewidth=2,
+                               linestyle='none', alpha=0.7, label='EU median')
+        # Static key: the AI bars take each card's group color, so their swatch is neutral
+        keys = [Patch(facecolor=C2, alpha=0.85, label='AI adoption (group color)'),
+                Patch(facecolor=C3, alpha=0.50, label='Unemployment')] + medians
+        bars_ax.legend(handles=keys, loc='upper right', fontsize=8, frameon=False,
+                       bbox_to_anchor=(1.0, 0.93))
+        self.bar_labels = [bars_ax.text(xi, 0, '', ha='center', va='bottom',
+                                        fontsize=8, color=C2, fontweight='bold')
+                           for xi in np.concatenate([x - 0.2, x + 0.2])]
+
+        # ── Right: trajectory over every other entity ───────────────────────────
+        style_axes(traj_ax, grid_alpha=0.15)
+        pts_x, pts_y = self.ai.ravel(), self.un.ravel()
+        pad_x = (np.nanmax(pts_x) - np.nanmin(pts_x)) * 0.08
+        pad_y = (np.nanmax(pts_y) - np.nanmin(pts_y)) * 0.12
+        traj_ax.set_xlim(max(0, np.nanmin(pts_x) - pad_x), np.nanmax(pts_x) + pad_x)
+        traj_ax.set_ylim(max(0, np.nanmin(pts_y) - pad_y), np.nanmax(pts_y) + pad_y)
+        traj_ax.scatter(self.ai[:, -1], self.un[:, -1], s=18, color=C3, alpha=0.25,
+                        linewidth=0)
+        traj_ax.axvline(self.ai_med[-1], color=C2, linewidth=0.8, linestyle=':', alpha=0.4)
+        traj_ax.axhline(self.un_med[-1], color=C2, linewidth=0.8, linestyle=':', alpha=0.4)
+        traj_ax.set_xlabel('AI Adoption Rate (%)', fontweight='bold', color=C2, fontsize=10)
+        traj_ax.set_ylabel('Unemployment Rate (%)', fontweight='bold', color=C2, fontsize=10)
+        self.path, = traj_ax.plot([], [], linewidth=2, alpha=0.6)
+        self.points = traj_ax.scatter(np.zeros(n), np.zeros(n), s=np.linspace(60, 140, n),
+                                      edgecolors=WHITE, linewidth=1.2, zorder=5)
+        self.year_labels = [traj_ax.annotate(y[2:], (0, 0), xytext=(6, 4),
+                                             textcoords='offset points', fontsize=8,
+                                             color=C2, fontweight='bold')
+                            for y in self.years]
+
+        self.title = self.fig.suptitle('', fontsize=14, fontweight='bold', color=C1)
+        self.group_title = panel_title(bars_ax, '', C1)
+        self.stats = stats_box(traj_ax, '')
+        return ([self.title, self.group_title, self.stats, self.path, self.points]
+                + list(self.ai_bars) + list(self.un_bars) + medians
+                + self.bar_labels + self.year_labels)
+
+    def fill(self, i):
+        ai, un, g = self.ai[i], self.un[i], self.groups[i]
+        col = GROUP_COLORS.get(g, C1)
+        for bar, v in zip(self.ai_bars, ai):
+            bar.set_height(0 if np.isnan(v) else v)
+            bar.set_facecolor(col)
+        for bar, v in zip(self.un_bars, un):
+            bar.set_height(0 if np.isnan(v) else v)
+        for label, bar, v in zip(self.bar_labels, list(self.ai_bars) + list(self.un_bars),
+                                 np.concatenate([ai, un])):
+            label.set_position((bar.get_x() + bar.get_width() / 2, 0 if np.isnan(v) else v))
+            label.set_text('' if np.isnan(v) else f'{v:.1f}')
+
+        self.path.set_data(ai, un)
+        self.path.set_color(col)
+        self.points.set_offsets(np.column_stack([ai, un]))
+        self.points.set_facecolor(col)
+        self.points.set_alpha(None)
+        for label, xy in zip(self.year_labels, zip(ai, un)):
+            label.xy = xy
+
+        self.title.set_text(f'{self.names[i].upper()} — AI ADOPTION vs UNEMPLOYMENT '
+                            f'({self.years[0]}–{self.years[-1]})')
+        self.group_title.set_text(f'GROUP {g}: {GROUP_NAMES.get(g, "").upper()}')
+        self.group_title.set_color(col)
+        rank = int((self.ai[:, -1] > ai[-1]).sum()) + 1
+        self.stats.set_text(f'AI {self.years[0]}→{self.years[-1]}: {ai[-1] - ai[0]:+.1f} pp\n'
+                            f'Unemp.: {un[-1] - un[0]:+.1f} pp\n'
+                            f'AI rank: {rank} of {len(self.ai)}')
+
+
+def render_cards(df, years, output_dir, fmt='png', dpi=None, names=None):
+    """Write one card per row of `df` (or only the rows named in `names`).
+    Returns the written paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    card = ProfileCard(df, years, dpi)
+    rows = range(len(card.names))
+    if names is not None:
+        wanted = set(names)
+        rows = [i for i in rows if card.names[i] in wanted]
+    return [card.render(i, os.path.join(output_dir, f'{card_name(card.names[i])}.{fmt}'), fmt)
+            for i in rows]
+
+
+if __name__ == '__main__':
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Render one profile card per country.')
+    parser.add_argument('--output', default='cards')
+    parser.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--countries', nargs='+', help='only these countries (default: all)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = render_cards(datasets.merged, datasets.YEARS, args.output, args.format, args.dpi,
+                         args.countries)
+    print(f'Wrote {len(paths)} cards to {args.output} in {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,221 @@
+"""
+Batched trend fitting and forward projections.
+Every entity (country, region, EU aggregate) gets its own trend, but all of
+them are fitted together. The rates form one (entities × years) array, where
+a missing year is masked out, and the normal equations of every row are
+stacked into one (entities × p × p) system, solved in a single batched
+np.linalg.solve call. The same core also fits the per-group cross-sectional
+trend lines of chart 08, with the groups' countries padded and masked.
+
+Two trend forms:
+
+    linear    rate = a + b·t, floored at 0
+    logistic  logit(rate / cap) = a + b·t, so projections stay within
+              (0, cap): meant for adoption rates, capped at 100%
+
+Projections come with prediction intervals from the residual spread of each
+row: Student-t quantiles with n − p degrees of freedom. These are wide with
+three or four observed years, because the data supports little more. A row
+whose points happen to fall on a line borrows the lower-quartile spread of
+all rows rather than getting a zero-width interval. A
+scenario sweep scales every fitted slope by each of several multipliers
+(e.g. 0.5× to 2× the observed pace) in one broadcast over
+scenarios × entities × years.
+
+Usage:
+    python projections.py                          # 2026–2030 for every country
+    python projections.py --metric unemployment --to 2028 --level 0.8
+"""
+
+import argparse
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+KINDS   = ('linear', 'logistic')
+CAP     = 100.0   # adoption rates are percentages of enterprises
+HORIZON = 2030
+
+Fit = namedtuple('Fit', 'coef cov_unscaled sigma2 dof years kind cap')
+Fit.__doc__ = """Batched trend fit.
+coef         : (n, 2) intercept and slope per row, in the fitted (linear or logit) scale
+cov_unscaled : (n, 2, 2) inverse normal matrices (X'X)⁻¹ per row
+sigma2       : (n,) residual variance per row, floored (NaN without spare observations)
+dof          : (n,) residual degrees of freedom
+years        : observed years (ints); t is measured from their mean
+kind / cap   : trend form and, for logistic, the upper bound"""
+
+Projection = namedtuple('Projection', 'years mean lower upper')
+Projection.__doc__ = """Projected rates: `years` (ints) and (n, n_years) arrays of the
+central projection and the lower/upper prediction bounds."""
+
+
+# ── Batched least squares ──────────────────────────────────────────────────────
+def batched_lstsq(X, y, mask=None):
+    """Least squares of every row at once.
+
+    X is (m, p), shared by all rows, or (n, m, p); y is (n, m). Masked-out or
+    NaN observations are dropped per row. Returns (coef (n, p), (X'X)⁻¹
+    (n, p, p), residual variance (n,), degrees of freedom (n,)). Rows with
+    too few observations get NaN.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    w = np.isfinite(y) if mask is None else np.asarray(mask, dtype=bool) & np.isfinite(y)
+    X = np.asarray(X, dtype=np.float64)
+    X = np.broadcast_to(X, y.shape + X.shape[-1:])
+    wy = np.where(w, y, 0.0)
+    G = np.einsum('nm,nmp,nmq->npq', w, X, X)
+    b = np.einsum('nmp,nm->np', X, wy)
+    p = X.shape[-1]
+    dof = w.sum(axis=1) - p
+    solvable = (dof >= 0) & (np.abs(np.linalg.det(G)) > 1e-12)
+    G[~solvable] = np.eye(p)                     # keeps the batch solvable; NaN below
+    G_inv = np.linalg.inv(G)
+    coef = np.einsum('npq,nq->np', G_inv, b)
+    resid = np.where(w, y - np.einsum('nmp,np->nm', X, coef), 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma2 = np.where(dof > 0, (resid ** 2).sum(axis=1) / np.maximum(dof, 1), np.nan)
+    coef[~solvable], G_inv[~solvable], sigma2[~solvable] = np.nan, np.nan, np.nan
+    return coef, G_inv, sigma2, dof
+
+
+def _t_quantile(level, dof):
+    """Two-sided Student-t quantiles for `dof` (normal without scipy)."""
+    q = 0.5 + level / 2
+    try:
+        from scipy.special import stdtrit   # far lighter than scipy.stats
+    except ImportError:
+        from statistics import NormalDist
+        return np.full(np.shape(dof), NormalDist().inv_cdf(q))
+    with np.errstate(invalid='ignore'):
+        return stdtrit(np.where(np.asarray(dof) > 0, dof, np.nan), q)
+
+
+# ── Trends over time ───────────────────────────────────────────────────────────
+def _design(years, centre):
+    t = np.asarray(years, dtype=np.float64) - centre
+    return np.column_stack([np.ones_like(t), t])
+
+
+def _to_fit_scale(Y, kind, cap):
+    if kind == 'linear':
+        return Y
+    share = np.clip(Y / cap, 1e-6, 1 - 1e-6)
+    return np.log(share / (1 - share))
+
+
+def _from_fit_scale(Z, kind, cap):
+    # Rates are never negative: a falling linear trend bottoms out at 0
+    return np.maximum(Z, 0.0) if kind == 'linear' else cap / (1 + np.exp(-Z))
+
+
+def fit_trends(Y, years, kind='linear', cap=CAP, min_sigma2=None):
+    """Trend of every row of the (n, n_years) array `Y` (NaN = not observed).
+
+    With three points and two parameters a row has one residual degree of
+    freedom, and a series that happens to lie on a line gets a residual
+    variance of 0, which would mean certain projections. Each row's variance
+    is therefore floored at `min_sigma2`, by default the lower quartile of
+    the residual variances of all rows fitted together.
+    """
+    if kind not in KINDS:
+        raise ValueError(f'Unknown trend kind {kind!r}; use one of {KINDS}')
+    years = [int(y) for y in years]
+    Z = _to_fit_scale(np.asarray(Y, dtype=np.float64), kind, cap)
+    coef, cov, sigma2, dof = batched_lstsq(_design(years, np.mean(years)), Z)
+    if min_sigma2 is None:
+        min_sigma2 = np.nanquantile(sigma2, 0.25) if np.isfinite(sigma2).any() else 0.0
+    sigma2 = np.maximum(sigma2, min_sigma2)   # NaN (no spare observation) stays NaN
+    return Fit(coef, cov, sigma2, dof, years, kind, cap)
+
+
+def project(fit, years=None, level=0.9, slope_scale=1.0):
+    """Projection of a Fit to `years` (default: the year after the last
+    observed one up to HORIZON) with `level` prediction intervals.
+
+    `slope_scale` multiplies every slope. An array of shape (s, 1) sweeps s
+    scenarios at once, and the projected arrays then have shape (s, n, n_years).
+    """
+    years = list(range(fit.years[-1] + 1, HORIZON + 1)) if years is None else [int(y) for y in years]
+    X = _design(years, np.mean(fit.years))                       # (h, 2)
+    scale = np.asarray(slope_scale, dtype=np.float64)[..., None]  # (…, 1, 1)
+    mean = fit.coef[:, :1] + scale * fit.coef[:, 1:] * X[:, 1]    # (…, n, h)
+    leverage = np.einsum('hp,npq,hq->nh', X, fit.cov_unscaled, X)
+    half = _t_quantile(level, fit.dof)[:, None] * np.sqrt(fit.sigma2[:, None] * (1 + leverage))
+    half = np.where(np.isfinite(half), half, np.nan)
+
+    def to_rate(z):
+        return _from_fit_scale(z, fit.kind, fit.cap)
+    return Projection(years, to_rate(mean), to_rate(mean - half), to_rate(mean + half))
+
+
+def fitted(fit, years=None):
+    """Trend values at the observed (or given) years, in rate units."""
+    X = _design(fit.years if years is None else [int(y) for y in years], np.mean(fit.years))
+    return _from_fit_scale(fit.coef @ X.T, fit.kind, fit.cap)
+
+
+def project_frame(df, prefix, kind='linear', to=HORIZON, level=0.9, cap=CAP, key='COUNTRY'):
+    """Projection columns <prefix><yy>, <prefix><yy>_lo and <prefix><yy>_hi
+    for the <prefix><yy> year columns of `df` (two-digit years, 20yy)."""
+    observed = sorted(c for c in df.columns if c.startswith(prefix) and c[len(prefix):].isdigit()
+                      and len(c) == len(prefix) + 2)
+    years = [2000 + int(c[len(prefix):]) for c in observed]
+    fit = fit_trends(df[observed].to_numpy(dtype=np.float64), years, kind, cap)
+    proj = project(fit, range(years[-1] + 1, int(to) + 1), level)
+    columns = {key: df[key].to_numpy()}
+    for k, year in enumerate(proj.years):
+        yy = f'{prefix}{year % 100:02d}'
+        columns.update({yy: proj.mean[:, k], f'{yy}_lo': proj.lower[:, k],
+                        f'{yy}_hi': proj.upper[:, k]})
+    return pd.DataFrame(columns, index=df.index)
+
+
+# ── Cross-sectional trend lines per group (chart 08) ──────────────────────────
+def group_trends(x, y, groups, labels):
+    """(slope, intercept) of y ~ x within each group of `labels`, fitted in
+    one batched solve over the groups' rows (padded and masked). None for a
+    group with fewer than two rows."""
+    x, y, groups = np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(groups)
+    order = np.argsort(groups, kind='stable')
+    uniques, starts, counts = np.unique(groups[order], return_index=True, return_counts=True)
+    rows = {g: order[s:s + c] for g, s, c in zip(uniques, starts, counts)}
+    width = max((len(rows.get(g, ())) for g in labels), default=0)
+    X = np.zeros((len(labels), max(width, 1), 2))
+    Y = np.full((len(labels), max(width, 1)), np.nan)
+    for i, g in enumerate(labels):
+        r = rows.get(g, np.array([], dtype=int))
+        X[i, :len(r), 0], X[i, :len(r), 1], Y[i, :len(r)] = 1.0, x[r], y[r]
+    coef = batched_lstsq(X, Y)[0]
+    return {g: (tuple(coef[i, ::-1]) if len(rows.get(g, ())) > 1 else None)
+            for i, g in enumerate(labels)}
+
+
+if __name__ == '__main__':
+    import time
+
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Project the rates of every country forward.')
+    parser.add_argument('--metric', default='ai', choices=['ai', 'unemployment'])
+    parser.add_argument('--kind', choices=KINDS, help='default: logistic for ai, linear otherwise')
+    parser.add_argument('--to', type=int, default=HORIZON, help='last projected year')
+    parser.add_argument('--level', type=float, default=0.9, help='prediction interval level')
+    parser.add_argument('--output', help='write the projections to this CSV file')
+    args = parser.parse_args()
+
+    kind = args.kind or ('logistic' if args.metric == 'ai' else 'linear')
+    table = datasets.cube.wide(args.metric)[datasets.YEARS]   # not the incomparable 2021 survey
+    start = time.perf_counter()
+    fit = fit_trends(table.to_numpy(), [int(y) for y in table.columns], kind)
+    proj = project(fit, range(fit.years[-1] + 1, args.to + 1), args.level)
+    elapsed = time.perf_counter() - start
+    out = pd.DataFrame({f'{y}': [f'{m:.1f} [{lo:.1f}, {hi:.1f}]' for m, lo, hi in
+                                 zip(proj.mean[:, k], proj.lower[:, k], proj.upper[:, k])]
+                        for k, y in enumerate(proj.years)}, index=table.index)
+    if args.output:
+        out.to_csv(args.output)
+    print(out.to_string())
+    print(f'{kind} trends of {len(table)} series, {len(proj.years)} projected years '
+          f'({args.level:.0%} intervals) in {elapsed * 1000:.1f} ms')
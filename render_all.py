@@ -0,0 +1,171 @@
+"""
+Batch renderer for the whole chart deck (01–09).
+Loads the config datasets once, then renders every chart script in config's
+headless render mode to image files in a single process, or across a forked worker pool that
+inherits the prepared frames copy-on-write. Charts whose inputs have not
+changed since the last run are copied from the render cache (chart_cache.py).
+
+Usage:
+    python render_all.py --output rendered/
+    python render_all.py --output rendered/ --workers 4 --format svg
+    python render_all.py --output rendered/ --data snapshots/2025Q3 snapshots/2025Q4
+    python render_all.py --output rendered/ --no-cache
+    python render_all.py --output rendered/2025Q2 --as-of 2025-06-30
+    python render_all.py --output rendered/clusters --grouping kmeans
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+
+import matplotlib.pyplot as plt
+
+import config
+import instrument
+from chart_cache import DEFAULT_CACHE_DIR, ChartCache, chart_key
+
+CHART_DIR     = os.path.dirname(os.path.abspath(__file__))
+CHART_SCRIPTS = sorted(glob.glob(os.path.join(CHART_DIR, '0[0-9]_*.py')))
+
+
+def chart_name(script):
+    """Return the chart name used for output files, e.g. '04_taxonomy_quadrants'."""
+    return os.path.splitext(os.path.basename(script))[0]
+
+
+def render_chart(script, output_dir, fmt='png', dpi=150):
+    """Run one chart script in config's render mode. Returns the written paths."""
+    config.configure_render(output_dir, fmt, dpi)
+    with instrument.stage('chart', chart=chart_name(script)):
+        runpy.run_path(script, run_name='__main__')
+    plt.close('all')
+    return [config.render_path(chart_name(script))]
+
+
+def _render_job(job):
+    """Pool entry point: render one chart and add it to the cache,
+    never raising across the process boundary."""
+    script, output_dir, fmt, dpi, cache_dir, key = job
+    start = time.perf_counter()
+    try:
+        paths = render_chart(script, output_dir, fmt, dpi)
+        if cache_dir is not None:
+            ChartCache(cache_dir).store(key, fmt, paths[0])
+        return chart_name(script), paths, None, time.perf_counter() - start, False
+    except Exception as exc:
+        return chart_name(script), [], f'{type(exc).__name__}: {exc}', time.perf_counter() - start, False
+    finally:
+        instrument.flush()   # pool workers exit without running atexit handlers
+
+
+def cache_key(script, fmt, dpi, year=None):
+    """chart_key of a chart under the current configuration: data folder,
+    vintage, grouping, projection and compact mode; `year` defaults to the
+    reference year."""
+    vintage = config.as_of_vintage()
+    return chart_key(script, config.DATA_PATH, fmt, dpi, year or config.REF_YEAR,
+                     '' if vintage is None else vintage['id'],
+                     config.GROUPING, config.PROJECT_TO or '', config.COMPACT)
+
+
+def render_snapshot(output_dir, scripts=CHART_SCRIPTS, fmt='png', dpi=150, workers=1,
+                    cache_dir=None):
+    """Render the given charts against the currently configured DATA_PATH.
+    With a `cache_dir`, charts whose inputs are unchanged are copied from the
+    cache, and the datasets are only loaded if something needs rendering."""
+    os.makedirs(output_dir, exist_ok=True)
+    results, jobs = [], []
+    for script in scripts:
+        key = None
+        if cache_dir is not None:
+            start = time.perf_counter()
+            key   = cache_key(script, fmt, dpi)
+            dest  = os.path.join(output_dir, f'{chart_name(script)}.{fmt}')
+            if ChartCache(cache_dir).fetch(key, fmt, dest):
+                results.append((chart_name(script), [dest], None, time.perf_counter() - start, True))
+                continue
+        jobs.append((script, output_dir, fmt, dpi, cache_dir, key))
+    if not jobs:
+        return results
+
+    config.load_datasets(config.deck_datasets())
+    # Forked workers share the already-parsed frames with the parent; on
+    # platforms without fork the deck is simply rendered serially.
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            return results + pool.map(_render_job, jobs)
+    return results + [_render_job(job) for job in jobs]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render all project charts to files.')
+    parser.add_argument('--output', default='rendered',
+                        help='output folder (one subfolder per snapshot when several --data are given)')
+    parser.add_argument('--data', nargs='+', default=[config.DATA_PATH],
+                        help='data folder(s) holding the database_*.csv files')
+    parser.add_argument('--as-of', help='render from the vintage released on or before this '
+                                        'date (YYYY-MM-DD) instead of the current CSVs')
+    parser.add_argument('--grouping', choices=('median',) + config.METHODS,
+                        help='strategic groups from the median split (default) or from '
+                             'clustering the country trajectories')
+    parser.add_argument('--project', type=int, metavar='YEAR',
+                        help='extend charts 01, 04 and 08 with trend projections up to YEAR')
+    parser.add_argument('--charts', nargs='+', default=None,
+                        help='chart prefixes to render, e.g. 01 04 (default: all)')
+    parser.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of forked render processes (default: 1, serial)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always re-render, bypassing the render cache')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--cache-max-mb', type=float, default=500,
+                        help='evict least recently used images beyond this size (default: 500)')
+    parser.add_argument('--cache-max-age-days', type=float, default=30,
+                        help='evict images older than this (default: 30)')
+    parser.add_argument('--trace', help='record stage timings to this file '
+                                        '(.json → Chrome trace, else JSON lines)')
+    parser.add_argument('--profile', help='dump a cProfile file per chart into this folder')
+    args = parser.parse_args(argv)
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.trace or args.profile:
+        instrument.enable(args.trace, args.profile)
+
+    scripts = CHART_SCRIPTS
+    if args.charts:
+        scripts = [s for s in CHART_SCRIPTS if chart_name(s).split('_')[0] in args.charts]
+
+    failures = 0
+    total = time.perf_counter()
+    for data_path in args.data:
+        config.set_data_path(data_path)
+        if args.as_of:
+            config.set_as_of(args.as_of)
+        if args.grouping:
+            config.set_grouping(args.grouping, workers=args.workers)
+        if args.project:
+            config.set_projection(args.project)
+        output_dir = args.output
+        if len(args.data) > 1:
+            output_dir = os.path.join(args.output, os.path.basename(os.path.normpath(data_path)))
+        for name, paths, error, elapsed, cached in render_snapshot(output_dir, scripts, args.format,
+                                                           args.dpi, args.workers, cache_dir):
+            if error:
+                failures += 1
+                print(f'  FAIL {name:<30} {error}', file=sys.stderr)
+            else:
+                status = 'hit ' if cached else 'ok  '
+                print(f'  {status} {name:<30} {elapsed:6.2f}s  {", ".join(paths)}')
+    if cache_dir is not None:
+        ChartCache(cache_dir).evict(max_bytes=args.cache_max_mb * 1024 * 1024,
+                                    max_age_days=args.cache_max_age_days)
+    print(f'Rendered {len(args.data)} snapshot(s) in {time.perf_counter() - total:.2f}s')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
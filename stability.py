@@ -0,0 +1,133 @@
+"""
+Monte Carlo stability of the strategic-group taxonomy.
+Eurostat's rates are survey estimates, so a country close to a median line
+may belong to a neighbouring group. Each simulation perturbs the AI adoption
+and unemployment rates under a noise model, recomputes the median thresholds
+(they are estimates too) and re-classifies every country. The share of
+simulations in which a country lands in each group is its membership
+probability. The most probable group gives the consensus taxonomy.
+
+Simulations run in fixed-size chunks, each with its own SeedSequence child
+stream. Results are therefore identical whatever the number of worker
+processes.
+
+Usage:
+    python stability.py                          # 10,000 simulations, shipped data
+    python stability.py --sims 100000 --workers 4 --ai-se 1.0 --un-se 0.3
+"""
+
+import argparse
+import multiprocessing
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from taxonomy import GROUPS, classify, year_suffixes
+
+# Standard errors of the rates. Absolute ones are in percentage points;
+# relative ones are fractions of each rate (e.g. 0.05 = 5% of the value).
+# Either may also be an array with one value per row.
+NoiseModel = namedtuple('NoiseModel', 'ai_se un_se relative', defaults=(1.0, 0.3, False))
+
+Stability = namedtuple('Stability', 'probabilities consensus point n_sims')
+
+CHUNK_SIMS = 2000   # simulations per task and per random stream
+
+
+def _chunk_counts(task):
+    """Group counts (n_rows, 4) over one chunk of simulations."""
+    ai, un, noise, sims, seed, fixed = task
+    rng = np.random.default_rng(seed)
+    ai_sd = np.asarray(noise.ai_se, dtype=float) * (ai if noise.relative else 1.0)
+    un_sd = np.asarray(noise.un_se, dtype=float) * (un if noise.relative else 1.0)
+    ai_sim = np.maximum(ai + rng.standard_normal((sims, len(ai))) * ai_sd, 0.0)
+    un_sim = np.maximum(un + rng.standard_normal((sims, len(un))) * un_sd, 0.0)
+    if fixed is None:
+        ai_thr = np.median(ai_sim, axis=1, keepdims=True)
+        un_thr = np.median(un_sim, axis=1, keepdims=True)
+    else:
+        ai_thr, un_thr = fixed
+    labels = classify(ai_sim, un_sim, ai_thr, un_thr)
+    return np.stack([(labels == g).sum(axis=0) for g in GROUPS], axis=1)
+
+
+def simulate(df, year=None, noise=NoiseModel(), n_sims=10000, seed=0, workers=1,
+             fixed_thresholds=False, key='COUNTRY'):
+    """Membership probabilities for the ai<yy>/un<yy> rates of `df`.
+
+    `year` is the two-digit suffix (default: the latest). With
+    `fixed_thresholds` the observed medians are kept instead of being
+    recomputed in every simulation. Returns a Stability tuple indexed by `key`.
+    """
+    year = year or year_suffixes(df)[-1]
+    ai = df[f'ai{year}'].to_numpy(dtype=float)
+    un = df[f'un{year}'].to_numpy(dtype=float)
+    ai_med, un_med = np.median(ai), np.median(un)
+    fixed = (ai_med, un_med) if fixed_thresholds else None
+
+    sizes = [CHUNK_SIMS] * (n_sims // CHUNK_SIMS)
+    if n_sims % CHUNK_SIMS:
+        sizes.append(n_sims % CHUNK_SIMS)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(ai, un, noise, size, s, fixed) for size, s in zip(sizes, seeds)]
+
+    # Forked workers receive only the small rate vectors; each task returns a
+    # (n_rows, 4) count table, so nothing large crosses the process boundary.
+    if workers > 1 and len(tasks) > 1:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with context.Pool(workers) as pool:
+            counts = sum(pool.imap_unordered(_chunk_counts, tasks))
+    else:
+        counts = sum(_chunk_counts(task) for task in tasks)
+
+    index = pd.Index(df[key].astype(str), name=key)
+    probabilities = pd.DataFrame(counts / n_sims, index=index, columns=list(GROUPS))
+    point = pd.Series(classify(ai, un, ai_med, un_med), index=index, name='point')
+    consensus = pd.Series(GROUPS[np.argmax(counts, axis=1)], index=index, name='consensus')
+    return Stability(probabilities, consensus, point, n_sims)
+
+
+def summary(result):
+    """One row per country: point group, consensus group, its probability,
+    and whether the country is unstable (point and consensus disagree)."""
+    probs = result.probabilities
+    table = pd.DataFrame({'point': result.point, 'consensus': result.consensus,
+                          'p_consensus': probs.max(axis=1),
+                          'p_point': probs.to_numpy()[np.arange(len(probs)),
+                                                      np.searchsorted(GROUPS, result.point)]})
+    table['unstable'] = table['point'] != table['consensus']
+    return table.join(probs).sort_values('p_point')
+
+
+if __name__ == '__main__':
+    import time
+
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Monte Carlo stability of the taxonomy.')
+    parser.add_argument('--sims', type=int, default=10000, help='number of simulations')
+    parser.add_argument('--ai-se', type=float, default=1.0, help='AI adoption standard error')
+    parser.add_argument('--un-se', type=float, default=0.3, help='unemployment standard error')
+    parser.add_argument('--relative', action='store_true',
+                        help='standard errors are fractions of each rate, not points')
+    parser.add_argument('--fixed-thresholds', action='store_true',
+                        help='keep the observed medians instead of re-estimating them')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the per-country table to this CSV file')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    noise = NoiseModel(args.ai_se, args.un_se, args.relative)
+    result = simulate(datasets.merged, datasets.REF, noise, args.sims, args.seed,
+                      args.workers, args.fixed_thresholds)
+    elapsed = time.perf_counter() - start
+    table = summary(result)
+    if args.output:
+        table.to_csv(args.output)
+    with pd.option_context('display.width', 160, 'display.float_format', '{:.3f}'.format):
+        print(table.to_string())
+    print(f'{table["unstable"].sum()} of {len(table)} countries change group under noise; '
+          f'{args.sims} simulations in {elapsed:.2f}s')
@@ -0,0 +1,88 @@
+"""
+Vectorized strategic-group classification.
+A country (or region) falls into one of four groups depending on whether its
+AI adoption and unemployment rates are above or below a threshold:
+
+    A  High AI · High Unemployment   (Technological Vanguard)
+    B  Low AI  · High Unemployment   (Structural Lag)
+    C  Low AI  · Low Unemployment    (Traditional Resilience)
+    D  High AI · Low Unemployment    (Digital Frontier)
+
+Everything works on whole arrays: any number of rows, years and threshold
+scenarios are classified in one np.select call.
+"""
+
+import numpy as np
+import pandas as pd
+
+GROUPS = np.array(['A', 'B', 'C', 'D'])
+
+
+def classify(ai, un, ai_threshold, un_threshold):
+    """Group labels for arrays of AI and unemployment rates.
+
+    Inputs broadcast against each other, so thresholds may be scalars, one
+    per year (shape (n_years,) against (n_rows, n_years) rates), one per row
+    (per-group thresholds), or carry a leading scenario axis.
+    """
+    high_ai = np.asarray(ai) >= ai_threshold
+    high_un = np.asarray(un) >= un_threshold
+    return np.select([high_ai & high_un, ~high_ai & high_un, ~high_ai & ~high_un],
+                     GROUPS[:3], default=GROUPS[3])
+
+
+def year_suffixes(df):
+    """Two-digit years present as ai<yy>/un<yy> column pairs, e.g. ['23', '24', '25']."""
+    return [c[2:] for c in df.columns
+            if c.startswith('ai') and c[2:].isdigit() and f'un{c[2:]}' in df.columns]
+
+
+def _statistic(values, stat):
+    """Column-wise threshold statistic: 'median', 'mean' or a percentile (0–100)."""
+    if stat == 'median':
+        return np.nanmedian(values, axis=0)
+    if stat == 'mean':
+        return np.nanmean(values, axis=0)
+    return np.nanpercentile(values, float(stat), axis=0)
+
+
+def thresholds(df, years=None, stat='median', by=None):
+    """AI and unemployment thresholds per year.
+
+    Returns two arrays (ai, un) of shape (n_years,), or (n_rows, n_years) when
+    `by` names a column whose groups each get their own thresholds.
+    """
+    years = years or year_suffixes(df)
+    ai = df[[f'ai{y}' for y in years]].to_numpy(dtype=float)
+    un = df[[f'un{y}' for y in years]].to_numpy(dtype=float)
+    if by is None:
+        return _statistic(ai, stat), _statistic(un, stat)
+
+    codes, uniques = pd.factorize(df[by])
+    ai_thr = np.empty((len(uniques), len(years)))
+    un_thr = np.empty((len(uniques), len(years)))
+    order  = np.argsort(codes, kind='stable')
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    for rows in np.split(order, bounds):
+        ai_thr[codes[rows[0]]] = _statistic(ai[rows], stat)
+        un_thr[codes[rows[0]]] = _statistic(un[rows], stat)
+    return ai_thr[codes], un_thr[codes]
+
+
+def classify_years(df, years=None, stat='median', by=None, reference=None):
+    """Group labels for every year pair (ai23/un23 … ai25/un25) in one pass.
+
+    `stat` is 'median', 'mean' or a percentile; `by` gives per-group
+    thresholds; `reference` (e.g. '25') compares every year against that
+    year's thresholds instead of its own. Returns a frame with one
+    `group<yy>` column per year, aligned with `df`.
+    """
+    years = years or year_suffixes(df)
+    ai = df[[f'ai{y}' for y in years]].to_numpy(dtype=float)
+    un = df[[f'un{y}' for y in years]].to_numpy(dtype=float)
+    ai_thr, un_thr = thresholds(df, years, stat, by)
+    if reference is not None:
+        k = years.index(reference)
+        ai_thr, un_thr = ai_thr[..., k:k + 1], un_thr[..., k:k + 1]
+    labels = classify(ai, un, ai_thr, un_thr)
+    return pd.DataFrame(labels, index=df.index, columns=[f'group{y}' for y in years])
@@ -0,0 +1,303 @@
+"""
+Phase 3 (interactive): the strategic taxonomy scrubbed through the years.
+The quadrant chart (chart 04) for every year in YEARS, with interpolated
+frames in between. The countries, their labels, the median lines and the
+quadrant shading move to each frame's positions, and the points are
+recoloured by the group they fall in at that moment.
+
+Only the moving artists are redrawn. They are marked animated and updated in
+place (offsets, colours, line data, rectangle bounds), then blitted over a
+cached background. Exporting an animation runs the same update path on an
+off-screen Agg canvas and streams each frame buffer to the GIF or MP4
+encoder, so no frame is rendered from scratch.
+
+Usage:
+    python taxonomy_scrubber.py                          # ←/→ step, Home/End, click or drag the timeline
+    python taxonomy_scrubber.py --export taxonomy.gif --steps 12 --fps 12
+    python taxonomy_scrubber.py --export taxonomy.mp4    # needs ffmpeg on PATH
+"""
+
+import argparse
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+from matplotlib.colors import to_rgba_array
+from matplotlib.patches import Patch, Rectangle
+
+from config import BG, C1, C2, C5, GROUP_COLORS, GROUP_NAMES, WHITE, labelled_points
+from taxonomy import GROUPS, classify, thresholds
+
+STEPS_PER_YEAR = 12   # interpolated frames from one year to the next
+
+
+def frame_times(n_years, steps=STEPS_PER_YEAR):
+    """Fractional year positions 0 … n_years-1 with `steps` frames per interval."""
+    return np.linspace(0, n_years - 1, (n_years - 1) * steps + 1)
+
+
+class TaxonomyScrubber:
+    """Quadrant chart whose moving artists are updated in place for a
+    fractional year position `t` (0 = first year, 1 = second, …)."""
+
+    def __init__(self, fig, df, years, timeline=True):
+        self.fig   = fig
+        self.years = list(years)
+        sfx        = [y[2:] for y in self.years]
+        self.points = np.stack([df[[f'ai{s}' for s in sfx]].to_numpy(dtype=float),
+                                df[[f'un{s}' for s in sfx]].to_numpy(dtype=float)], axis=-1)
+        self.points = self.points.transpose(1, 0, 2)   # (n_years, n_rows, 2)
+        self.medians = np.stack(thresholds(df, sfx), axis=-1)   # (n_years, 2)
+        self.colors  = to_rgba_array([GROUP_COLORS[g] for g in GROUPS])
+        self.t = float(len(self.years) - 1)
+
+        xmax = max(50.0, np.nanmax(self.points[..., 0]) * 1.05)
+        ymax = max(16.0, np.nanmax(self.points[..., 1]) * 1.05)
+        self.xmax, self.ymax = xmax, ymax
+
+        ax = self.ax = fig.add_axes([0.06, 0.15, 0.91, 0.74] if timeline else [0.06, 0.08, 0.91, 0.81])
+        ax.set_facecolor(BG)
+        ax.set_xlim(0, xmax)
+        ax.set_ylim(0, ymax)
+        ax.set_xlabel('AI Adoption Rate (%)', fontweight='bold', color=C2, fontsize=11, labelpad=10)
+        ax.set_ylabel('Unemployment Rate (%)', fontweight='bold', color=C2, fontsize=11, labelpad=10)
+        ax.grid(True, linestyle=':', alpha=0.20)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        fig.suptitle('STRATEGIC TAXONOMY', fontsize=14, fontweight='bold', color=C1)
+        # Legend above the plot, clear of the moving shading, so it stays static
+        patches = [Patch(color=GROUP_COLORS[g], label=f'Group {g}: {GROUP_NAMES[g]}') for g in GROUPS]
+        ax.legend(handles=patches, loc='lower center', bbox_to_anchor=(0.5, 1.0), ncol=4,
+                  fontsize=9, frameon=False)
+
+        # ── Moving artists ─────────────────────────────────────────────────────
+        alphas = {'A': 0.12, 'B': 0.10, 'C': 0.09, 'D': 0.09}
+        self.quadrants = {g: ax.add_patch(Rectangle((0, 0), 0, 0, color=GROUP_COLORS[g],
+                                                    alpha=alphas[g], linewidth=0))
+                          for g in GROUPS}
+        self.vline = ax.axvline(0, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
+        self.hline = ax.axhline(0, color=C2, linewidth=1.5, linestyle='--', alpha=0.5)
+        label_kw = {'fontsize': 9.5, 'fontweight': 'bold'}
+        self.group_labels = {
+            'A': ax.text(0, ymax * 0.956, 'GROUP A: TECHNOLOGICAL VANGUARD\nHigh AI · High Unemployment',
+                         color=GROUP_COLORS['A'], **label_kw),
+            'D': ax.text(0, ymax * 0.031, 'GROUP D: DIGITAL FRONTIER\nHigh AI · Low Unemployment',
+                         color=GROUP_COLORS['D'], **label_kw),
+        }
+        ax.text(0.8, ymax * 0.956, 'GROUP B: STRUCTURAL LAG\nLow AI · High Unemployment',
+                color=GROUP_COLORS['B'], **label_kw)
+        ax.text(0.8, ymax * 0.031, 'GROUP C: TRADITIONAL RESILIENCE\nLow AI · Low Unemployment',
+                color=GROUP_COLORS['C'], **label_kw)
+        self.scatter = ax.scatter(*self.points[-1].T, s=160, edgecolors=WHITE, linewidth=1.5,
+                                  zorder=10, alpha=0.95)
+        names = df['COUNTRY'].astype(str).to_numpy()
+        self.labelled = labelled_points(*self.points[-1].T)
+        self.annotations = [ax.annotate(names[i], tuple(self.points[-1, i]), xytext=(5, 5),
+                                        textcoords='offset points', fontsize=8.5, color=C2,
+                                        fontweight='bold', zorder=11)
+                            for i in self.labelled]
+        self.year_text = ax.text(0.99, 0.97, '', transform=ax.transAxes, ha='right', va='top',
+                                 fontsize=22, fontweight='bold', color=C1, alpha=0.6)
+        self.artists = (list(self.quadrants.values()) + [self.vline, self.hline]
+                        + list(self.group_labels.values()) + [self.scatter]
+                        + self.annotations + [self.year_text])
+
+        # ── Timeline (a slider drawn with plain artists so it can be blitted) ───
+        self.timeline = None
+        if timeline:
+            tl = self.timeline = fig.add_axes([0.06, 0.035, 0.91, 0.03])
+            tl.set_xlim(0, len(self.years) - 1)
+            tl.set_ylim(0, 1)
+            tl.set_yticks([])
+            tl.set_xticks(range(len(self.years)), self.years)
+            tl.tick_params(colors=C2)
+            for spine in tl.spines.values():
+                spine.set_color(C2)
+            self.progress = tl.add_patch(Rectangle((0, 0), 0, 1, color=C5, alpha=0.8))
+            self.artists.append(self.progress)
+
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.update(self.t)
+
+    # ── Frame update ───────────────────────────────────────────────────────────
+    def state(self, t):
+        """Interpolated (points, medians) at fractional year position `t`."""
+        i = min(int(np.floor(t)), len(self.years) - 2) if len(self.years) > 1 else 0
+        f = t - i
+        if len(self.years) == 1:
+            return self.points[0], self.medians[0]
+        return ((1 - f) * self.points[i] + f * self.points[i + 1],
+                (1 - f) * self.medians[i] + f * self.medians[i + 1])
+
+    def update(self, t):
+        """Move every animated artist to position `t`; returns them for blitting."""
+        self.t = t = float(np.clip(t, 0, len(self.years) - 1))
+        pts, (ai_med, un_med) = self.state(t)
+        groups = classify(pts[:, 0], pts[:, 1], ai_med, un_med)
+        self.scatter.set_offsets(pts)
+        self.scatter.set_facecolors(self.colors[np.searchsorted(GROUPS, groups)])
+        for ann, i in zip(self.annotations, self.labelled):
+            ann.xy = tuple(pts[i])
+        self.vline.set_xdata([ai_med, ai_med])
+        self.hline.set_ydata([un_med, un_med])
+        xmax, ymax = self.xmax, self.ymax
+        self.quadrants['A'].set_bounds(ai_med, un_med, xmax - ai_med, ymax - un_med)
+        self.quadrants['B'].set_bounds(0, un_med, ai_med, ymax - un_med)
+        self.quadrants['C'].set_bounds(0, 0, ai_med, un_med)
+        self.quadrants['D'].set_bounds(ai_med, 0, xmax - ai_med, un_med)
+        self.group_labels['A'].set_x(ai_med + 0.8)
+        self.group_labels['D'].set_x(ai_med + 0.8)
+        i = int(round(t))
+        if abs(t - i) < 1e-9:
+            self.year_text.set_text(self.years[i])
+        else:
+            lo = int(np.floor(t))
+            self.year_text.set_text(f'{self.years[lo]} → {self.years[lo + 1]}')
+        if self.timeline is not None:
+            self.progress.set_width(t)
+        return self.artists
+
+    # ── Interactive blitting ───────────────────────────────────────────────────
+    def connect(self, steps=STEPS_PER_YEAR):
+        """Hook keyboard and timeline events to blitted redraws."""
+        canvas = self.fig.canvas
+        self.step = 1.0 / steps
+        self.background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('key_press_event', self._on_key)
+        canvas.mpl_connect('button_press_event', self._on_mouse)
+        canvas.mpl_connect('motion_notify_event', self._on_mouse)
+
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def _blit(self):
+        canvas = self.fig.canvas
+        if self.background is None or not canvas.supports_blit:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self.background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def _on_key(self, event):
+        last = len(self.years) - 1
+        moves = {'right': self.t + self.step, 'left': self.t - self.step,
+                 'up': np.floor(self.t + 1 + 1e-9), 'down': np.ceil(self.t - 1 - 1e-9),
+                 'home': 0, 'end': last}
+        if event.key in moves:
+            self.update(moves[event.key])
+            self._blit()
+
+    def _on_mouse(self, event):
+        if event.inaxes is not self.timeline or event.button != 1 or event.xdata is None:
+            return
+        self.update(event.xdata)
+        self._blit()
+
+
+# ── Animation export ───────────────────────────────────────────────────────────
+def render_frames(df, years, steps=STEPS_PER_YEAR, dpi=100, hold=None):
+    """Yield RGBA frames (uint8 arrays) of the scrub from the first year to the
+    last, each year held for `hold` extra frames (default: `steps` // 2).
+    A frame is a view of the canvas buffer, valid until the next one is drawn;
+    held frames are the same object repeated."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(14, 9), dpi=dpi, facecolor=BG)
+    canvas = FigureCanvasAgg(fig)
+    scrub = TaxonomyScrubber(fig, df, years, timeline=False)
+    canvas.draw()   # static layers only: the moving artists are animated
+    background = canvas.copy_from_bbox(fig.bbox)
+    hold = steps // 2 if hold is None else hold
+    for t in frame_times(len(years), steps):
+        canvas.restore_region(background)
+        for artist in scrub.update(t):
+            fig.draw_artist(artist)
+        frame = np.asarray(canvas.buffer_rgba())
+        for _ in range(1 + (hold if abs(t - round(t)) < 1e-9 else 0)):
+            yield frame
+
+
+def _write_gif(path, frames, fps):
+    from PIL import Image
+    images, last = [], None
+    for frame in frames:
+        if frame is not last:   # held frames are encoded once
+            image = Image.fromarray(frame[..., :3]).quantize(colors=255,
+                                                              method=Image.Quantize.FASTOCTREE)
+            last = frame
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=int(1000 / fps), loop=0, optimize=False)
+
+
+def _write_mp4(path, frames, fps):
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise RuntimeError('MP4 export needs ffmpeg on PATH; export a .gif instead')
+    proc = None
+    for frame in frames:
+        if proc is None:
+            h, w = frame.shape[:2]
+            proc = subprocess.Popen(
+                [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                 '-s', f'{w}x{h}', '-r', str(fps), '-i', '-',
+                 '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+                stdin=subprocess.PIPE)
+        proc.stdin.write(frame.tobytes())
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError(f'ffmpeg failed writing {path}')
+
+
+def export_animation(path, df, years, steps=STEPS_PER_YEAR, fps=12, dpi=100):
+    """Write the scrub as a .gif or .mp4 animation."""
+    frames = render_frames(df, years, steps, dpi)
+    if path.lower().endswith('.gif'):
+        _write_gif(path, frames, fps)
+    elif path.lower().endswith('.mp4'):
+        _write_mp4(path, frames, fps)
+    else:
+        raise ValueError(f'Unsupported animation format for {path!r}; use .gif or .mp4')
+    return path
+
+
+def main(argv=None):
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Scrub the strategic taxonomy through the years.')
+    parser.add_argument('--export', help='write a .gif or .mp4 animation instead of opening a window')
+    parser.add_argument('--steps', type=int, default=STEPS_PER_YEAR,
+                        help=f'interpolated frames per year (default: {STEPS_PER_YEAR})')
+    parser.add_argument('--fps', type=int, default=12)
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    merged = datasets.merged
+    if args.export:
+        export_animation(args.export, merged, datasets.YEARS, args.steps, args.fps, args.dpi)
+        print(f'Wrote {args.export}')
+        return 0
+
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(14, 9), facecolor=BG)
+    fig.canvas.manager.set_window_title('Chart 4 — Country Taxonomy: Year Scrubber')
+    scrub = TaxonomyScrubber(fig, merged, datasets.YEARS)
+    scrub.connect(args.steps)
+    plt.show()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Reusable chart scaffolding.
+Styling helpers shared by the panel charts (05, 08), and a ChartTemplate base
+class for per-entity small multiples such as one profile card per country or
+region. A template builds its figure, axes and static decoration once. The
+artists that carry an entity's data are created once and updated in place
+for each entity. PNG images are rendered by restoring the cached static
+background and drawing only those artists.
+"""
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from config import BG, C2, WHITE
+
+
+# ── Panel styling ──────────────────────────────────────────────────────────────
+def style_axes(ax, grid_axis='both', grid_alpha=0.20):
+    """Project look for a panel: BG face, no top/right spines, dotted grid."""
+    ax.set_facecolor(BG)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, axis=grid_axis, linestyle=':', alpha=grid_alpha)
+
+
+def panel_title(ax, text, color, fontsize=11):
+    """Bold title in the top-left corner of a panel."""
+    return ax.text(0.02, 0.99, text, transform=ax.transAxes, fontsize=fontsize,
+                   fontweight='bold', color=color, va='top', ha='left')
+
+
+def stats_box(ax, text, fontsize=8.5):
+    """Boxed summary text in the top-right corner of a panel."""
+    return ax.text(0.98, 0.99, text, transform=ax.transAxes, fontsize=fontsize,
+                   va='top', ha='right', color=C2, fontweight='bold',
+                   bbox=dict(boxstyle='round,pad=0.45', facecolor=WHITE,
+                             edgecolor=C2, alpha=0.85))
+
+
+# ── Per-entity templates ───────────────────────────────────────────────────────
+class ChartTemplate:
+    """Figure built once and re-filled for each entity.
+
+    Subclasses implement `build()`, which draws the static scaffolding and
+    returns the artists that change per entity, and `fill(item)`, which moves
+    one entity's data into those artists. The axis limits must not depend on
+    the entity, so that the static background can be reused.
+    """
+
+    figsize = (12, 5)
+    dpi     = 100
+
+    def __init__(self, dpi=None):
+        self.fig = Figure(figsize=self.figsize, dpi=dpi or self.dpi, facecolor=BG)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.dynamic = list(self.build())
+        for artist in self.dynamic:
+            artist.set_animated(True)
+        self._background = None
+
+    def build(self):
+        raise NotImplementedError
+
+    def fill(self, item):
+        raise NotImplementedError
+
+    def render(self, item, path, fmt='png'):
+        """Fill the template with `item` and write it to `path`."""
+        self.fill(item)
+        if fmt != 'png':
+            # Vector formats need a full draw; animated artists are skipped by it
+            for artist in self.dynamic:
+                artist.set_animated(False)
+            try:
+                self.fig.savefig(path, format=fmt)
+            finally:
+                for artist in self.dynamic:
+                    artist.set_animated(True)
+            return path
+        if self._background is None:
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        else:
+            self.canvas.restore_region(self._background)
+        for artist in self.dynamic:
+            self.fig.draw_artist(artist)
+        from PIL import Image
+        Image.fromarray(np.asarray(self.canvas.buffer_rgba())).save(path, format='png')
+        return path
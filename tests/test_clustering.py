@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from clustering import cluster_trajectories, synthetic_trajectories
+
+
+def _same_partition(a, b):
+    pairs = set(zip(a, b))
+    return len(pairs) == len(set(a)) == len(set(b))
+
+
+@pytest.mark.parametrize('method', ['kmeans', 'minibatch'])
+def test_warm_start_from_own_result_keeps_the_clusters(method):
+    df = synthetic_trajectories(300, seed=3)
+    cold = cluster_trajectories(df, method, batch_size=64)
+    warm = cluster_trajectories(df, method, previous=cold, batch_size=64)
+    assert _same_partition(cold.labels.to_numpy(), warm.labels.to_numpy())
+    assert warm.inertia <= cold.inertia * 1.01
+
+
+def test_warm_start_on_new_rows():
+    cold = cluster_trajectories(synthetic_trajectories(300, seed=3), 'kmeans')
+    new = synthetic_trajectories(360, seed=4)
+    warm = cluster_trajectories(new, 'kmeans', previous=cold)
+    assert len(warm.labels) == 360
+    assert sorted(warm.groups.unique()) == ['A', 'B', 'C', 'D']
+
+
+def test_restarts_match_for_any_worker_count():
+    df = synthetic_trajectories(200, seed=5)
+    one = cluster_trajectories(df, 'kmeans', workers=1)
+    two = cluster_trajectories(df, 'kmeans', workers=2)
+    np.testing.assert_array_equal(one.labels, two.labels)
+
+
+@pytest.mark.parametrize('method', ['kmeans', 'minibatch', 'hierarchical'])
+def test_fewer_rows_than_clusters_is_an_error(method):
+    with pytest.raises(ValueError, match='cannot form 4 clusters'):
+        cluster_trajectories(synthetic_trajectories(3), method)
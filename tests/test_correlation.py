@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from correlation import bootstrap, kendall, pearson, rankdata, spearman
+
+stats = pytest.importorskip('scipy.stats')
+
+SCIPY = {'pearson':  lambda x, y: stats.pearsonr(x, y)[0],
+         'spearman': lambda x, y: stats.spearmanr(x, y)[0],
+         'kendall':  lambda x, y: stats.kendalltau(x, y)[0]}
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(4, 27)).round(1)            # rounding leaves ties
+    y = (0.5 * x + rng.normal(size=(4, 27))).round(1)
+    return x, y
+
+
+def test_rankdata_averages_ties():
+    from scipy.stats import rankdata as scipy_rankdata
+    a = np.array([[3.0, 1.0, 3.0, 2.0, 3.0], [1.0, 1.0, 1.0, 1.0, 0.0]])
+    np.testing.assert_array_equal(rankdata(a), scipy_rankdata(a, axis=-1))
+
+
+@pytest.mark.parametrize('name, fn', [('pearson', pearson), ('spearman', spearman),
+                                      ('kendall', kendall)])
+def test_coefficients_match_scipy(samples, name, fn):
+    x, y = samples
+    expected = [SCIPY[name](a, b) for a, b in zip(x, y)]
+    np.testing.assert_allclose(fn(x, y), expected, rtol=1e-10)
+
+
+def test_constant_side_gives_nan():
+    x, y = np.ones((1, 5)), np.arange(5.0)[None]
+    for fn in (pearson, spearman, kendall):
+        assert np.isnan(fn(x, y)).all()
+
+
+def test_bootstrap_matches_scipy_replicates(samples):
+    x, y = samples
+    n_boot, level = 200, 0.9
+    result = bootstrap(x, y, n_boot=n_boot, level=level, rng=7)
+    idx = np.random.default_rng(7).integers(0, x.shape[-1], size=(n_boot, x.shape[-1]))
+    for method, fn in SCIPY.items():
+        r, low, high = result[method]
+        for k in range(len(x)):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                reps = [fn(x[k, rows], y[k, rows]) for rows in idx]
+            expected = np.nanpercentile(reps, [5, 95])
+            assert r[k] == pytest.approx(fn(x[k], y[k]), rel=1e-10)
+            np.testing.assert_allclose([low[k], high[k]], expected, rtol=1e-10)
+
+
+def test_bootstrap_is_reproducible(samples):
+    x, y = samples
+    first, second = bootstrap(x, y, n_boot=50, rng=3), bootstrap(x, y, n_boot=50, rng=3)
+    for method in first:
+        np.testing.assert_array_equal(np.array(first[method]), np.array(second[method]))
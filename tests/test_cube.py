@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cube
+import datasets
+
+
+def _merge_rates(df_ia, df_emp, years):
+    # The pd.merge build of `merged` that cube.rates() replaced
+    merged = pd.merge(df_ia[['COUNTRY'] + years], df_emp[['COUNTRY'] + years],
+                      on='COUNTRY', suffixes=('_ai', '_unemp')).dropna()
+    merged.columns = (['COUNTRY'] + [f'ai{y[2:]}' for y in years]
+                      + [f'un{y[2:]}' for y in years])
+    return merged
+
+
+def _youth(df_age, year):
+    return (df_age[df_age['AGE'].str.contains('Less')][['COUNTRY', year]]
+            .rename(columns={year: f'youth{year[2:]}'}))
+
+
+@pytest.fixture
+def shipped():
+    datasets.clear_datasets()
+    yield datasets
+    datasets.set_compact(False)
+
+
+def test_merged_matches_pandas_merge(shipped):
+    years = shipped.YEARS
+    expected = _merge_rates(shipped.df_ia, shipped.df_emp, years)
+    merged = shipped.merged
+    assert merged['COUNTRY'].tolist() == expected['COUNTRY'].tolist()
+    assert merged.index.tolist() == expected.index.tolist()
+    rates = expected.columns[1:]
+    np.testing.assert_array_equal(merged[rates].to_numpy(), expected[rates].to_numpy())
+
+
+def test_merged2_matches_pandas_merge(shipped):
+    expected = pd.merge(shipped.merged, _youth(shipped.df_age, shipped.REF_YEAR), on='COUNTRY')
+    merged2 = shipped.merged2
+    assert merged2['COUNTRY'].tolist() == expected['COUNTRY'].tolist()
+    assert merged2['group'].tolist() == expected['group'].tolist()
+    column = f'youth{shipped.REF}'
+    np.testing.assert_array_equal(merged2[column].to_numpy(), expected[column].to_numpy())
+
+
+@pytest.mark.parametrize('year', datasets.YEARS)
+def test_youth_matches_age_rows(shipped, year):
+    expected = _youth(shipped.df_age, year)
+    youth = cube.youth(shipped.cube, year)
+    assert youth['COUNTRY'].tolist() == expected['COUNTRY'].tolist()
+    np.testing.assert_array_equal(youth[f'youth{year[2:]}'].to_numpy(),
+                                  expected[f'youth{year[2:]}'].to_numpy())
+
+
+def test_compact_rates_are_float32_copies(shipped):
+    full = shipped.merged.copy()
+    shipped.set_compact(True)
+    compact = shipped.merged
+    assert isinstance(compact['COUNTRY'].dtype, pd.CategoricalDtype)
+    assert compact['COUNTRY'].astype(str).tolist() == full['COUNTRY'].tolist()
+    assert compact['ai25'].dtype == np.float32
+    np.testing.assert_allclose(compact['ai25'], full['ai25'], rtol=1e-6)
+
+
+# ── Synthetic tables: gaps, extra years and geos on one side only ─────────────
+@pytest.fixture
+def tables():
+    df_ia = pd.DataFrame({'COUNTRY': ['P', 'Q', 'R', 'S', 'T'],
+                          '2021': [1.0, 2.0, np.nan, 4.0, 5.0],
+                          '2023': [2.0, 3.0, 4.0, np.nan, 6.0],
+                          '2024': [3.0, 4.0, 5.0, 6.0, 7.0]})
+    df_emp = pd.DataFrame({'COUNTRY': ['T', 'R', 'Q', 'P', 'U'],
+                           '2023': [9.0, 8.0, 7.0, 6.0, 5.0],
+                           '2024': [8.0, 7.0, np.nan, 5.0, 4.0]})
+    df_age = pd.DataFrame({'COUNTRY': ['P', 'P', 'Q', 'Q'],
+                           'AGE': ['Less than 25 years', 'From 25 to 74 years'] * 2,
+                           '2023': [20.0, 5.0, 15.0, 4.0],
+                           '2024': [21.0, 6.0, 14.0, 3.0]})
+    df_ia_eu = pd.DataFrame({'Country': ['Europe'], '2023': [4.0], '2024': [5.0]})
+    df_emp_eu = pd.DataFrame({'COUNTRY': ['EU'], '2023': [6.0], '2024': [6.0]})
+    Source, eu = cube.Source, {'geo': cube.EU_GEO}
+    built = cube.build([Source(df_ia, 'ai', {'geo': 'COUNTRY'}),
+                        Source(df_emp, 'unemployment', {'geo': 'COUNTRY'}),
+                        Source(df_age, 'unemployment', {'geo': 'COUNTRY', 'age': 'AGE'}),
+                        Source(df_ia_eu, 'ai', fixed=eu),
+                        Source(df_emp_eu, 'unemployment', fixed=eu)])
+    return built, df_ia, df_emp, df_age
+
+
+def test_rates_match_inner_merge_and_dropna(tables):
+    built, df_ia, df_emp, _ = tables
+    years = ['2023', '2024']
+    expected = _merge_rates(df_ia, df_emp, years)
+    rates = cube.rates(built, required=years)
+    assert rates.columns.tolist() == expected.columns.tolist()
+    assert rates['COUNTRY'].tolist() == expected['COUNTRY'].tolist() == ['P', 'R', 'T']
+    assert rates.index.tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(rates.iloc[:, 1:].to_numpy(), expected.iloc[:, 1:].to_numpy())
+
+
+def test_rates_keep_gaps_outside_the_required_years(tables):
+    built = tables[0]
+    assert cube.rates(built, required=['2024'])['COUNTRY'].tolist() == ['P', 'R', 'T']
+    rates = cube.rates(built)
+    assert rates['COUNTRY'].tolist() == ['P', 'Q', 'R', 'T']   # S has no unemployment, U no AI
+    assert np.isnan(rates.set_index('COUNTRY').loc['Q', 'un24'])
+
+
+def test_youth_of_synthetic_cube(tables):
+    built, _, _, df_age = tables
+    youth = cube.youth(built, '2024')
+    assert youth['COUNTRY'].tolist() == ['P', 'Q']
+    np.testing.assert_array_equal(youth['youth24'], _youth(df_age, '2024')['youth24'])
+    with pytest.raises(KeyError):
+        cube.youth(built, '2021')
+
+
+@pytest.mark.parametrize('name, files', [
+    ('merged',  ['database_employees.csv', 'database_ia.csv']),
+    ('youth_c', ['database_employees_age.csv']),
+    ('merged2', ['database_employees.csv', 'database_employees_age.csv', 'database_ia.csv']),
+])
+def test_views_read_only_their_csvs(shipped, monkeypatch, name, files):
+    read = set()
+    load_parsed = datasets.load_parsed
+    def spy(filename, *args, **kw):
+        read.add(filename)
+        return load_parsed(filename, *args, **kw)
+    monkeypatch.setattr(datasets, 'load_parsed', spy)
+    getattr(datasets, name)
+    assert sorted(read) == files
@@ -0,0 +1,92 @@
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eurostat_ingest import (ai_by_country, ai_by_nace, ingest, read_eurostat_tsv,
+                             unemployment_by_age)
+
+AI_TSV = (
+    'freq,indic_is,unit,size_emp,nace_r2,geo\\TIME_PERIOD\t2023 \t2024 \t2025 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,BE\t13.81 \t24.71 b\t34.54 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,BG\t3.62 \t: c\t8.55 e\n'
+    'A,E_AI_TANY,PC_ENT,GE250,C10-S951_X_K,BE\t40.0 \t50.0 \t60.0 \n'   # other size class
+    'A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,EU27_2020\t8.0 \t13.48 \t19.95 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,UK\t1.0 \t2.0 \t3.0 \n'          # not in EU27
+    'A,E_AI_TANY,PC_ENT,GE10,C10-S951_X_K,AT\t10.0 \t: \t20.0 \n'
+)
+NACE_TSV = (
+    'freq,indic_is,unit,size_emp,nace_r2,geo\\TIME_PERIOD\t2024 \t2025 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,J58-63,EU27_2020\t40.0 \t48.7 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,C10-33,EU27_2020\t10.0 b\t12.5 \n'
+    'A,E_AI_TANY,PC_ENT,GE10,J58-63,BE\t45.0 \t50.0 \n'
+)
+UNEMP_TSV = (
+    'freq,unit,sex,age,geo\\TIME_PERIOD\t2024 \t2025 \n'
+    'A,PC_ACT,T,Y25-74,BE\t4.65 \t5.07 \n'
+    'A,PC_ACT,T,Y_LT25,BE\t17.25 \t17.6 p\n'
+    'A,PC_ACT,T,Y_LT25,NO\t11.0 \t: \n'
+    'A,PC_ACT,F,Y_LT25,BE\t16.0 \t16.5 \n'
+)
+
+
+@pytest.fixture
+def extracts(tmp_path):
+    paths = {}
+    for name, text in (('ai', AI_TSV), ('nace', NACE_TSV), ('unemployment', UNEMP_TSV)):
+        paths[name] = str(tmp_path / f'{name}.tsv.gz')
+        with gzip.open(paths[name], 'wt', encoding='utf-8') as f:
+            f.write(text)
+    return paths
+
+
+def test_chunked_read_drops_flags_and_missing_values(extracts):
+    rows = read_eurostat_tsv(extracts['ai'], {'size_emp': 'GE10', 'geo': ['BE', 'BG', 'AT']},
+                             ['2023', '2024', '2025'], chunksize=2)
+    expected = pd.DataFrame({'size_emp': ['GE10'] * 3, 'geo': ['BE', 'BG', 'AT'],
+                             '2023': [13.81, 3.62, 10.0], '2024': [24.71, np.nan, np.nan],
+                             '2025': [34.54, 8.55, 20.0]})
+    pd.testing.assert_frame_equal(rows, expected, check_dtype=False)
+
+
+def test_chunk_size_does_not_change_the_result(extracts):
+    years = ['2023', '2025']
+    whole = ai_by_country(extracts['ai'], years)
+    for chunksize in (1, 2, 4):
+        pd.testing.assert_frame_equal(ai_by_country(extracts['ai'], years, chunksize=chunksize),
+                                      whole)
+    assert whole['COUNTRY'].tolist() == ['Belgium', 'Bulgaria', 'Austria']   # EU27 order
+
+
+def test_missing_year_or_dimension_is_an_error(extracts):
+    with pytest.raises(ValueError, match='no data for year'):
+        read_eurostat_tsv(extracts['ai'], {}, ['2022'])
+    with pytest.raises(ValueError, match='no dimension'):
+        read_eurostat_tsv(extracts['ai'], {'age': 'Y_LT25'}, ['2023'])
+
+
+def test_builders_match_the_database_layout(extracts):
+    nace = ai_by_nace(extracts['nace'], ['2024', '2025'], chunksize=1)
+    assert nace['NACE'].tolist() == ['Manufacturing', 'Information and communication']
+    np.testing.assert_allclose(nace[['2024', '2025']], [[10.0, 12.5], [40.0, 48.7]])
+
+    age = unemployment_by_age(extracts['unemployment'], ['2024', '2025'], chunksize=2)
+    assert age.columns.tolist() == ['TIME', 'AGE', '2024', '2025']
+    assert age[['TIME', 'AGE']].values.tolist() == [['Belgium', 'Less than 25 years'],
+                                                   ['Belgium', 'From 25 to 74 years'],
+                                                   ['Norway', 'Less than 25 years']]
+    np.testing.assert_allclose(age['2025'], [17.6, 5.07, np.nan])
+
+
+def test_sector_table_needs_its_own_extract(extracts, tmp_path):
+    written = ingest(tmp_path / 'out', ['2024', '2025'], ai=extracts['ai'])
+    assert sorted(os.path.basename(p) for p in written) == ['database_ia.csv',
+                                                            'database_ia_europe.csv']
+    with pytest.raises(ValueError, match='no NACE sector rows'):
+        ingest(tmp_path / 'bad', ['2024', '2025'], nace=extracts['ai'])
+    written = ingest(tmp_path / 'all', ['2024', '2025'], ai=extracts['ai'],
+                     nace=extracts['nace'])
+    table = pd.read_csv(written[-1], sep=';', decimal=',', encoding='utf-8-sig')
+    assert table.columns.tolist() == ['NACE', '2024', '2025']
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hierarchy import Hierarchy, from_frame
+
+LEAVES = ['ES511', 'ES512', 'ES521', 'ES61', 'PT11', 'PT16', 'PT17', 'FR', 'DE1', 'DE2',
+          'Greece']   # a country name becomes its NUTS-0 code (EL)
+
+
+@pytest.fixture
+def leaves():
+    rng = np.random.default_rng(13)
+    values = rng.uniform(2, 40, (len(LEAVES), 3))
+    values[2, 1] = np.nan                               # a missing rate
+    weights = rng.uniform(1, 100, (len(LEAVES), 3))
+    weights[5, 0] = np.nan                              # a missing weight
+    return values, weights
+
+
+def _groupby_rollup(codes, values, weights, n_chars):
+    """Weighted means per code prefix, the plain pandas way."""
+    codes = pd.Series(codes).replace({'Greece': 'EL'})
+    rows = []
+    for k in range(values.shape[1]):
+        present = ~(np.isnan(values[:, k]) | np.isnan(weights[:, k]))
+        frame = pd.DataFrame({'node': codes.str[:n_chars], 'len': codes.str.len(),
+                              'num': np.where(present, values[:, k] * weights[:, k], 0.0),
+                              'den': np.where(present, weights[:, k], 0.0)})
+        sums = frame[frame['len'] >= n_chars].groupby('node')[['num', 'den']].sum()
+        rows.append((sums['num'] / sums['den'].where(sums['den'] > 0)).rename(k))
+    return pd.concat(rows, axis=1)
+
+
+@pytest.mark.parametrize('level', [0, 1, 2, 3])
+def test_rollup_matches_groupby(leaves, level):
+    values, weights = leaves
+    hierarchy = Hierarchy(LEAVES, values, weights)
+    expected = _groupby_rollup(LEAVES, values, weights, level + 2)
+    pd.testing.assert_frame_equal(hierarchy.rollup(level), expected, check_names=False,
+                                  check_index_type=False)
+
+
+def test_bloc_sums_its_members(leaves):
+    values, weights = leaves
+    hierarchy = Hierarchy(LEAVES, values, weights)
+    members = ['Spain', 'PT1', 'missing']
+    rows = [i for i, c in enumerate(LEAVES) if c.startswith(('ES', 'PT1'))]
+    present = ~(np.isnan(values[rows]) | np.isnan(weights[rows]))
+    expected = (np.where(present, values[rows] * weights[rows], 0).sum(axis=0)
+                / np.where(present, weights[rows], 0).sum(axis=0))
+    np.testing.assert_allclose(hierarchy.bloc(members), expected)
+
+
+def test_update_matches_a_full_rebuild(leaves):
+    values, weights = leaves
+    hierarchy = Hierarchy(LEAVES, values, weights)
+    hierarchy.update('ES521', values=[10.0, 20.0, np.nan])
+    hierarchy.update('PT16', weights=[5.0, 5.0, 5.0])
+    hierarchy.update('Greece', values=[1.0, 2.0, 3.0], weights=[50.0, 50.0, 50.0])
+
+    values, weights = values.copy(), weights.copy()
+    values[2] = [10.0, 20.0, np.nan]
+    weights[5] = 5.0
+    values[10], weights[10] = [1.0, 2.0, 3.0], 50.0
+    rebuilt = Hierarchy(LEAVES, values, weights)
+    pd.testing.assert_frame_equal(hierarchy.rollup(), rebuilt.rollup(), rtol=1e-12)
+    np.testing.assert_allclose(hierarchy.den, rebuilt.den)
+
+
+def test_equal_weights_without_weights():
+    df = pd.DataFrame({'COUNTRY': ['Spain', 'Portugal', 'France'],
+                       '2024': [10.0, 20.0, 30.0], '2025': [12.0, np.nan, 36.0]})
+    hierarchy = from_frame(df, ['2024', '2025'])
+    np.testing.assert_allclose(hierarchy.bloc(['Spain', 'Portugal', 'France']), [20.0, 24.0])
+    np.testing.assert_allclose(hierarchy.total_weight('PT'), [1.0, 0.0])
+
+
+def test_nested_or_repeated_leaves_are_rejected():
+    with pytest.raises(ValueError, match='contain one another'):
+        Hierarchy(['ES', 'ES51'], np.ones((2, 1)))
+    with pytest.raises(ValueError, match='unique'):
+        Hierarchy(['ES51', 'ES51'], np.ones((2, 1)))
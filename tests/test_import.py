@@ -0,0 +1,11 @@
+import pytest
+
+from benchmark import IMPORT_BUDGET, PLOTTING_MODULES, time_import
+
+
+@pytest.mark.parametrize('module', ['datasets', 'config'])
+def test_data_layer_imports_fast_without_plotting(module):
+    # Fresh interpreters, best of three: the same check as benchmark.py --check-import
+    seconds, _, loaded = time_import(3, module)
+    assert loaded == [], f'import {module} loaded {", ".join(loaded)} (of {PLOTTING_MODULES})'
+    assert seconds <= IMPORT_BUDGET, f'import {module} took {seconds:.3f}s'
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from incremental import YearStore, derive_year, growth, positions, store_for, update
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(5)
+    countries = [f'C{i}' for i in range(9)]
+    df_ia = pd.DataFrame({'COUNTRY': countries,
+                          **{y: rng.uniform(2, 40, 9).round(2) for y in ('2023', '2024', '2025')}})
+    df_emp = pd.DataFrame({'COUNTRY': countries[::-1],
+                           **{y: rng.uniform(2, 12, 9).round(1) for y in ('2023', '2024', '2025')}})
+    return df_ia, df_emp
+
+
+def test_first_update_computes_every_year(tables, tmp_path):
+    df_ia, df_emp = tables
+    results = update(df_ia, df_emp, YearStore(tmp_path))
+    assert results.years == results.recomputed == ['2023', '2024', '2025']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['2023.npz', '2024.npz', '2025.npz']
+
+    un = df_emp.set_index('COUNTRY').loc[results.countries]
+    expected = derive_year(df_ia['2025'].to_numpy(), un['2025'].to_numpy(),
+                           df_ia['2023'].to_numpy(), un['2023'].to_numpy())
+    np.testing.assert_array_equal(results.groups['2025'], expected['group'])
+    np.testing.assert_allclose(results.medians.loc['2025'], expected['medians'])
+    np.testing.assert_allclose(results.trajectories[:, 2], expected['points'])
+
+
+def test_unchanged_years_are_hits(tables, tmp_path):
+    df_ia, df_emp = tables
+    store = YearStore(tmp_path)
+    first = update(df_ia, df_emp, store)
+    assert update(df_ia, df_emp, store).recomputed == []              # from memory
+    again = update(df_ia, df_emp, YearStore(tmp_path))                # from the files
+    assert again.recomputed == []
+    pd.testing.assert_frame_equal(again.growth, first.growth)
+    np.testing.assert_array_equal(again.trajectories, first.trajectories)
+
+
+def test_revised_year_is_recomputed_alone(tables, tmp_path):
+    df_ia, df_emp = tables
+    store = YearStore(tmp_path)
+    update(df_ia, df_emp, store)
+    revised = df_ia.assign(**{'2024': df_ia['2024'] + 0.1})
+    assert update(revised, df_emp, store).recomputed == ['2024']
+    assert update(revised, df_emp, YearStore(tmp_path)).recomputed == []
+
+
+def test_revised_base_year_recomputes_the_deltas(tables, tmp_path):
+    df_ia, df_emp = tables
+    store = YearStore(tmp_path)
+    update(df_ia, df_emp, store)
+    revised = df_emp.assign(**{'2023': df_emp['2023'] + 0.5})
+    results = update(df_ia, revised, store)
+    assert results.recomputed == ['2023', '2024', '2025']
+    np.testing.assert_allclose(results.growth['un_change_2023'], 0.0)
+
+
+def test_appended_year_is_the_only_miss(tables, tmp_path):
+    df_ia, df_emp = tables
+    store = YearStore(tmp_path)
+    update(df_ia, df_emp, store)
+    results = update(df_ia.assign(**{'2026': df_ia['2025'] * 1.1}),
+                     df_emp.assign(**{'2026': df_emp['2025']}), store)
+    assert results.recomputed == ['2026']
+    assert results.years[-1] == '2026'
+
+
+def test_store_rejects_other_digests(tmp_path):
+    store = YearStore(tmp_path)
+    store.put('2025', 'abc', points=np.zeros((2, 2)))
+    assert store.get('2025', 'abc') is not None
+    assert store.get('2025', 'def') is None
+    assert YearStore(tmp_path).get('2025', 'def') is None
+    assert YearStore(tmp_path).get('2024', 'abc') is None
+
+
+def test_store_for_shares_one_store_per_folder(tmp_path):
+    assert store_for(tmp_path) is store_for(str(tmp_path) + '/')
+    assert store_for(tmp_path) is not store_for(tmp_path / 'other')
+
+
+def test_lookups_by_country(tables, tmp_path):
+    df_ia, df_emp = tables
+    results = update(df_ia, df_emp, YearStore(tmp_path))
+    points = positions(results, ['C3', 'missing'], ['2023', '2025'])
+    assert points.shape == (2, 2, 2)
+    un = df_emp.set_index('COUNTRY')
+    np.testing.assert_allclose(points[0, 1], [df_ia['2025'][3], un.loc['C3', '2025']])
+    assert np.isnan(points[1]).all()
+    ai_growth, un_change = growth(results, ['C3', 'missing'], '2025')
+    assert ai_growth[0] == pytest.approx(df_ia['2025'][3] - df_ia['2023'][3])
+    assert un_change[0] == pytest.approx(un.loc['C3', '2025'] - un.loc['C3', '2023'])
+    assert np.isnan(ai_growth[1]) and np.isnan(un_change[1])
+
+
+def test_unwritable_store_still_returns_results(tables, tmp_path):
+    df_ia, df_emp = tables
+    (tmp_path / 'data').write_text('')                 # a file where the folder would go
+    store = YearStore(tmp_path / 'data' / '.year_store')
+    results = update(df_ia, df_emp, store)
+    expected = update(df_ia, df_emp, YearStore(tmp_path / 'writable'))
+    np.testing.assert_array_equal(results.trajectories, expected.trajectories)
+    assert update(df_ia, df_emp, store).recomputed == []   # kept in memory
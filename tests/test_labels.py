@@ -0,0 +1,94 @@
+import itertools
+
+import numpy as np
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+
+from labels import PointLabels, SpatialGrid, salience  # noqa: E402
+
+
+def _overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+# ── Grid ───────────────────────────────────────────────────────────────────────
+def test_grid_finds_overlaps_across_cells():
+    grid = SpatialGrid(10)
+    grid.add((5, 5, 25, 15))                       # spans cells (0..2, 0..1)
+    assert grid.collides((20, 12, 30, 20))
+    assert grid.collides((-3, -3, 6, 6))
+    assert not grid.collides((26, 5, 40, 15))
+    assert not grid.collides((25, 5, 40, 15))      # touching edges do not overlap
+
+
+def test_grid_handles_negative_coordinates():
+    grid = SpatialGrid(4)
+    grid.add((-10, -10, -6, -6))
+    assert grid.collides((-7, -7, -1, -1))
+    assert not grid.collides((-5, -5, -1, -1))
+
+
+def test_grid_ignores_the_owners_own_box():
+    grid = SpatialGrid(10)
+    grid.add((0, 0, 4, 4), owner=3)
+    assert not grid.collides((2, 2, 8, 8), owner=3)
+    assert grid.collides((2, 2, 8, 8), owner=4)
+    assert grid.collides((2, 2, 8, 8))
+
+
+def test_grid_agrees_with_pairwise_checks():
+    rng = np.random.default_rng(2)
+    lo = rng.uniform(0, 200, size=(300, 2))
+    boxes = np.hstack([lo, lo + rng.uniform(1, 30, size=(300, 2))])
+    grid = SpatialGrid(12)
+    for box in boxes[:150]:
+        grid.add(tuple(box))
+    for box in boxes[150:]:
+        assert grid.collides(tuple(box)) == any(_overlap(box, b) for b in boxes[:150])
+
+
+# ── Layout ─────────────────────────────────────────────────────────────────────
+def _draw(x, y, **kw):
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+    ax.set_xlim(-1, 11)
+    ax.set_ylim(-1, 11)
+    ax.scatter(x, y, s=13)
+    labels = PointLabels(x, y, [f'Country {i}' for i in range(len(x))], point_size=4,
+                         fontsize=8, **kw)
+    ax.add_artist(labels)
+    fig.canvas.draw()
+    boxes = [t.get_window_extent(fig.canvas.get_renderer()).extents
+             for t in labels.get_children() if t.get_visible()]
+    frame = ax.bbox.extents
+    plt.close(fig)
+    return labels, boxes, frame
+
+
+def test_placed_labels_do_not_overlap_and_stay_inside():
+    rng = np.random.default_rng(4)
+    x, y = rng.uniform(0, 10, 60), rng.uniform(0, 10, 60)
+    labels, boxes, frame = _draw(x, y)
+    placed = labels.placed >= 0
+    assert 0 < placed.sum() < len(x)               # crowded: some labels are dropped
+    assert len(boxes) == placed.sum()
+    for a, b in itertools.combinations(boxes, 2):
+        assert not _overlap(a, b)
+    for box in boxes:
+        assert box[0] >= frame[0] - 1 and box[2] <= frame[2] + 1
+        assert box[1] >= frame[1] - 1 and box[3] <= frame[3] + 1
+
+
+def test_higher_priority_labels_are_placed_first():
+    x, y = np.full(5, 5.0), np.full(5, 5.0)        # every label competes for one spot
+    priority = np.array([1.0, 5.0, 3.0, 2.0, 4.0])
+    labels, _, _ = _draw(x, y, priority=priority, offsets=((5, 5),))
+    assert labels.placed.tolist() == [-1, 0, -1, -1, -1]
+
+
+def test_salience_ranks_outliers_first():
+    x = np.array([1.0, 2.0, 3.0, 2.0, 30.0])
+    y = np.array([1.0, 1.0, 1.0, 1.0, 1.0])
+    assert np.argmax(salience(x, y)) == 4
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from projections import CAP, batched_lstsq, fit_trends, fitted, group_trends, project
+
+
+def _row_lstsq(X, y):
+    """Reference fit of one row with np.linalg.lstsq, NaN observations dropped."""
+    keep = np.isfinite(y)
+    Xk, yk = X[keep], y[keep]
+    coef = np.linalg.lstsq(Xk, yk, rcond=None)[0]
+    dof = len(yk) - X.shape[1]
+    sigma2 = ((yk - Xk @ coef) ** 2).sum() / dof if dof > 0 else np.nan
+    return coef, np.linalg.inv(Xk.T @ Xk), sigma2, dof
+
+
+def test_shared_design_matches_lstsq():
+    rng = np.random.default_rng(6)
+    X = np.column_stack([np.ones(6), np.arange(6.0) - 2.5, (np.arange(6.0) - 2.5) ** 2])
+    Y = rng.normal(size=(40, 6))
+    Y[rng.random(Y.shape) < 0.15] = np.nan
+    coef, cov, sigma2, dof = batched_lstsq(X, Y)
+    for k, y in enumerate(Y):
+        if np.isfinite(y).sum() < 3:
+            assert np.isnan(coef[k]).all()
+            continue
+        c, v, s, d = _row_lstsq(X, y)
+        np.testing.assert_allclose(coef[k], c, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(cov[k], v, rtol=1e-9, atol=1e-12)
+        assert dof[k] == d
+        if d > 0:
+            assert sigma2[k] == pytest.approx(s, rel=1e-9)
+        else:
+            assert np.isnan(sigma2[k])
+
+
+def test_per_row_designs_and_mask():
+    rng = np.random.default_rng(8)
+    X = np.stack([np.ones((12, 7)), rng.normal(size=(12, 7))], axis=-1)
+    Y = 2.0 + 3.0 * X[..., 1] + rng.normal(scale=0.1, size=(12, 7))
+    mask = rng.random(Y.shape) > 0.2
+    coef, _, sigma2, dof = batched_lstsq(X, Y, mask)
+    for k in range(len(Y)):
+        c, _, s, d = _row_lstsq(X[k], np.where(mask[k], Y[k], np.nan))
+        np.testing.assert_allclose(coef[k], c, rtol=1e-9)
+        assert dof[k] == d
+
+
+def test_too_few_observations_give_nan():
+    X = np.column_stack([np.ones(3), np.arange(3.0)])
+    coef, cov, sigma2, dof = batched_lstsq(X, [[1.0, np.nan, np.nan], [1.0, 2.0, 4.0]])
+    assert np.isnan(coef[0]).all() and np.isnan(cov[0]).all() and np.isnan(sigma2[0])
+    assert dof.tolist() == [-1, 1]
+    np.testing.assert_allclose(coef[1], np.polyfit(np.arange(3.0), [1.0, 2.0, 4.0], 1)[::-1])
+
+
+def test_linear_trend_matches_polyfit():
+    years = [2023, 2024, 2025]
+    Y = np.array([[8.0, 13.5, 20.0], [5.5, 5.7, 6.2]])
+    fit = fit_trends(Y, years)
+    for k, y in enumerate(Y):
+        slope, intercept = np.polyfit(np.array(years) - 2024.0, y, 1)
+        np.testing.assert_allclose(fit.coef[k], [intercept, slope])
+    np.testing.assert_allclose(fitted(fit, [2030]), fit.coef[:, :1] + 6 * fit.coef[:, 1:])
+
+
+def test_perfect_fit_keeps_an_interval():
+    Y = np.array([[1.0, 2.0, 3.0],              # on a line: residual variance 0
+                  [1.0, 2.5, 3.0],
+                  [2.0, 2.0, 3.0],
+                  [4.0, 3.0, 3.5]])
+    fit = fit_trends(Y, [2023, 2024, 2025])
+    floor = np.quantile(batched_lstsq(np.column_stack([np.ones(3), [-1.0, 0.0, 1.0]]), Y)[2], 0.25)
+    assert floor > 0
+    assert fit.sigma2[0] == pytest.approx(floor)
+    proj = project(fit, [2030])
+    assert proj.upper[0, 0] > proj.mean[0, 0] > proj.lower[0, 0]
+    assert fit_trends(Y, [2023, 2024, 2025], min_sigma2=0.0).sigma2[0] == pytest.approx(0.0)
+
+
+def test_logistic_projections_stay_within_the_cap():
+    fit = fit_trends(np.array([[20.0, 40.0, 60.0], [80.0, 90.0, 95.0]]), [2023, 2024, 2025],
+                     kind='logistic')
+    proj = project(fit, range(2026, 2041), level=0.99)
+    assert (proj.upper <= CAP).all() and (proj.lower >= 0).all()
+    assert (np.diff(proj.mean, axis=1) > 0).all()
+
+
+def test_scenario_sweep_scales_the_slopes():
+    fit = fit_trends(np.array([[8.0, 13.5, 20.0]]), [2023, 2024, 2025])
+    proj = project(fit, [2030], slope_scale=np.array([[0.0], [1.0], [2.0]]))
+    assert proj.mean.shape == (3, 1, 1)
+    base, slope = fit.coef[0]
+    np.testing.assert_allclose(proj.mean[:, 0, 0], base + np.array([0.0, 1.0, 2.0]) * slope * 6)
+
+
+def test_group_trends_match_polyfit():
+    x = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+    y = np.array([2.0, 4.1, 5.9, 1.0, 0.5, 0.2, 9.0])
+    groups = np.array(['A', 'A', 'A', 'B', 'B', 'B', 'C'])
+    trends = group_trends(x, y, groups, ['A', 'B', 'C', 'D'])
+    for g in 'AB':
+        np.testing.assert_allclose(trends[g], np.polyfit(x[groups == g], y[groups == g], 1))
+    assert trends['C'] is None and trends['D'] is None
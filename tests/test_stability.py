@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stability import CHUNK_SIMS, NoiseModel, simulate, summary
+
+
+@pytest.fixture
+def rates():
+    rng = np.random.default_rng(9)
+    return pd.DataFrame({'COUNTRY': [f'C{i}' for i in range(15)],
+                         'ai25': rng.uniform(5, 35, 15).round(2),
+                         'un25': rng.uniform(2, 11, 15).round(1)})
+
+
+def test_same_seed_same_probabilities_for_any_workers(rates):
+    n_sims = 2 * CHUNK_SIMS + 123                  # two full chunks and a partial one
+    one = simulate(rates, n_sims=n_sims, seed=11, workers=1)
+    two = simulate(rates, n_sims=n_sims, seed=11, workers=2)
+    pd.testing.assert_frame_equal(one.probabilities, two.probabilities)
+    pd.testing.assert_series_equal(one.consensus, two.consensus)
+    assert not one.probabilities.equals(simulate(rates, n_sims=n_sims, seed=12).probabilities)
+
+
+def test_probabilities_are_shares_of_the_simulations(rates):
+    result = simulate(rates, n_sims=1000, seed=1)
+    np.testing.assert_allclose(result.probabilities.sum(axis=1), 1.0)
+    counts = result.probabilities.to_numpy() * 1000
+    np.testing.assert_allclose(counts, counts.round(), atol=1e-9)
+
+
+def test_without_noise_every_country_keeps_its_group(rates):
+    result = simulate(rates, noise=NoiseModel(0.0, 0.0), n_sims=500, seed=2)
+    assert (result.consensus == result.point).all()
+    assert (result.probabilities.max(axis=1) == 1.0).all()
+    assert not summary(result)['unstable'].any()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from taxonomy import classify, classify_years, thresholds
+
+
+def _quadrant(ai, un, ai_med, un_med):
+    # The row-by-row rule classify() replaced
+    if   ai >= ai_med and un >= un_med: return 'A'
+    elif ai <  ai_med and un >= un_med: return 'B'
+    elif ai <  ai_med and un <  un_med: return 'C'
+    else:                               return 'D'
+
+
+def test_classify_matches_row_rule():
+    rng = np.random.default_rng(0)
+    ai = rng.uniform(0, 40, 200).round(1)
+    un = rng.uniform(2, 12, 200).round(1)
+    ai_med, un_med = np.median(ai), np.median(un)
+    expected = [_quadrant(a, u, ai_med, un_med) for a, u in zip(ai, un)]
+    assert classify(ai, un, ai_med, un_med).tolist() == expected
+
+
+def test_classify_threshold_counts_as_high():
+    assert classify([5.0, 4.9, 4.9, 5.0], [3.0, 3.0, 2.9, 2.9], 5.0, 3.0).tolist() == \
+        ['A', 'B', 'C', 'D']
+
+
+def test_classify_broadcasts_thresholds():
+    ai = np.array([[10.0, 20.0, 30.0],
+                   [30.0, 20.0, 10.0]])
+    un = np.full((2, 3), 5.0)
+    per_year = classify(ai, un, np.array([20.0, 20.0, 20.0]), np.array([4.0, 6.0, 4.0]))
+    assert per_year.tolist() == [['B', 'D', 'A'], ['A', 'D', 'B']]
+
+    scenarios = classify(ai, un, np.array([15.0, 25.0])[:, None, None], 4.0)
+    assert scenarios.shape == (2, 2, 3)
+    assert scenarios[0].tolist() == [['B', 'A', 'A'], ['A', 'A', 'B']]
+    assert scenarios[1].tolist() == [['B', 'B', 'A'], ['A', 'B', 'B']]
+
+
+def test_classify_years_uses_each_years_medians():
+    df = pd.DataFrame({'COUNTRY': list('pqrs'),
+                       'ai23': [1.0, 2.0, 3.0, 4.0], 'un23': [4.0, 3.0, 2.0, 1.0],
+                       'ai24': [4.0, 3.0, 2.0, 1.0], 'un24': [4.0, 3.0, 2.0, 1.0]})
+    ai_med, un_med = thresholds(df)
+    np.testing.assert_allclose(ai_med, [2.5, 2.5])
+    np.testing.assert_allclose(un_med, [2.5, 2.5])
+    groups = classify_years(df)
+    assert groups.columns.tolist() == ['group23', 'group24']
+    expected = [[_quadrant(df[f'ai{y}'][i], df[f'un{y}'][i], 2.5, 2.5) for y in ('23', '24')]
+                for i in range(4)]
+    assert groups.to_numpy().tolist() == expected
+
+
+def test_classify_years_against_a_reference_year():
+    df = pd.DataFrame({'ai23': [1.0, 2.0, 3.0], 'un23': [1.0, 2.0, 3.0],
+                       'ai24': [5.0, 6.0, 7.0], 'un24': [5.0, 6.0, 7.0]})
+    groups = classify_years(df, reference='24')
+    assert groups['group23'].tolist() == ['C', 'C', 'C']
+    assert groups['group24'].tolist() == ['C', 'A', 'A']
@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+
+from vintages import export, read_raw, store_for
+
+FIRST = 'COUNTRY;2023;2024\nBelgium;13,81;24,71\nBulgaria;3,62;6,47\nCzechia;5,9;\n'
+SECOND = ('COUNTRY;2023;2024;2025\nBelgium;13,81;24,8;34,54\nCzechia;5,9;11,26;17,6\n'
+          'Denmark;15,2;27,6;42,03\n')
+AGE = ('TIME;AGE;2024\nBelgium;Less than 25 years;17,25\nBelgium;From 25 to 74 years;4,65\n'
+       'Belgium;From 25 to 74 years;4,7\n')   # a repeated key
+
+
+def _write(folder, name, text):
+    (folder / name).write_text(text, encoding='utf-8-sig')
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    _write(tmp_path, 'database_ia.csv', FIRST)
+    _write(tmp_path, 'database_employees_age.csv', AGE)
+    store = store_for(tmp_path)
+    store.record(tmp_path, '2025-06-15')
+    first = {p.name: read_raw(p) for p in tmp_path.glob('database_*.csv')}
+    _write(tmp_path, 'database_ia.csv', SECOND)
+    (tmp_path / 'database_employees_age.csv').unlink()
+    second = store.record(tmp_path, '2025-12-15')
+    return tmp_path, first, second
+
+
+def test_as_of_round_trip(recorded):
+    folder, first, _ = recorded
+    store = store_for(folder)                      # reopened from index.json
+    old = store.resolve('2025-09-30')
+    for name, raw in first.items():
+        pd.testing.assert_frame_equal(store.load(name, old), raw)
+    new = store.resolve('2026-01-01')
+    pd.testing.assert_frame_equal(store.load('database_ia.csv', new),
+                                  read_raw(folder / 'database_ia.csv'))
+
+
+def test_only_changed_cells_are_stored(recorded):
+    folder, _, second = recorded
+    # 2024 revised for Belgium and filled for Czechia, 2025 added for all,
+    # Denmark added; Bulgaria's two cells logged as removed
+    assert second['files']['database_ia.csv']['changes'] == 2 + 3 + 2 + 2
+    assert 'database_employees_age.csv' not in second['files']
+    third = store_for(folder).record(folder, '2026-03-01')
+    assert third['files']['database_ia.csv']['changes'] == 0
+
+
+def test_removed_file_is_absent_from_later_vintages(recorded):
+    folder = recorded[0]
+    store = store_for(folder)
+    with pytest.raises(FileNotFoundError):
+        store.load('database_employees_age.csv', store.resolve('2026-01-01'))
+
+
+def test_dates_before_the_first_vintage_and_out_of_order_releases(recorded):
+    store = store_for(recorded[0])
+    with pytest.raises(ValueError, match='No vintage'):
+        store.resolve('2025-01-01')
+    with pytest.raises(ValueError, match='append-only'):
+        store.record(recorded[0], '2025-07-01')
+
+
+def test_export_writes_the_vintage(recorded, tmp_path_factory):
+    folder, first, _ = recorded
+    out = tmp_path_factory.mktemp('deck')
+    vintage = export(store_for(folder), '2025-06-15', out)
+    assert vintage['id'] == 0
+    for name, raw in first.items():
+        pd.testing.assert_frame_equal(read_raw(out / name), raw)
+
+
+def test_datasets_read_as_of(tmp_path):
+    import glob
+    import shutil
+
+    import datasets
+    for path in glob.glob(datasets.DATA_PATH + 'database_*.csv'):
+        shutil.copy(path, tmp_path)
+    before = read_raw(tmp_path / 'database_ia.csv')
+    store_for(tmp_path).record(tmp_path, '2025-06-15')
+    revised = before.copy()
+    revised.loc[0, '2025'] = '99,9'
+    revised.to_csv(tmp_path / 'database_ia.csv', sep=';', index=False, encoding='utf-8-sig')
+    store_for(tmp_path).record(tmp_path, '2025-12-15')
+
+    original = datasets.DATA_PATH
+    try:
+        datasets.set_data_path(tmp_path)
+        assert datasets.df_ia.loc[0, '2025'] == pytest.approx(99.9)
+        datasets.set_as_of('2025-09-30')
+        assert datasets.df_ia.loc[0, '2025'] == pytest.approx(float(before.loc[0, '2025']
+                                                                    .replace(',', '.')))
+    finally:
+        datasets.set_as_of(None)
+        datasets.set_data_path(original)
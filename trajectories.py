@@ -0,0 +1,68 @@
+"""
+Trajectory preparation for the per-group scatter chart (08).
+Turns the merged country table into, for each strategic group, an array of
+shape (n_countries, n_years, 2) holding (AI adoption, unemployment) per
+year, plus the padded axis limits and the latest-year trend line. Everything
+is computed from that array in one pass, and the trend lines of all groups
+in one batched fit (projections.group_trends); the chart only draws the result.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from projections import group_trends
+
+Trajectories = namedtuple('Trajectories', ['countries', 'points', 'xlim', 'ylim', 'trend',
+                                           'projected'], defaults=(None,))
+Trajectories.__doc__ = """Per-group trajectory data.
+countries : list of country names, one per row of `points`
+points    : float array (n_countries, n_years, 2) of (ai, un) positions
+xlim/ylim : padded (low, high) axis limits covering every year
+trend     : (slope, intercept) of un ~ ai on the latest year, or None
+projected : (n_countries, k, 2) projected positions, or None without projections"""
+
+
+def trajectory_points(df, years=('23', '24', '25')):
+    """(n_rows, n_years, 2) array of (ai<yy>, un<yy>) positions."""
+    ai = df[[f'ai{y}' for y in years]].to_numpy(dtype=float)
+    un = df[[f'un{y}' for y in years]].to_numpy(dtype=float)
+    return np.stack([ai, un], axis=-1)
+
+
+def prepare_trajectories(df, group_order, years=('23', '24', '25'),
+                         pad_x=0.25, pad_y=0.35, projected=None, points=None):
+    """Trajectories for each group in `group_order`, keyed by group label.
+
+    Axis limits span all years of the group's countries, padded by `pad_x` /
+    `pad_y` times the data range and clipped at zero. `projected`, an
+    (n_rows, k, 2) array of projected positions, widens them to cover those too.
+    `points` gives the (n_rows, n_years, 2) positions, e.g. from the per-year
+    store (incremental.positions); by default they are read from `df`.
+    """
+    points    = trajectory_points(df, years) if points is None else points
+    extent    = points if projected is None else np.concatenate([points, projected], axis=1)
+    countries = df['COUNTRY'].to_numpy()
+    groups    = df['group'].to_numpy()
+
+    # Sort rows by group once, then slice each group's contiguous block
+    order  = np.argsort(groups, kind='stable')
+    labels, starts = np.unique(groups[order], return_index=True)
+    ends   = np.append(starts[1:], len(order))
+    blocks = {g: order[s:e] for g, s, e in zip(labels, starts, ends)}
+
+    trends = group_trends(points[:, -1, 0], points[:, -1, 1], groups, group_order)
+    result = {}
+    for g in group_order:
+        rows = blocks.get(g, np.array([], dtype=int))
+        pts  = points[rows]
+        if len(pts):
+            lo, hi = np.nanmin(extent[rows], axis=(0, 1)), np.nanmax(extent[rows], axis=(0, 1))
+        else:
+            lo, hi = np.zeros(2), np.ones(2)
+        pad  = (hi - lo) * np.array([pad_x, pad_y])
+        xlim = (max(0, lo[0] - pad[0]), hi[0] + pad[0])
+        ylim = (max(0, lo[1] - pad[1]), hi[1] + pad[1])
+        result[g] = Trajectories(countries[rows].tolist(), pts, xlim, ylim, trends[g],
+                                 None if projected is None else projected[rows])
+    return result
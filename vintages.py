@@ -0,0 +1,256 @@
+"""
+Append-only vintage store for the database_*.csv files.
+Eurostat revises published values, and the CSVs are overwritten in place.
+Each recorded snapshot (a vintage, tagged with its release date) is therefore
+kept under DATA_PATH/.vintages/ so that any earlier deck can be reproduced.
+
+Only cells that changed since the previous vintage are stored: one
+long-format log per CSV with (vintage, row key, year column, raw text) rows,
+where a null value marks a removed cell. A CSV that did not change adds
+nothing but a line in the index. Storage therefore grows with the number of
+revisions, not of snapshots. index.json lists the vintages by release date.
+A table "as of" a date is rebuilt in one vectorized pass over its log (the
+last value of every cell up to that vintage), and datasets.py caches the
+parsed result like any other CSV.
+
+Usage:
+    python vintages.py record --release 2025-10-15      # snapshot the current CSVs
+    python vintages.py list
+    python vintages.py export --as-of 2025-06-30 --output deck_q2/
+"""
+
+import argparse
+import bisect
+import datetime
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from incremental import year_columns
+
+try:
+    from pyarrow import feather
+    LOG_FORMAT = 'feather'
+except ImportError:
+    feather = None
+    LOG_FORMAT = 'pkl'
+
+VINTAGE_SUBDIR = '.vintages'
+SOURCE_PATTERN = 'database_*.csv'
+
+_KEY_SEP = '\x1f'   # joins a row's key columns into one key
+_DUP_SEP = '\x1e'   # numbers repeated keys within one file
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_raw(path):
+    """A CSV as text cells, exactly as written (no number or NaN parsing)."""
+    return pd.read_csv(path, sep=';', encoding='utf-8-sig', dtype=str,
+                       keep_default_na=False, na_filter=False)
+
+
+def to_cells(df):
+    """Long form of a raw table: one (key, column, value) row per year cell.
+    The key joins the non-year columns of the row."""
+    years = year_columns(df)
+    keys = [c for c in df.columns if c not in years]
+    key = df[keys].astype(str).agg(_KEY_SEP.join, axis=1) if keys else pd.Series('', index=df.index)
+    repeat = key.groupby(key).cumcount()
+    key = key.where(repeat == 0, key + _DUP_SEP + repeat.astype(str))
+    n = len(df)
+    return pd.DataFrame({'key': np.repeat(key.to_numpy(dtype=object), len(years)),
+                         'column': np.tile(np.array(years, dtype=object), n),
+                         'value': df[years].to_numpy(dtype=object).ravel()})
+
+
+class VintageStore:
+    """index.json plus one change log per CSV, under `path`."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(os.path.join(path, 'index.json')) as f:
+                self.vintages = json.load(f)['vintages']
+        except FileNotFoundError:
+            self.vintages = []
+        self._releases = [v['release'] for v in self.vintages]
+
+    # ── Lookup ─────────────────────────────────────────────────────────────────
+    def resolve(self, as_of):
+        """The latest vintage released on or before `as_of` (date or 'YYYY-MM-DD')."""
+        as_of = str(as_of)[:10]
+        i = bisect.bisect_right(self._releases, as_of)
+        if i == 0:
+            first = self._releases[0] if self._releases else 'none recorded'
+            raise ValueError(f"No vintage released on or before {as_of} (first: {first})")
+        return self.vintages[i - 1]
+
+    def revision(self, filename, vintage):
+        """Id of the vintage whose content `filename` has in `vintage`."""
+        try:
+            return vintage['files'][filename]['revision']
+        except KeyError:
+            raise FileNotFoundError(f"{filename} is not part of the vintage released "
+                                    f"{vintage['release']}") from None
+
+    def log_path(self, filename):
+        """Change log file of one CSV."""
+        return os.path.join(self.path, f'{os.path.splitext(filename)[0]}.{LOG_FORMAT}')
+
+    def read_log(self, filename):
+        """All recorded changes of one CSV, in vintage order."""
+        path = self.log_path(filename)
+        if not os.path.exists(path):
+            return pd.DataFrame({'vintage': pd.Series(dtype='int32'), 'key': [],
+                                 'column': [], 'value': []})
+        if LOG_FORMAT == 'feather':
+            return feather.read_table(path, memory_map=True).to_pandas()
+        return pd.read_pickle(path)
+
+    def _cells(self, filename, upto):
+        """(cells, row order) of `filename` after vintage `upto`: its current
+        (key, column, value) cells, and every key in order of first appearance."""
+        log = self.read_log(filename)
+        log = log[log['vintage'] <= upto].astype({'key': object, 'column': object})
+        last = log.drop_duplicates(['key', 'column'], keep='last')
+        return last[last['value'].notna()], pd.unique(log['key'].to_numpy())
+
+    def load(self, filename, vintage):
+        """The raw text table of `filename` as it was in `vintage`."""
+        self.revision(filename, vintage)   # raises if the file is not in it
+        columns = vintage['files'][filename]['columns']
+        cells, order = self._cells(filename, vintage['id'])
+        years = year_columns(pd.DataFrame(columns=columns))
+        keys = [c for c in columns if c not in years]
+        row_keys = order[pd.Index(order).isin(cells['key'])]
+        rows = pd.Index(row_keys).get_indexer(cells['key'])
+        cols = pd.Index(years).get_indexer(cells['column'])
+        keep = cols >= 0
+        table = np.full((len(row_keys), len(years)), '', dtype=object)
+        table[rows[keep], cols[keep]] = cells['value'].to_numpy(dtype=object)[keep]
+        df = pd.DataFrame(table, columns=years)
+        key_parts = [k.split(_DUP_SEP)[0].split(_KEY_SEP) for k in row_keys]
+        for i, col in enumerate(keys):
+            df.insert(i, col, [parts[i] for parts in key_parts])
+        return df[columns]
+
+    # ── Recording ──────────────────────────────────────────────────────────────
+    def record(self, data_path, release=None, pattern=SOURCE_PATTERN):
+        """Add a vintage holding the current `pattern` files of `data_path`.
+        Returns it, with 'changes' giving the number of stored cells per file."""
+        release = str(release or datetime.date.today())[:10]
+        if self._releases and release < self._releases[-1]:
+            raise ValueError(f"Release {release} predates the latest vintage "
+                             f"({self._releases[-1]}); vintages are append-only")
+        previous = self.vintages[-1] if self.vintages else {'id': -1, 'files': {}}
+        vid = previous['id'] + 1
+        files = {}
+        names = sorted(os.path.basename(p) for p in glob.glob(os.path.join(data_path, pattern)))
+        removed = [name for name in previous['files'] if name not in names]
+        os.makedirs(self.path, exist_ok=True)
+        for name in names + removed:
+            source = os.path.join(data_path, name)
+            before = previous['files'].get(name)
+            digest = _sha256(source) if name in names else None
+            if before is not None and before['sha256'] == digest:
+                files[name] = {**before, 'changes': 0}
+                continue
+            raw = read_raw(source) if digest else pd.DataFrame()
+            changes = self._diff(self._cells(name, previous['id'])[0], to_cells(raw))
+            if len(changes):
+                self._append(name, changes.assign(vintage=np.int32(vid)))
+            if digest:
+                files[name] = {'sha256': digest, 'columns': list(raw.columns),
+                               'revision': vid, 'changes': len(changes)}
+        vintage = {'id': vid, 'release': release,
+                   'recorded': datetime.datetime.now().isoformat(timespec='seconds'),
+                   'files': files}
+        self.vintages.append(vintage)
+        self._releases.append(release)
+        tmp = os.path.join(self.path, f'index.json.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'vintages': self.vintages}, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, 'index.json'))
+        return vintage
+
+    @staticmethod
+    def _diff(old, new):
+        """Cells of `new` that differ from `old` (in `new`'s order), then a
+        null for each cell of `old` that is gone."""
+        cells = ['key', 'column']
+        both = new.merge(old[cells + ['value']], on=cells, how='left', suffixes=('', '_old'))
+        changed = both[both['value_old'].isna() | (both['value_old'] != both['value'])]
+        gone = old[cells].merge(new[cells], on=cells, how='left', indicator=True)
+        gone = gone[gone['_merge'] == 'left_only'][cells].assign(value=None)
+        return pd.concat([changed[cells + ['value']], gone], ignore_index=True)
+
+    def _append(self, filename, changes):
+        log = pd.concat([self.read_log(filename), changes[['vintage', 'key', 'column', 'value']]],
+                        ignore_index=True)
+        log['vintage'] = log['vintage'].astype('int32')
+        log['key'] = log['key'].astype('category')          # dictionary-encoded on disk
+        log['column'] = log['column'].astype('category')
+        log['value'] = log['value'].astype(object)
+        path = self.log_path(filename)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        if LOG_FORMAT == 'feather':
+            log.to_feather(tmp)
+        else:
+            log.to_pickle(tmp)
+        os.replace(tmp, path)
+
+
+def store_for(data_path):
+    """The vintage store of a data folder."""
+    return VintageStore(os.path.join(data_path, VINTAGE_SUBDIR))
+
+
+def export(store, as_of, output_dir):
+    """Write the CSVs of the vintage in force on `as_of` to `output_dir`."""
+    vintage = store.resolve(as_of)
+    os.makedirs(output_dir, exist_ok=True)
+    for name in vintage['files']:
+        store.load(name, vintage).to_csv(os.path.join(output_dir, name), sep=';',
+                                         index=False, encoding='utf-8-sig')
+    return vintage
+
+
+if __name__ == '__main__':
+    import datasets
+
+    parser = argparse.ArgumentParser(description='Record and query vintages of the CSVs.')
+    parser.add_argument('--data', default=datasets.DATA_PATH, help='data folder')
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record', help='snapshot the current CSVs as a new vintage')
+    rec.add_argument('--release', help='release date YYYY-MM-DD (default: today)')
+    sub.add_parser('list', help='list the recorded vintages')
+    exp = sub.add_parser('export', help='write the CSVs as they were on a date')
+    exp.add_argument('--as-of', required=True)
+    exp.add_argument('--output', required=True)
+    args = parser.parse_args()
+
+    store = store_for(args.data)
+    if args.command == 'record':
+        vintage = store.record(args.data, args.release)
+        changed = {n: f['changes'] for n, f in vintage['files'].items() if f['changes']}
+        print(f"Vintage {vintage['id']} ({vintage['release']}): "
+              + (', '.join(f'{n} {c} cells' for n, c in changed.items()) or 'no changes'))
+    elif args.command == 'list':
+        for v in store.vintages:
+            changed = sum(f['changes'] for f in v['files'].values())
+            print(f"{v['id']:>4}  {v['release']}  recorded {v['recorded']}  "
+                  f"{len(v['files'])} files, {changed} changed cells")
+    else:
+        vintage = export(store, args.as_of, args.output)
+        print(f"Wrote vintage {vintage['id']} ({vintage['release']}) to {args.output}")